@@ -1,5 +1,14 @@
 import api from "./client";
-import { Employee, LoginResponse, Role, Shift, ShiftAssignment, Task, User } from "./types";
+import {
+  DashboardBundle,
+  Employee,
+  LoginResponse,
+  Role,
+  Shift,
+  ShiftAssignment,
+  Task,
+  User
+} from "./types";
 
 export const login = async (email: string, password: string): Promise<LoginResponse> => {
   const params = new URLSearchParams();
@@ -26,9 +35,23 @@ export const fetchCurrentUser = (): User | null => {
   return raw ? (JSON.parse(raw) as User) : null;
 };
 
+const fetchAllPages = async <T>(
+  path: string,
+  params: Record<string, unknown> = {},
+  from?: string
+): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | undefined = from;
+  do {
+    const response = await api.get<T[]>(path, { params: { ...params, limit: 500, cursor } });
+    items.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  } while (cursor);
+  return items;
+};
+
 export const fetchEmployees = async (): Promise<Employee[]> => {
-  const { data } = await api.get<Employee[]>("/employees");
-  return data;
+  return fetchAllPages<Employee>("/employees");
 };
 
 export const createEmployee = async (payload: Omit<Employee, "id">): Promise<Employee> => {
@@ -46,8 +69,7 @@ export const deleteEmployee = async (id: number): Promise<void> => {
 };
 
 export const fetchTasks = async (): Promise<Task[]> => {
-  const { data } = await api.get<Task[]>("/tasks");
-  return data;
+  return fetchAllPages<Task>("/tasks");
 };
 
 export const createTask = async (payload: Omit<Task, "id">): Promise<Task> => {
@@ -65,8 +87,7 @@ export const deleteTask = async (id: number): Promise<void> => {
 };
 
 export const fetchShifts = async (): Promise<Shift[]> => {
-  const { data } = await api.get<Shift[]>("/shifts");
-  return data;
+  return fetchAllPages<Shift>("/shifts");
 };
 
 export const createShift = async (payload: Omit<Shift, "id">): Promise<Shift> => {
@@ -84,8 +105,38 @@ export const deleteShift = async (id: number): Promise<void> => {
 };
 
 export const fetchAssignments = async (): Promise<ShiftAssignment[]> => {
-  const { data } = await api.get<ShiftAssignment[]>("/assignments");
-  return data;
+  return fetchAllPages<ShiftAssignment>("/assignments");
+};
+
+export interface DashboardData {
+  cursor: number;
+  employees: Employee[];
+  tasks: Task[];
+  shifts: Shift[];
+  assignments: ShiftAssignment[];
+}
+
+// One request for the shifts in [start, end) and the first page of employees and
+// tasks; any further pages are fetched from their own endpoints. Assignments
+// arrive as ids and are joined back to their shift, employee and task here.
+export const fetchDashboard = async (params: { start?: string; end?: string } = {}): Promise<DashboardData> => {
+  const { data } = await api.get<DashboardBundle>("/dashboard", { params });
+  if (data.employees_cursor) {
+    data.employees.push(...(await fetchAllPages<Employee>("/employees", {}, data.employees_cursor)));
+  }
+  if (data.tasks_cursor) {
+    data.tasks.push(...(await fetchAllPages<Task>("/tasks", {}, data.tasks_cursor)));
+  }
+  const shifts = new Map(data.shifts.map((shift) => [shift.id, shift]));
+  const employees = new Map(data.employees.map((employee) => [employee.id, employee]));
+  const tasks = new Map(data.tasks.map((task) => [task.id, task]));
+  const assignments = data.assignments.map((assignment) => ({
+    ...assignment,
+    shift: shifts.get(assignment.shift_id)!,
+    employee: employees.get(assignment.employee_id)!,
+    task: assignment.task_id != null ? tasks.get(assignment.task_id) ?? null : null
+  }));
+  return { cursor: data.cursor, employees: data.employees, tasks: data.tasks, shifts: data.shifts, assignments };
 };
 
 export const createAssignment = async (
@@ -113,8 +164,7 @@ export const exportAssignments = async (): Promise<Blob> => {
 };
 
 export const fetchUsers = async (): Promise<User[]> => {
-  const { data } = await api.get<User[]>("/auth/users");
-  return data;
+  return fetchAllPages<User>("/auth/users");
 };
 
 export const createUser = async (
@@ -45,6 +45,18 @@ export interface ShiftAssignment {
   task?: Task | null;
 }
 
+export type ShiftAssignmentRecord = Omit<ShiftAssignment, "shift" | "employee" | "task">;
+
+export interface DashboardBundle {
+  cursor: number;
+  employees: Employee[];
+  employees_cursor?: string | null;
+  tasks: Task[];
+  tasks_cursor?: string | null;
+  shifts: Shift[];
+  assignments: ShiftAssignmentRecord[];
+}
+
 export interface LoginResponse {
   access_token: string;
   token_type: string;
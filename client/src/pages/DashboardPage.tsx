@@ -20,7 +20,7 @@ import {
   useDisclosure,
   useToast
 } from "@chakra-ui/react";
-import { AddIcon, CalendarIcon, DownloadIcon, RepeatClockIcon, SettingsIcon, ViewIcon } from "@chakra-ui/icons";
+import { AddIcon, CalendarIcon, ChevronLeftIcon, ChevronRightIcon, DownloadIcon, RepeatClockIcon, SettingsIcon, ViewIcon } from "@chakra-ui/icons";
 import dayjs from "dayjs";
 
 import {
@@ -34,10 +34,7 @@ import {
   deleteShift,
   deleteTask,
   exportAssignments,
-  fetchAssignments,
-  fetchEmployees,
-  fetchShifts,
-  fetchTasks,
+  fetchDashboard,
   fetchUsers,
   updateEmployee,
   updateShift,
@@ -59,6 +56,8 @@ const DashboardPage = () => {
   const [assignments, setAssignments] = useState<ShiftAssignment[]>([]);
   const [users, setUsers] = useState<User[]>([]);
   const [loading, setLoading] = useState(true);
+  // The dashboard loads one month of shifts at a time (the server caps the window at 31 days).
+  const [month, setMonth] = useState(() => dayjs().startOf("month"));
   const [activeEmployee, setActiveEmployee] = useState<Employee | null>(null);
   const [activeTask, setActiveTask] = useState<Task | null>(null);
   const [activeShift, setActiveShift] = useState<Shift | null>(null);
@@ -76,16 +75,14 @@ const DashboardPage = () => {
   const loadData = useCallback(async () => {
     setLoading(true);
     try {
-      const [employeeData, taskData, shiftData, assignmentData] = await Promise.all([
-        fetchEmployees(),
-        fetchTasks(),
-        fetchShifts(),
-        fetchAssignments()
-      ]);
-      setEmployees(employeeData);
-      setTasks(taskData);
-      setShifts(shiftData);
-      setAssignments(assignmentData);
+      const dashboard = await fetchDashboard({
+        start: month.format("YYYY-MM-DDTHH:mm:ss"),
+        end: month.add(1, "month").format("YYYY-MM-DDTHH:mm:ss")
+      });
+      setEmployees(dashboard.employees);
+      setTasks(dashboard.tasks);
+      setShifts(dashboard.shifts);
+      setAssignments(dashboard.assignments);
       if (canAdmin) {
         const userData = await fetchUsers();
         setUsers(userData);
@@ -95,7 +92,7 @@ const DashboardPage = () => {
     } finally {
       setLoading(false);
     }
-  }, [toast, canAdmin]);
+  }, [toast, canAdmin, month]);
 
   useEffect(() => {
     loadData();
@@ -285,6 +282,18 @@ const DashboardPage = () => {
 
   return (
     <Flex direction="column" gap={6}>
+      <HStack justify="space-between">
+        <Button size="sm" variant="ghost" leftIcon={<ChevronRightIcon />} onClick={() => setMonth(month.subtract(1, "month"))}>
+          ماه قبل
+        </Button>
+        <Text fontWeight="bold">
+          شیفت های {month.format("MMMM YYYY")}
+        </Text>
+        <Button size="sm" variant="ghost" rightIcon={<ChevronLeftIcon />} onClick={() => setMonth(month.add(1, "month"))}>
+          ماه بعد
+        </Button>
+      </HStack>
+
       <SimpleGrid columns={{ base: 1, md: 4 }} spacing={4}>
         {quickStats.map((stat) => (
           <Card key={stat.label} borderTopWidth="4px" borderTopColor={stat.accent}>
@@ -0,0 +1,181 @@
+"""Worked hours, lateness and no-shows rolled up per employee and day.
+
+Check-in and check-out are stored as bare times, so they are anchored to the
+shift: check-in to the date that puts it closest to ``starts_at`` and check-out
+to the date closest to ``ends_at``, never before the check-in. That keeps
+overnight shifts and early arrivals on the right day. Each assignment counts
+towards the day its shift starts.
+
+The ``AttendanceRollup`` table is maintained by deltas: a write path takes a
+``snapshot`` of the affected assignments before and after the change, and
+``apply_changes`` adds the difference to the touched rows only.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import tuple_
+from sqlmodel import Session, select
+
+from .bulk import IN_CLAUSE_CHUNK
+from .models import AttendanceRollup, Shift, ShiftAssignment
+
+
+ONE_DAY = timedelta(days=1)
+HALF_DAY = timedelta(hours=12)
+METRICS = ("shifts", "attended", "late", "missing_check_out", "scheduled_seconds", "worked_seconds", "late_seconds")
+
+
+@dataclass(frozen=True)
+class Contribution:
+    employee_id: int
+    work_date: date
+    shifts: int
+    attended: int
+    late: int
+    missing_check_out: int
+    scheduled_seconds: int
+    worked_seconds: int
+    late_seconds: int
+
+
+def anchor(moment: time, near: datetime) -> datetime:
+    """Combine ``moment`` with whichever of the surrounding days lands closest to ``near``."""
+
+    candidate = datetime.combine(near.date(), moment)
+    # Ties go to the earlier day, as picking the first minimum over days -1, 0, +1 would.
+    if candidate - near >= HALF_DAY:
+        return candidate - ONE_DAY
+    if candidate - near < -HALF_DAY:
+        return candidate + ONE_DAY
+    return candidate
+
+
+def contribution(
+    employee_id: int,
+    starts_at: datetime,
+    ends_at: datetime,
+    check_in_time: Optional[time],
+    check_out_time: Optional[time],
+) -> Contribution:
+    worked = late = 0
+    missing_check_out = 0
+    if check_in_time is not None:
+        check_in = anchor(check_in_time, starts_at)
+        late = max(int((check_in - starts_at).total_seconds()), 0)
+        if check_out_time is None:
+            missing_check_out = 1
+        else:
+            check_out = anchor(check_out_time, ends_at)
+            if check_out <= check_in:
+                check_out += timedelta(days=1)
+            worked = int((check_out - check_in).total_seconds())
+    return Contribution(
+        employee_id=employee_id,
+        work_date=starts_at.date(),
+        shifts=1,
+        attended=int(check_in_time is not None),
+        late=int(late > 0),
+        missing_check_out=missing_check_out,
+        scheduled_seconds=int((ends_at - starts_at).total_seconds()),
+        worked_seconds=worked,
+        late_seconds=late,
+    )
+
+
+def contributions(rows: Iterable[tuple]) -> list[Contribution]:
+    """``rows`` are ``(employee_id, starts_at, ends_at, check_in_time, check_out_time)``."""
+
+    return [contribution(*row) for row in rows]
+
+
+def _chunks(values: Iterable[int]) -> Iterator[list[int]]:
+    wanted = sorted(set(values))
+    for start in range(0, len(wanted), IN_CLAUSE_CHUNK):
+        yield wanted[start : start + IN_CLAUSE_CHUNK]
+
+
+def snapshot(
+    session: Session,
+    assignment_ids: Iterable[int] = (),
+    shift_ids: Iterable[int] = (),
+    employee_ids: Iterable[int] = (),
+) -> list[Contribution]:
+    """Current contributions of the assignments matching any of the given ids.
+
+    Call it with the same selectors before and after a write; rows that
+    disappear (deleted, or their shift is gone) simply drop out of the second.
+    """
+
+    base = select(
+        ShiftAssignment.id,
+        ShiftAssignment.employee_id,
+        Shift.starts_at,
+        Shift.ends_at,
+        ShiftAssignment.check_in_time,
+        ShiftAssignment.check_out_time,
+    ).join(Shift, Shift.id == ShiftAssignment.shift_id)
+    rows: dict[int, tuple] = {}
+    for column, ids in (
+        (ShiftAssignment.id, assignment_ids),
+        (ShiftAssignment.shift_id, shift_ids),
+        (ShiftAssignment.employee_id, employee_ids),
+    ):
+        for chunk in _chunks(ids):
+            for assignment_id, *row in session.exec(base.where(column.in_(chunk))):
+                rows[assignment_id] = row
+    return contributions(rows.values())
+
+
+def _totals(items: Iterable[Contribution], sign: int, into: dict) -> None:
+    for item in items:
+        totals = into[(item.employee_id, item.work_date)]
+        for metric in METRICS:
+            totals[metric] += sign * getattr(item, metric)
+
+
+def apply_changes(session: Session, before: list[Contribution], after: list[Contribution]) -> None:
+    """Add ``after - before`` to the rollup rows they touch; the caller commits."""
+
+    deltas: dict[tuple[int, date], dict[str, int]] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    _totals(before, -1, deltas)
+    _totals(after, 1, deltas)
+    deltas = {key: values for key, values in deltas.items() if any(values.values())}
+    if not deltas:
+        return
+
+    keys = sorted(deltas)
+    existing: dict[tuple[int, date], AttendanceRollup] = {}
+    for start in range(0, len(keys), IN_CLAUSE_CHUNK):
+        chunk = keys[start : start + IN_CLAUSE_CHUNK]
+        statement = select(AttendanceRollup).where(
+            tuple_(AttendanceRollup.employee_id, AttendanceRollup.work_date).in_(chunk)
+        )
+        for row in session.exec(statement):
+            existing[(row.employee_id, row.work_date)] = row
+
+    for key, values in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            row = AttendanceRollup(employee_id=key[0], work_date=key[1], **dict.fromkeys(METRICS, 0))
+        for metric, delta in values.items():
+            setattr(row, metric, getattr(row, metric) + delta)
+        if row.shifts <= 0:
+            if key in existing:
+                session.delete(row)
+        else:
+            session.add(row)
+
+
+def rollup_rows(rows: Iterable[tuple]) -> list[dict]:
+    """Full aggregate of ``rows`` (as for ``contributions``), for backfilling the table."""
+
+    totals: dict[tuple[int, date], dict[str, int]] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    _totals(contributions(rows), 1, totals)
+    return [
+        {"employee_id": employee_id, "work_date": work_date, **values}
+        for (employee_id, work_date), values in sorted(totals.items())
+    ]
+
@@ -1,34 +1,34 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession, object_session
 from sqlmodel import Session, select
 
+from .cache import TTLCache
 from .config import get_settings
 from .database import get_session
 from .models import User, Role
+from .passwords import hash_password, verify_password  # noqa: F401 re-exported
 
 
 settings = get_settings()
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
-
-
-def hash_password(password: str) -> str:
-    return password_context.hash(password)
-
-
-def verify_password(password: str, hashed_password: str) -> bool:
-    return password_context.verify(password, hashed_password)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
+principal_cache = TTLCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
     to_encode.update({"exp": expire})
+    # jose and its cryptography backend are imported on first use to keep worker start fast.
+    from jose import jwt
+
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
@@ -42,6 +42,13 @@ class TokenData:
 def get_current_user(
     token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
 ) -> User:
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = principal_cache.get(cache_key)
+    if cached is not None:
+        return User(**cached)
+
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -60,9 +67,63 @@ def get_current_user(
     user = session.get(User, token_data.user_id)
     if user is None:
         raise credentials_exception
+    # Never cache a principal beyond the lifetime of the token that proved it.
+    principal_cache.set(cache_key, user.model_dump(), ttl_seconds=payload["exp"] - time.time())
     return user
 
 
+def stream_token(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(default=None),
+) -> str:
+    """Bearer token from the header, or from ``?access_token=`` for EventSource,
+    which cannot set headers."""
+
+    token = header_token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token
+
+
+def get_stream_user(token: str = Depends(stream_token), session: Session = Depends(get_session)) -> User:
+    return get_current_user(token, session)
+
+
+def invalidate_cached_principal(user_id: Optional[int]) -> None:
+    principal_cache.discard_where(lambda cached: cached["id"] == user_id)
+
+
+WRITTEN_USERS = "written_user_ids"
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_user_write(mapper, connection, target: User) -> None:
+    # Flush time is too early to invalidate: a request in between would read
+    # the still-committed row and cache it again. Wait for the commit.
+    session = object_session(target)
+    if session is None:
+        invalidate_cached_principal(target.id)
+        return
+    session.info.setdefault(WRITTEN_USERS, set()).add(target.id)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_committed_users(session: OrmSession) -> None:
+    for user_id in session.info.pop(WRITTEN_USERS, ()):
+        invalidate_cached_principal(user_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_user_writes(session: OrmSession) -> None:
+    session.info.pop(WRITTEN_USERS, None)
+
+
 def require_role(required_roles: list[str]):
     def role_dependency(current_user: User = Depends(get_current_user)) -> User:
         if current_user.role not in required_roles:
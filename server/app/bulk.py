@@ -0,0 +1,70 @@
+from typing import Iterable, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, update
+from sqlmodel import Session, SQLModel, select
+
+from . import changelog
+from .config import get_settings
+from .models import BulkItemResult
+
+
+settings = get_settings()
+# SQLite caps the number of bound parameters per statement.
+IN_CLAUSE_CHUNK = 500
+
+
+def check_batch_size(items: Sequence) -> None:
+    if len(items) > settings.max_bulk_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.max_bulk_items} items per request",
+        )
+
+
+def existing_ids(session: Session, column, ids: Iterable[Optional[int]]) -> set[int]:
+    """Return which of ``ids`` exist in ``column``, using one IN query per chunk."""
+
+    wanted = sorted({value for value in ids if value is not None})
+    found: set[int] = set()
+    for start in range(0, len(wanted), IN_CLAUSE_CHUNK):
+        chunk = wanted[start : start + IN_CLAUSE_CHUNK]
+        found.update(session.exec(select(column).where(column.in_(chunk))).all())
+    return found
+
+
+def apply_bulk(
+    session: Session, model: type[SQLModel], items: Sequence[SQLModel], errors: dict[int, str]
+) -> list[BulkItemResult]:
+    """Insert items without an ``id`` and fully replace items with one.
+
+    Items whose index is in ``errors`` are reported and skipped. Inserts and
+    updates each go out as a single executemany; the caller commits.
+    """
+
+    known = existing_ids(session, model.id, (item.id for item in items))
+    results: list[Optional[BulkItemResult]] = [None] * len(items)
+    creates: list[tuple[int, dict]] = []
+    updates: list[tuple[int, dict]] = []
+    for index, item in enumerate(items):
+        if index in errors:
+            results[index] = BulkItemResult(index=index, status="error", id=item.id, detail=errors[index])
+        elif item.id is None:
+            creates.append((index, item.model_dump(exclude={"id"})))
+        elif item.id not in known:
+            results[index] = BulkItemResult(index=index, status="error", id=item.id, detail="Not found")
+        else:
+            updates.append((index, item.model_dump()))
+
+    if creates:
+        statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+        new_ids = session.execute(statement, [data for _, data in creates]).scalars().all()
+        changelog.record(session, model, new_ids)
+        for (index, _), new_id in zip(creates, new_ids):
+            results[index] = BulkItemResult(index=index, status="created", id=new_id)
+    if updates:
+        session.execute(update(model), [data for _, data in updates])
+        changelog.record(session, model, (data["id"] for _, data in updates))
+        for index, data in updates:
+            results[index] = BulkItemResult(index=index, status="updated", id=data["id"])
+    return results
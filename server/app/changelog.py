@@ -0,0 +1,142 @@
+"""Append-only change log behind ``GET /sync``.
+
+ORM writes to the synced tables are picked up from the unit of work; bulk
+statements, which bypass it, report their ids through ``record``. Entries are
+buffered on the session and appended in ``before_commit``, so they land in the
+same transaction as the rows they describe. The log id is the sync cursor;
+SQLite serialises write transactions, so ids become visible in order. Once
+the transaction commits, the batch is published to the live event streams.
+
+``compact`` keeps only the newest entry per row and drops tombstones past the
+retention window, remembering the highest dropped id: cursors older than that
+can no longer see every delete and must reload in full.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, event, func, insert
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel, select
+
+from .database import session_scope
+from .events import broker, sse_frame
+from .models import ChangeLog, ChangeLogCompaction, Employee, Shift, ShiftAssignment, Task
+
+
+SYNCED_MODELS: dict[str, type[SQLModel]] = {
+    model.__tablename__: model for model in (Employee, Task, Shift, ShiftAssignment)
+}
+PENDING_CHANGES = "pending_changes"
+COMMITTED_FRAME = "committed_change_frame"
+logger = logging.getLogger(__name__)
+
+
+def _pending(session: Session) -> dict[tuple[str, int], bool]:
+    return session.info.setdefault(PENDING_CHANGES, {})
+
+
+def record(session: Session, model: type[SQLModel], ids: Iterable[int], deleted: bool = False) -> None:
+    """Log rows written outside the unit of work (bulk insert/update statements)."""
+
+    if model.__tablename__ not in SYNCED_MODELS:
+        return
+    pending = _pending(session)
+    for row_id in ids:
+        pending[(model.__tablename__, row_id)] = deleted
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    pending = _pending(session)
+    for instances, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+        for instance in instances:
+            table = getattr(instance, "__tablename__", None)
+            if table not in SYNCED_MODELS or (instances is session.dirty and not session.is_modified(instance)):
+                continue
+            pending[(table, instance.id)] = deleted
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    session.flush()
+    pending = session.info.pop(PENDING_CHANGES, None)
+    if not pending:
+        return
+    now = datetime.utcnow()
+    rows = [
+        {"table_name": table, "row_id": row_id, "deleted": deleted, "changed_at": now}
+        for (table, row_id), deleted in pending.items()
+    ]
+    # Straight on the connection, so the log write is not itself tracked as a change.
+    statement = insert(ChangeLog.__table__).returning(ChangeLog.__table__.c.id)
+    cursor = max(session.connection().execute(statement, rows).scalars())
+    changes = [{"table": table, "id": row_id, "deleted": deleted} for (table, row_id), deleted in pending.items()]
+    session.info[COMMITTED_FRAME] = sse_frame("change", {"cursor": cursor, "changes": changes}, event_id=cursor)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    frame = session.info.pop(COMMITTED_FRAME, None)
+    if frame is not None:
+        broker.publish(frame)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(PENDING_CHANGES, None)
+    session.info.pop(COMMITTED_FRAME, None)
+
+
+# Cursors below this id have lost tombstones to compaction.
+HORIZON = select(func.coalesce(func.max(ChangeLogCompaction.horizon), 0))
+HEAD = select(func.coalesce(func.max(ChangeLog.id), 0))
+
+
+def compact(session, retention: timedelta) -> int:
+    """Drop superseded entries and expired tombstones; returns how many were removed. The caller commits."""
+
+    latest = select(func.max(ChangeLog.id)).group_by(ChangeLog.table_name, ChangeLog.row_id)
+    superseded = session.execute(
+        delete(ChangeLog).where(ChangeLog.id.not_in(latest)), execution_options={"synchronize_session": False}
+    ).rowcount
+
+    cutoff = datetime.utcnow() - retention
+    expired = ChangeLog.deleted.is_(True) & (ChangeLog.changed_at < cutoff)
+    last_expired = session.exec(select(func.max(ChangeLog.id)).where(expired)).one()
+    tombstones = 0
+    if last_expired is not None:
+        tombstones = session.execute(
+            delete(ChangeLog).where(expired), execution_options={"synchronize_session": False}
+        ).rowcount
+    removed = superseded + tombstones
+    if removed:
+        session.add(
+            ChangeLogCompaction(
+                compacted_at=datetime.utcnow(),
+                horizon=max(last_expired or 0, session.exec(HORIZON).one()),
+                removed=removed,
+            )
+        )
+    return removed
+
+
+async def compact_periodically(interval_seconds: float, retention: timedelta) -> None:
+    """Background loop started with the app; every worker may run it, compaction is idempotent."""
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(_compact_once, retention)
+        except Exception:
+            logger.exception("Change log compaction failed")
+
+
+def _compact_once(retention: timedelta) -> int:
+    with session_scope() as session:
+        removed = compact(session, retention)
+        session.commit()
+    return removed
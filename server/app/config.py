@@ -1,16 +1,51 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="SHIFT_MANAGER_", env_file=".env", env_file_encoding="utf-8")
 
     database_url: str = "sqlite:///./lifeguard.db"
+    # Migrate and create the admin in every worker's startup. Turn off for fast
+    # starts and run `python -m server.bootstrap` once per deploy instead.
+    bootstrap_on_startup: bool = True
+    # Serve the read-heavy endpoints through an async engine (aiosqlite, asyncpg, ...).
+    async_database: bool = False
+    async_database_url: Optional[str] = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 20000
     secret_key: str = "super-secret-key"
     access_token_expire_minutes: int = 60 * 12  # 12 hours
     algorithm: str = "HS256"
     default_admin_email: str = "admin@wavepark.local"
     default_admin_password: str = "ChangeMe123!"
+    password_hash_workers: int = 2  # 0 hashes inline in the calling thread
+    password_hash_max_pending: int = 32
+    principal_cache_size: int = 1024
+    principal_cache_ttl_seconds: float = 60.0
+    default_page_size: int = 100
+    max_page_size: int = 500
+    max_bulk_items: int = 5000
+    sync_page_size: int = 1000
+    dashboard_window_days: int = 31  # default and longest /dashboard window
+    max_template_expansion_days: int = 366
+    change_log_retention_days: int = 30
+    change_log_compact_interval_seconds: float = 3600.0  # 0 disables background compaction
+    event_stream_queue_size: int = 100
+    event_stream_heartbeat_seconds: float = 20.0
+    metrics_enabled: bool = True  # request/SQL instrumentation and GET /metrics
+    metrics_token: Optional[str] = None  # bearer token for scrapers; without it /metrics is admin-only
+    slow_query_threshold_ms: Optional[float] = None  # set to record slower statements with their plan
+    slow_query_log_size: int = 200
+    slow_query_log_parameters: bool = False  # bound values may be personal data; never kept for the user table
 
 
 @lru_cache
@@ -0,0 +1,214 @@
+"""Double-booking detection for shift assignments."""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Hashable, Iterable, Optional, Sequence
+
+from sqlmodel import Session, select
+
+from .bulk import IN_CLAUSE_CHUNK
+from .models import AssignmentConflict, Employee, Shift, ShiftAssignment
+
+
+class IntervalIndex:
+    """Per-employee intervals kept sorted by start time.
+
+    Anything overlapping ``[start, end)`` must start after ``start - longest``
+    and before ``end``, so a lookup is two bisections plus a scan of that slice.
+    """
+
+    def __init__(self):
+        self._intervals: dict[int, list[tuple[datetime, datetime, Hashable]]] = defaultdict(list)
+        self._longest: dict[int, timedelta] = defaultdict(timedelta)
+
+    def add(self, employee_id: int, start: datetime, end: datetime, key: Hashable) -> None:
+        insort(self._intervals[employee_id], (start, end, key), key=lambda item: item[0])
+        self._longest[employee_id] = max(self._longest[employee_id], end - start)
+
+    def remove(self, employee_id: int, start: datetime, end: datetime, key: Hashable) -> None:
+        self._intervals[employee_id].remove((start, end, key))
+
+    def discard(self, employee_id: int, key: Hashable) -> None:
+        """Drop ``key`` from ``employee_id``'s intervals, if it is there."""
+
+        intervals = self._intervals.get(employee_id)
+        if intervals:
+            self._intervals[employee_id] = [item for item in intervals if item[2] != key]
+
+    def overlapping(self, employee_id: int, start: datetime, end: datetime) -> list[Hashable]:
+        intervals = self._intervals.get(employee_id)
+        if not intervals:
+            return []
+        low = bisect_right(intervals, start - self._longest[employee_id], key=lambda item: item[0])
+        high = bisect_left(intervals, end, key=lambda item: item[0])
+        return [key for _, other_end, key in intervals[low:high] if other_end > start]
+
+
+def lock_for_assignment_writes(session: Session, employee_ids: Iterable[int] = ()) -> None:
+    """Hold the write lock from the overlap check to the commit.
+
+    Without it two requests can both pass the check and then both write. SQLite
+    has a single writer, so ``BEGIN IMMEDIATE`` takes the lock before the reads
+    rather than at the first write; other databases lock the employees' rows.
+    Call it before the first query of the check.
+    """
+
+    connection = session.connection()
+    if connection.dialect.name == "sqlite":
+        # The driver only opens a transaction at the first write; one already
+        # open means this connection holds the write lock.
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        return
+    wanted = sorted(set(employee_ids))
+    for start in range(0, len(wanted), IN_CLAUSE_CHUNK):
+        chunk = wanted[start : start + IN_CLAUSE_CHUNK]
+        session.exec(select(Employee.id).where(Employee.id.in_(chunk)).with_for_update()).all()
+
+
+def overlapping_assignment_ids(
+    session: Session, employee_id: int, starts_at: datetime, ends_at: datetime, exclude_id: Optional[int] = None
+) -> list[int]:
+    """Assignments of ``employee_id`` whose shift overlaps ``[starts_at, ends_at)``."""
+
+    statement = (
+        select(ShiftAssignment.id)
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .where(
+            ShiftAssignment.employee_id == employee_id,
+            Shift.starts_at < ends_at,
+            Shift.ends_at > starts_at,
+        )
+    )
+    if exclude_id is not None:
+        statement = statement.where(ShiftAssignment.id != exclude_id)
+    return list(session.exec(statement).all())
+
+
+def shift_windows(session: Session, shift_ids: Iterable[int]) -> dict[int, tuple[datetime, datetime]]:
+    wanted = sorted(set(shift_ids))
+    windows: dict[int, tuple[datetime, datetime]] = {}
+    for start in range(0, len(wanted), IN_CLAUSE_CHUNK):
+        chunk = wanted[start : start + IN_CLAUSE_CHUNK]
+        for shift_id, starts_at, ends_at in session.exec(
+            select(Shift.id, Shift.starts_at, Shift.ends_at).where(Shift.id.in_(chunk))
+        ):
+            windows[shift_id] = (starts_at, ends_at)
+    return windows
+
+
+def existing_interval_index(
+    session: Session, employee_ids: Iterable[int], window_start: datetime, window_end: datetime
+) -> IntervalIndex:
+    """Index the current assignments of ``employee_ids`` that touch the window."""
+
+    index = IntervalIndex()
+    wanted = sorted(set(employee_ids))
+    for start in range(0, len(wanted), IN_CLAUSE_CHUNK):
+        chunk = wanted[start : start + IN_CLAUSE_CHUNK]
+        rows = session.exec(
+            select(ShiftAssignment.id, ShiftAssignment.employee_id, Shift.starts_at, Shift.ends_at)
+            .join(Shift, Shift.id == ShiftAssignment.shift_id)
+            .where(
+                ShiftAssignment.employee_id.in_(chunk),
+                Shift.starts_at < window_end,
+                Shift.ends_at > window_start,
+            )
+        )
+        for assignment_id, employee_id, starts_at, ends_at in rows:
+            index.add(employee_id, starts_at, ends_at, assignment_id)
+    return index
+
+
+def assignment_employees(session: Session, assignment_ids: Iterable[Optional[int]]) -> dict[int, int]:
+    """``{assignment_id: employee_id}`` for the ids that exist."""
+
+    wanted = sorted({value for value in assignment_ids if value is not None})
+    employees: dict[int, int] = {}
+    for start in range(0, len(wanted), IN_CLAUSE_CHUNK):
+        chunk = wanted[start : start + IN_CLAUSE_CHUNK]
+        employees.update(
+            session.exec(
+                select(ShiftAssignment.id, ShiftAssignment.employee_id).where(ShiftAssignment.id.in_(chunk))
+            ).all()
+        )
+    return employees
+
+
+def shift_move_conflicts(session: Session, moves: Sequence[tuple[int, datetime, datetime]]) -> dict[int, tuple[int, int]]:
+    """Which of ``moves`` (``(shift_id, starts_at, ends_at)``) would double-book someone.
+
+    Moves are checked in order, each against current assignments and the moves
+    accepted before it. Returns ``{position: (assignment_id, overlapped_assignment_id)}``
+    for the rejected ones. Takes the assignment write lock, as the callers write next.
+    """
+
+    lock_for_assignment_writes(session)
+    crews: dict[int, list[tuple[int, int]]] = defaultdict(list)
+    shift_ids = sorted({shift_id for shift_id, _, _ in moves})
+    for start in range(0, len(shift_ids), IN_CLAUSE_CHUNK):
+        chunk = shift_ids[start : start + IN_CLAUSE_CHUNK]
+        for assignment_id, employee_id, shift_id in session.exec(
+            select(ShiftAssignment.id, ShiftAssignment.employee_id, ShiftAssignment.shift_id).where(
+                ShiftAssignment.shift_id.in_(chunk)
+            )
+        ):
+            crews[shift_id].append((assignment_id, employee_id))
+    if not crews:
+        return {}
+
+    employee_ids = {employee_id for crew in crews.values() for _, employee_id in crew}
+    lock_for_assignment_writes(session, employee_ids)
+    intervals = existing_interval_index(
+        session,
+        employee_ids,
+        min(starts_at for _, starts_at, _ in moves),
+        max(ends_at for _, _, ends_at in moves),
+    )
+    rejected: dict[int, tuple[int, int]] = {}
+    for position, (shift_id, starts_at, ends_at) in enumerate(moves):
+        crew = crews.get(shift_id, [])
+        moving = {assignment_id for assignment_id, _ in crew}
+        for assignment_id, employee_id in crew:
+            overlaps = [key for key in intervals.overlapping(employee_id, starts_at, ends_at) if key not in moving]
+            if overlaps:
+                rejected[position] = (assignment_id, overlaps[0])
+                break
+        else:
+            for assignment_id, employee_id in crew:
+                intervals.discard(employee_id, assignment_id)
+                intervals.add(employee_id, starts_at, ends_at, assignment_id)
+    return rejected
+
+
+def find_conflicts(rows: Iterable[tuple[int, int, int, datetime, datetime]]) -> list[AssignmentConflict]:
+    """Every overlapping pair among ``(assignment_id, employee_id, shift_id, starts_at, ends_at)``.
+
+    ``rows`` must be ordered by employee and start time. A sweep keeps a heap of
+    the shifts still running for the current employee, so the cost is
+    O(n log n + k) for k conflicts instead of comparing every pair.
+    """
+
+    conflicts: list[AssignmentConflict] = []
+    active: list[tuple[datetime, int, int]] = []
+    current_employee = None
+    for assignment_id, employee_id, shift_id, starts_at, ends_at in rows:
+        if employee_id != current_employee:
+            active = []
+            current_employee = employee_id
+        while active and active[0][0] <= starts_at:
+            heapq.heappop(active)
+        for _, other_id, other_shift_id in active:
+            conflicts.append(
+                AssignmentConflict(
+                    employee_id=employee_id,
+                    assignment_id=other_id,
+                    shift_id=other_shift_id,
+                    conflicting_assignment_id=assignment_id,
+                    conflicting_shift_id=shift_id,
+                )
+            )
+        heapq.heappush(active, (ends_at, assignment_id, shift_id))
+    return conflicts
@@ -1,24 +1,162 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
-from sqlmodel import SQLModel, create_engine, Session
-from sqlalchemy.engine import Engine
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import URL, Connection, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .config import get_settings
 
 
+if TYPE_CHECKING:
+    from alembic.config import Config
+
+
 settings = get_settings()
-engine = create_engine(settings.database_url, echo=False)
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Production profile for SQLite: WAL so readers never block the writer,
+    and a busy timeout so concurrent writers wait instead of failing."""
+
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous = {settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size = -{int(settings.sqlite_cache_size_kib)}")
+    cursor.close()
+
+
+def build_engine(database_url: str, **kwargs) -> Engine:
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    options: dict = {"echo": False, "pool_pre_ping": settings.db_pool_pre_ping}
+    if is_sqlite:
+        # Sync dependencies and handlers run on different threadpool threads.
+        options["connect_args"] = {"check_same_thread": False}
+    if is_sqlite and url.database in (None, "", ":memory:"):
+        options["poolclass"] = StaticPool
+    else:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    options.update(kwargs)
+    new_engine = create_engine(database_url, **options)
+    if is_sqlite:
+        event.listen(new_engine, "connect", apply_sqlite_pragmas)
+    return new_engine
+
+
+engine = build_engine(settings.database_url)
+
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+async_engine: Optional[AsyncEngine] = None
 
 
 def override_engine(new_engine: Engine) -> None:
-    global engine
+    global engine, async_engine
     engine = new_engine
+    if async_engine is not None:
+        # Close the pooled connections to the old database; the twin is rebuilt on demand.
+        async_engine.sync_engine.dispose()
+    async_engine = None
+
+
+def async_database_url(sync_url: URL) -> URL:
+    if settings.async_database_url:
+        return make_url(settings.async_database_url)
+    if sync_url.get_dialect().is_async:
+        return sync_url
+    return sync_url.set(drivername=ASYNC_DRIVERS.get(sync_url.get_backend_name(), sync_url.drivername))
+
+
+def get_async_engine() -> AsyncEngine:
+    """Async twin of ``engine``, pointed at the same database and built on first use."""
+
+    global async_engine
+    if async_engine is None:
+        url = async_database_url(engine.url)
+        options: dict = {"echo": False, "pool_pre_ping": settings.db_pool_pre_ping}
+        if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+            options.update(
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout,
+            )
+        async_engine = create_async_engine(url, **options)
+        if url.get_backend_name() == "sqlite":
+            event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return async_engine
+
+
+BASELINE_REVISION = "0001"
+# Head of server/migrations/versions; test_database keeps the two in step.
+SCHEMA_REVISION = "0009"
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def alembic_config(connection: Optional[Connection] = None) -> "Config":
+    # Alembic is only needed to migrate; importing it costs a worker ~0.25 s.
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def stored_revision(connection: Connection) -> Optional[str]:
+    if not inspect(connection).has_table("alembic_version"):
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def check_schema() -> None:
+    """Fail fast unless the database is already at ``SCHEMA_REVISION``; writes nothing."""
+
+    with engine.connect() as connection:
+        revision = stored_revision(connection)
+    if revision != SCHEMA_REVISION:
+        raise RuntimeError(
+            f"Database schema is at {revision or 'no revision'}, expected {SCHEMA_REVISION}; "
+            "run `python -m server.bootstrap` first"
+        )
 
 
 def init_db() -> None:
+    """Bring the schema up to date by running the Alembic migrations.
+
+    A database already at ``SCHEMA_REVISION`` is left alone without loading
+    Alembic. Databases created by the old ``create_all`` bootstrap have tables
+    but no ``alembic_version``; they are stamped at the baseline revision first.
+    """
+
     import server.app.models  # noqa: F401 ensures models registered
 
-    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        if stored_revision(connection) == SCHEMA_REVISION:
+            return
+        from alembic import command
+
+        config = alembic_config(connection)
+        tables = inspect(connection).get_table_names()
+        if "alembic_version" not in tables and "user" in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
 
 
 @contextmanager
@@ -30,3 +168,52 @@ def session_scope():
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+class ReadSession:
+    """Runs read-only statements on whichever database path is configured.
+
+    With ``async_database`` enabled the statements go through an ``AsyncSession``;
+    otherwise they run on a sync ``Session`` in the threadpool, so the same
+    ``async def`` handlers serve both modes.
+    """
+
+    def __init__(self, session: Session | AsyncSession):
+        self.session = session
+
+    async def all(self, statement) -> list:
+        if isinstance(self.session, AsyncSession):
+            return list((await self.session.exec(statement)).all())
+        return await run_in_threadpool(lambda: list(self.session.exec(statement).all()))
+
+    async def partitions(self, statement, size: int) -> AsyncIterator[list]:
+        """Yield result rows in chunks of ``size`` without buffering the whole result."""
+
+        statement = statement.execution_options(yield_per=size)
+        if isinstance(self.session, AsyncSession):
+            result = await self.session.stream(statement)
+            async for partition in result.partitions(size):
+                yield partition
+            return
+        result = await run_in_threadpool(self.session.exec, statement)
+        partitions = result.partitions(size)
+        while True:
+            partition = await run_in_threadpool(next, partitions, None)
+            if partition is None:
+                return
+            yield partition
+
+
+@asynccontextmanager
+async def read_session_scope() -> AsyncIterator[ReadSession]:
+    if settings.async_database:
+        async with AsyncSession(get_async_engine()) as session:
+            yield ReadSession(session)
+    else:
+        with Session(engine) as session:
+            yield ReadSession(session)
+
+
+async def get_read_session() -> AsyncIterator[ReadSession]:
+    async with read_session_scope() as session:
+        yield session
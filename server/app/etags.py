@@ -0,0 +1,109 @@
+"""Per-table version counters and conditional GET for the read endpoints.
+
+Every session commit bumps the ``TableVersion`` row of each table it wrote,
+in the same transaction, whether the write came from the ORM unit of work or
+from an ORM-enabled bulk ``insert``/``update``/``delete``. A read endpoint's
+ETag is a hash of its URL and the versions of the tables it reads, so a
+matching ``If-None-Match`` costs one primary-key lookup and no query or
+serialization.
+"""
+
+import hashlib
+from datetime import date
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlmodel import SQLModel, select
+
+from .database import ReadSession, get_read_session
+from .models import TableVersion
+
+
+CHANGED_TABLES = "changed_tables"
+
+
+def _changed(session: Session) -> set[str]:
+    return session.info.setdefault(CHANGED_TABLES, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context) -> None:
+    changed = _changed(session)
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(instance, "__table__", None)
+        if table is not None and (instance not in session.dirty or session.is_modified(instance)):
+            changed.add(table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tables(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None and table.name != TableVersion.__tablename__:
+            _changed(state.session).add(table.name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session: Session) -> None:
+    session.flush()
+    changed = session.info.pop(CHANGED_TABLES, None)
+    if not changed:
+        return
+    names = sorted(changed)
+    session.execute(update(TableVersion).where(TableVersion.name.in_(names)).values(version=TableVersion.version + 1))
+    known = set(session.execute(select(TableVersion.name).where(TableVersion.name.in_(names))).scalars())
+    missing = [name for name in names if name not in known]
+    if missing:
+        session.execute(insert(TableVersion), [{"name": name, "version": 1} for name in missing])
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changes(session: Session) -> None:
+    session.info.pop(CHANGED_TABLES, None)
+
+
+def compute_etag(request: Request, versions: dict[str, int], extra: Optional[str] = None) -> str:
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    state = ",".join(f"{name}:{versions.get(name, 0)}" for name in sorted(versions))
+    digest = hashlib.sha256(f"{request.url.path}?{query}|{state}|{extra or ''}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def conditional(*models: type[SQLModel], daily: bool = False):
+    """Dependency that sets ``ETag`` from the tables of ``models`` and answers 304 on a match.
+
+    Declare it after the auth dependency so unauthenticated requests never get a
+    304. ``daily`` folds today's date into the tag for reports that depend on it.
+    The tag is also returned, for handlers that build their own response.
+    """
+
+    tables = tuple(model.__tablename__ for model in models)
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        session: ReadSession = Depends(get_read_session),
+    ) -> str:
+        rows = await session.all(
+            select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(tables))
+        )
+        versions = dict.fromkeys(tables, 0) | dict(rows)
+        etag = compute_etag(request, versions, date.today().isoformat() if daily else None)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        return etag
+
+    return dependency
@@ -0,0 +1,103 @@
+"""In-process fan-out of committed roster changes to live event streams.
+
+``changelog`` hands every committed batch of change-log entries to
+``broker.publish``, which may be called from any thread. Each frame is
+encoded once and shared by all subscribers. Every subscriber has a bounded
+queue; a consumer that falls behind has its backlog replaced by a single
+``resync`` frame, so memory stays bounded and the client catches up with
+``GET /sync`` from its last cursor.
+
+Only writes handled by this process are seen; with several workers a client
+still converges through ``/sync`` on reconnect.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Optional
+
+from .config import get_settings
+
+
+settings = get_settings()
+
+
+def sse_frame(event: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    lines = [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    if event_id is not None:
+        lines.insert(0, f"id: {event_id}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+RESYNC_FRAME = sse_frame("resync", {})
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+        self.overflows = 0
+
+    def offer(self, frame: bytes) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME)
+
+
+class EventBroker:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self) -> Subscription:
+        """Register a consumer; must be called on the event loop that will read it."""
+
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, frame: bytes) -> None:
+        """Queue ``frame`` for every subscriber; safe to call from worker threads."""
+
+        with self._lock:
+            loop = self._loop if self._subscribers else None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(frame)
+        else:
+            loop.call_soon_threadsafe(self._deliver, frame)
+
+    def _deliver(self, frame: bytes) -> None:
+        self.published += 1
+        for subscription in list(self._subscribers):
+            subscription.offer(frame)
+
+    def stats(self) -> dict:
+        subscribers = list(self._subscribers)
+        return {
+            "subscribers": len(subscribers),
+            "published": self.published,
+            "queued": sum(subscription.queue.qsize() for subscription in subscribers),
+            "overflows": sum(subscription.overflows for subscription in subscribers),
+        }
+
+
+broker = EventBroker(settings.event_stream_queue_size)
@@ -1,10 +1,21 @@
+import asyncio
+from datetime import timedelta
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import init_db, session_scope
+from . import changelog, metrics as request_metrics, slow_queries
+from .config import get_settings
+from .database import check_schema, init_db, session_scope
 from .auth import create_initial_admin
-from .routers import auth, employees, tasks, shifts, assignments, reports
+from .pagination import NEXT_CURSOR_HEADER
+from .passwords import password_pool
+from .routers import auth, employees, tasks, shifts, templates, assignments, schedule, reports, sync, events, dashboard, metrics, admin
+
 
+settings = get_settings()
+# Strong references keep the loops alive until shutdown cancels them.
+background_tasks: set[asyncio.Task] = set()
 
 app = FastAPI(title="Wavepark Shift Manager", version="0.1.0")
 app.add_middleware(
@@ -13,21 +24,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+if settings.metrics_enabled:
+    request_metrics.install(app)
+if settings.slow_query_threshold_ms is not None:
+    slow_queries.install()
 
 app.include_router(auth.router)
 app.include_router(employees.router)
 app.include_router(tasks.router)
 app.include_router(shifts.router)
+app.include_router(templates.router)
 app.include_router(assignments.router)
+app.include_router(schedule.router)
 app.include_router(reports.router)
+app.include_router(sync.router)
+app.include_router(events.router)
+app.include_router(dashboard.router)
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
+app.include_router(admin.router)
 
 
 @app.on_event("startup")
 def on_startup():
-    init_db()
-    with session_scope() as session:
-        create_initial_admin(session)
+    if settings.bootstrap_on_startup:
+        init_db()
+        with session_scope() as session:
+            create_initial_admin(session)
+    else:
+        check_schema()
+    if settings.change_log_compact_interval_seconds > 0:
+        compaction = changelog.compact_periodically(
+            settings.change_log_compact_interval_seconds, timedelta(days=settings.change_log_retention_days)
+        )
+        background_tasks.add(asyncio.create_task(compaction))
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    for task in background_tasks:
+        task.cancel()
+    password_pool.shutdown()
 
 
 @app.get("/")
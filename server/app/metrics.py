@@ -0,0 +1,239 @@
+"""Per-route request metrics in the Prometheus text format.
+
+``MetricsMiddleware`` is a plain ASGI middleware: it times each request up to
+the last body chunk, counts the bytes sent, and labels both with the route
+template (``/employees/{employee_id}``), never the raw path, so the number of
+series stays fixed. SQL statements are counted and timed by engine events and
+charged to the request running them through a context variable; the
+threadpool that runs sync handlers copies the context, and the shared
+``RequestStats`` object carries the counts back. Statements outside a request
+(startup, background compaction) only reach the process totals.
+Server-sent event streams stay open for as long as the client listens, so
+they are counted by status but kept out of the latency and size histograms.
+
+Everything is a handful of integer additions per request and per statement,
+so it stays on in production (``metrics_enabled`` turns it off);
+``GET /metrics`` renders the current values.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import Engine, event
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "(unmatched)"
+EVENT_STREAM = b"text/event-stream"
+
+
+class RequestStats:
+    __slots__ = ("scope", "statements", "sql_seconds")
+
+    def __init__(self, scope: Optional[dict] = None):
+        # Routing fills in scope["route"] before the handler runs any SQL.
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        # One slot per bucket plus the +Inf overflow; cumulated when rendered.
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.responses: dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.sql_seconds = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        size: int,
+        stats: RequestStats,
+        streaming: bool = False,
+    ) -> None:
+        with self._lock:
+            metrics = self.routes.get((method, route))
+            if metrics is None:
+                metrics = self.routes[(method, route)] = RouteMetrics()
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+            if not streaming:
+                metrics.latency.observe(seconds)
+                metrics.size.observe(size)
+            metrics.statements.observe(stats.statements)
+            metrics.sql_seconds += stats.sql_seconds
+
+    def observe_statement(self, seconds: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.sql_seconds += seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self.routes.clear()
+            self.statements = 0
+            self.sql_seconds = 0.0
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self.routes.items())
+            lines = [
+                "# HELP http_requests_total Responses by route and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route), metrics in routes:
+                for status, count in sorted(metrics.responses.items()):
+                    lines.append(f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+            for name, help_text, attribute in (
+                ("http_request_duration_seconds", "Time until the last response byte was sent.", "latency"),
+                ("http_response_size_bytes", "Response body size.", "size"),
+                ("http_request_sql_statements", "SQL statements run per request.", "statements"),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), metrics in routes:
+                    lines += _histogram(name, _labels(method, route), getattr(metrics, attribute))
+            lines += [
+                "# HELP http_request_sql_seconds_total Time spent in SQL statements, by route.",
+                "# TYPE http_request_sql_seconds_total counter",
+            ]
+            lines += [
+                f"http_request_sql_seconds_total{{{_labels(method, route)}}} {_number(metrics.sql_seconds)}"
+                for (method, route), metrics in routes
+            ]
+            lines += [
+                "# HELP db_statements_total SQL statements run by the process, in requests or not.",
+                "# TYPE db_statements_total counter",
+                f"db_statements_total {self.statements}",
+                "# HELP db_statement_seconds_total Time spent in SQL statements by the process.",
+                "# TYPE db_statement_seconds_total counter",
+                f"db_statement_seconds_total {_number(self.sql_seconds)}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, route: str) -> str:
+    escaped = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{escaped}"'
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+def _histogram(name: str, labels: str, histogram: Histogram) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{_number(bound)}"}} {cumulative}')
+    cumulative += histogram.counts[-1]
+    lines += [
+        f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}',
+        f"{name}_sum{{{labels}}} {_number(histogram.total)}",
+        f"{name}_count{{{labels}}} {cumulative}",
+    ]
+    return lines
+
+
+registry = MetricsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context.metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = time.perf_counter() - context.metrics_started
+    registry.observe_statement(seconds)
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += seconds
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status = 500
+        size = 0
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status, size, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                streaming = any(
+                    name == b"content-type" and value.startswith(EVENT_STREAM) for name, value in message["headers"]
+                )
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            route = scope.get("route")
+            registry.observe_request(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - started,
+                size,
+                stats,
+                streaming,
+            )
+
+
+def install(app) -> None:
+    """Add the middleware to ``app`` and start counting statements.
+
+    The listeners go on the Engine class, so they cover whichever engine
+    ``database`` currently holds (tests and benchmarks swap it) and the async
+    engine's sync core.
+    """
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.add_middleware(MetricsMiddleware)
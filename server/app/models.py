@@ -1,6 +1,7 @@
-from datetime import datetime, time
+from datetime import date, datetime, time
 from typing import Optional
 
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -10,6 +11,26 @@ class Role(str):
     VIEWER = "viewer"
 
 
+class Recurrence(str):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+
+
+class Experience(str):
+    EASY = "easy"
+    MEDIUM = "medium"
+    EXPERT = "expert"
+
+
+EXPERIENCE_LEVELS = (Experience.EASY, Experience.MEDIUM, Experience.EXPERT)  # least to most
+
+
+class QualificationKind(str):
+    EXPERIENCE = "experience"
+    ROLE = "role"
+    CERTIFICATION = "certification"
+
+
 class UserBase(SQLModel):
     email: str = Field(index=True, unique=True)
     full_name: str
@@ -40,6 +61,9 @@ class EmployeeBase(SQLModel):
 class Employee(EmployeeBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     assignments: list["ShiftAssignment"] = Relationship(back_populates="employee")
+    qualifications: list["Qualification"] = Relationship(
+        back_populates="employee", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+    )
 
 
 class EmployeeCreate(EmployeeBase):
@@ -50,10 +74,37 @@ class EmployeeRead(EmployeeBase):
     id: int
 
 
+class EmployeeBulkItem(EmployeeBase):
+    id: Optional[int] = None
+
+
+class Qualification(SQLModel, table=True):
+    __table_args__ = (Index("ux_qualification_employee_id_kind_name", "employee_id", "kind", "name", unique=True),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    employee_id: int = Field(foreign_key="employee.id")
+    kind: str  # QualificationKind; an experience row is named after its level
+    name: str  # normalized: lower case, single spaces
+    expires_on: Optional[date] = None  # certifications only; valid through this day
+    employee: Optional[Employee] = Relationship(back_populates="qualifications")
+
+
+class Certification(SQLModel):
+    name: str
+    expires_on: Optional[date] = None
+
+
+class EmployeeQualifications(SQLModel):
+    experience: Optional[str] = None  # one of EXPERIENCE_LEVELS
+    roles: list[str] = []
+    certifications: list[Certification] = []
+
+
 class TaskBase(SQLModel):
     name: str
     description: Optional[str] = None
-    certification_required: Optional[str] = None
+    certification_required: Optional[str] = None  # a role or a certification valid on the shift's day
+    min_experience: Optional[str] = None  # one of EXPERIENCE_LEVELS
 
 
 class Task(TaskBase, table=True):
@@ -78,7 +129,14 @@ class ShiftBase(SQLModel):
 
 
 class Shift(ShiftBase, table=True):
+    __table_args__ = (
+        Index("ix_shift_starts_at_ends_at", "starts_at", "ends_at"),
+        Index("ix_shift_location_starts_at", "location", "starts_at"),
+        Index("ux_shift_template_id_starts_at", "template_id", "starts_at", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    template_id: Optional[int] = Field(default=None, foreign_key="shifttemplate.id")
     assignments: list["ShiftAssignment"] = Relationship(back_populates="shift")
 
 
@@ -88,6 +146,54 @@ class ShiftCreate(ShiftBase):
 
 class ShiftRead(ShiftBase):
     id: int
+    template_id: Optional[int] = None
+
+
+class ShiftBulkItem(ShiftBase):
+    id: Optional[int] = None
+
+
+class ShiftTemplateBase(SQLModel):
+    name: str
+    location: str
+    start_time: time
+    end_time: time  # at or before start_time means the shift ends the next day
+    required_staff: int = 1
+    frequency: str = Field(default=Recurrence.DAILY)
+    interval: int = 1
+    weekdays: Optional[list[int]] = Field(default=None, sa_column=Column(JSON))  # 0 = Monday
+    valid_from: date
+    valid_until: Optional[date] = None
+
+
+class ShiftTemplate(ShiftTemplateBase, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    exceptions: list["ShiftTemplateException"] = Relationship(
+        back_populates="template", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+    )
+
+
+class ShiftTemplateException(SQLModel, table=True):
+    __table_args__ = (Index("ux_shifttemplateexception_template_id_on_date", "template_id", "on_date", unique=True),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    template_id: int = Field(foreign_key="shifttemplate.id")
+    on_date: date
+    template: Optional[ShiftTemplate] = Relationship(back_populates="exceptions")
+
+
+class ShiftTemplateCreate(ShiftTemplateBase):
+    exceptions: list[date] = []
+
+
+class ShiftTemplateRead(ShiftTemplateBase):
+    id: int
+    exceptions: list[date] = []
+
+
+class ShiftTemplateExpansion(SQLModel):
+    created: int
+    skipped: int
 
 
 class ShiftAssignmentBase(SQLModel):
@@ -100,16 +206,75 @@ class ShiftAssignmentBase(SQLModel):
 
 
 class ShiftAssignment(ShiftAssignmentBase, table=True):
+    __table_args__ = (
+        Index("ix_shiftassignment_employee_id_shift_id", "employee_id", "shift_id"),
+        Index("ix_shiftassignment_shift_id_task_id", "shift_id", "task_id"),
+        Index("ix_shiftassignment_task_id", "task_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     shift: Optional[Shift] = Relationship(back_populates="assignments")
     employee: Optional[Employee] = Relationship(back_populates="assignments")
     task: Optional[Task] = Relationship(back_populates="assignments")
 
 
+class AttendanceRollup(SQLModel, table=True):
+    """Per-employee, per-day attendance totals maintained by ``app.attendance``.
+
+    Derived data keyed by plain ids, so deleting an employee never trips over it.
+    """
+
+    __table_args__ = (Index("ix_attendancerollup_work_date", "work_date"),)
+
+    employee_id: int = Field(primary_key=True)
+    work_date: date = Field(primary_key=True)
+    shifts: int = 0
+    attended: int = 0
+    late: int = 0
+    missing_check_out: int = 0
+    scheduled_seconds: int = 0
+    worked_seconds: int = 0
+    late_seconds: int = 0
+
+
+class TableVersion(SQLModel, table=True):
+    """Write counter per table, bumped on every commit that touches it (see ``app.etags``)."""
+
+    name: str = Field(primary_key=True)
+    version: int = 0
+
+
+class ChangeLog(SQLModel, table=True):
+    """One entry per row written to a synced table; ``id`` is the ``/sync`` cursor."""
+
+    # AUTOINCREMENT so ids are never reused after compaction drops the newest entries.
+    __table_args__ = (
+        Index("ix_changelog_table_name_row_id", "table_name", "row_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    table_name: str
+    row_id: int
+    deleted: bool = False
+    changed_at: datetime
+
+
+class ChangeLogCompaction(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    compacted_at: datetime
+    horizon: int
+    removed: int
+
+
 class ShiftAssignmentCreate(ShiftAssignmentBase):
     pass
 
 
+class ShiftAssignmentBulkItem(ShiftAssignmentBase):
+    id: Optional[int] = None
+
+
 class ShiftAssignmentRead(ShiftAssignmentBase):
     id: int
     shift: ShiftRead
@@ -124,3 +289,133 @@ class ShiftAssignmentUpdate(SQLModel):
     note: Optional[str] = None
     check_in_time: Optional[time] = None
     check_out_time: Optional[time] = None
+
+
+class AssignmentConflict(SQLModel):
+    employee_id: int
+    assignment_id: int
+    shift_id: int
+    conflicting_assignment_id: int
+    conflicting_shift_id: int
+
+
+class ScheduleSolveRequest(SQLModel):
+    start: datetime
+    end: datetime
+    location: Optional[str] = None
+    task_id: Optional[int] = None  # staff for this task; only employees qualified for it on the shift day are proposed
+    max_hours: Optional[float] = None  # per employee over the range, existing shifts included
+    time_budget_ms: int = Field(default=2000, ge=1, le=10000)  # the solve holds a request worker this long
+
+
+class EligibleStaff(SQLModel):
+    shift_id: int
+    task_id: Optional[int] = None
+    employee_ids: list[int]
+
+
+class ProposedAssignment(SQLModel):
+    shift_id: int
+    employee_id: int
+    task_id: Optional[int] = None
+
+
+class UnfilledShift(SQLModel):
+    shift_id: int
+    missing: int
+
+
+class ScheduleSolveResult(SQLModel):
+    assignments: list[ProposedAssignment]
+    unfilled: list[UnfilledShift]
+    hours_by_employee: dict[int, float]
+    improvement_moves: int
+    elapsed_ms: float
+
+
+class TaskCoverage(SQLModel):
+    task_id: Optional[int] = None
+    task_name: Optional[str] = None
+    assigned: int
+
+
+class ShiftCoverage(SQLModel):
+    shift_id: int
+    name: str
+    location: str
+    starts_at: datetime
+    ends_at: datetime
+    required_staff: int
+    assigned: int
+    shortfall: int
+    tasks: list[TaskCoverage] = []
+
+
+class AttendanceTotals(SQLModel):
+    employee_id: int
+    shifts: int
+    attended: int
+    no_shows: int
+    late: int
+    late_minutes: float
+    missing_check_out: int
+    scheduled_hours: float
+    worked_hours: float
+
+
+class AttendanceDay(AttendanceTotals):
+    work_date: date
+
+
+class AttendanceSummary(AttendanceTotals):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+
+class ShiftAssignmentRecord(ShiftAssignmentBase):
+    id: int
+
+
+class SyncDeletions(SQLModel):
+    employees: list[int] = []
+    tasks: list[int] = []
+    shifts: list[int] = []
+    assignments: list[int] = []
+
+
+class SyncChanges(SQLModel):
+    cursor: int
+    has_more: bool = False
+    employees: list[EmployeeRead] = []
+    tasks: list[TaskRead] = []
+    shifts: list[ShiftRead] = []
+    assignments: list[ShiftAssignmentRecord] = []
+    deleted: SyncDeletions = SyncDeletions()
+
+
+class DashboardBundle(SQLModel):
+    cursor: int
+    employees: list[EmployeeRead]
+    employees_cursor: Optional[str] = None  # more on GET /employees?cursor=...
+    tasks: list[TaskRead]
+    tasks_cursor: Optional[str] = None
+    shifts: list[ShiftRead]
+    assignments: list[ShiftAssignmentRecord]
+
+
+class SlowQuery(SQLModel):
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Optional[str] = None
+    route: Optional[str] = None  # "GET /shifts"; None outside a request or with metrics off
+    plan: list[str] = []
+
+
+class BulkItemResult(SQLModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
@@ -0,0 +1,80 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+
+from .config import get_settings
+from .database import ReadSession
+
+
+settings = get_settings()
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """Keyset pagination query parameters shared by the list endpoints."""
+
+    def __init__(
+        self,
+        cursor: str | None = Query(default=None),
+        limit: int = Query(default=settings.default_page_size, ge=1, le=settings.max_page_size),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def cursor_values(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    if not isinstance(values, list):
+        raise ValueError(cursor)
+    return values
+
+
+def cursor_width(cursor: str) -> int | None:
+    """How many columns ``cursor`` holds, or None when it is not a cursor at all."""
+
+    try:
+        return len(cursor_values(cursor))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+
+def decode_cursor(cursor: str, columns: tuple) -> list:
+    try:
+        values = cursor_values(cursor)
+        if len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else value
+            for value, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def paginate(session: ReadSession, statement, columns: tuple, page: PageParams, response: Response) -> list:
+    """Run ``statement`` ordered by ``columns`` and return one page of rows.
+
+    ``columns`` must be unique together (end with the primary key). When more rows
+    follow, the cursor for the next page is returned in the ``X-Next-Cursor`` header.
+    """
+
+    if page.cursor:
+        values = decode_cursor(page.cursor, columns)
+        statement = statement.where(tuple_(*columns) > tuple_(*values))
+    statement = statement.order_by(*columns).limit(page.limit + 1)
+    rows = await session.all(statement)
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows
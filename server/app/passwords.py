@@ -0,0 +1,135 @@
+"""Password hashing kept off the request threadpool.
+
+bcrypt is CPU-bound for hundreds of milliseconds per call. Hashes and checks run
+in a small dedicated process pool; ``password_hash_max_pending`` bounds how many
+may be queued before new logins are turned away with 503 instead of piling up.
+"""
+
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from .config import get_settings
+
+
+settings = get_settings()
+
+
+@lru_cache
+def password_context():
+    # passlib and its bcrypt backend load on first use, not on every worker start.
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return password_context().hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return password_context().verify(password, hashed_password)
+
+
+def _timed_verify(password: str, hashed_password: str) -> tuple[bool, float]:
+    started = time.perf_counter()
+    result = verify_password(password, hashed_password)
+    return result, time.perf_counter() - started
+
+
+class PasswordPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        # Typical time a verify spends in its worker, queue wait excluded; an
+        # unknown email holds a worker this long after the same queue wait.
+        self.verify_seconds = 0.25
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent sign-ins, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+
+    def _release(self, _: object = None) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def submit(self, function: Callable, *args) -> Future:
+        self._admit()
+        executor = self._get_executor()
+        if executor is None:
+            future: Future = Future()
+            try:
+                future.set_result(function(*args))
+            except Exception as exc:  # pragma: no cover - surfaced through the future
+                future.set_exception(exc)
+        else:
+            try:
+                future = executor.submit(function, *args)
+            except Exception:
+                self._release()
+                raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit(hash_password, password))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        result, elapsed = await asyncio.wrap_future(self.submit(_timed_verify, password, hashed_password))
+        self.verify_seconds = 0.9 * self.verify_seconds + 0.1 * elapsed
+        return result
+
+    async def reject_unknown(self) -> None:
+        # A pad that waits in the same queue and holds a worker for as long as a
+        # check computes, without the CPU: under load it answers when a real check
+        # would, and it is shed with the same 503 once the queue is full.
+        if self.workers > 0:
+            await asyncio.wrap_future(self.submit(time.sleep, self.verify_seconds))
+            return
+        self._admit()
+        try:
+            await asyncio.sleep(self.verify_seconds)
+        finally:
+            self._release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "verify_seconds": round(self.verify_seconds, 4),
+        }
+
+
+password_pool = PasswordPool(settings.password_hash_workers, settings.password_hash_max_pending)
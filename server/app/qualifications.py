@@ -0,0 +1,300 @@
+"""Structured qualifications and the compiled eligibility index.
+
+Each employee has ``Qualification`` rows: at most one experience level, any
+number of roles, and certifications that may expire. A task names what it
+needs in ``certification_required`` (a role, or a certification valid on the
+shift's day) and optionally a ``min_experience``.
+
+``EligibilityIndex`` compiles every row once into bitsets over a dense
+numbering of the employees: one integer per role or certification name, one
+per experience level (everyone at that level or above), plus each expiring
+certification's holders as a suffix-OR over their expiry dates. "Who may
+staff task Y on shift X" is then a couple of dictionary lookups, a bisection
+and an AND of Python ints over all staff at once, and "and is free" one more
+AND NOT with the mask of employees already busy in that window. The index is
+cached per database and rebuilt only when the ``employee`` or
+``qualification`` table version moves, so writes that bypass the session
+(raw SQL) are not seen until the next versioned write, as with ETags.
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from datetime import date, datetime
+from itertools import accumulate, compress
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+
+from . import database
+from .database import ReadSession
+from .models import (
+    EXPERIENCE_LEVELS,
+    Certification,
+    Employee,
+    EmployeeQualifications,
+    Qualification,
+    QualificationKind,
+    Shift,
+    ShiftAssignment,
+    TableVersion,
+)
+
+
+SOURCE_TABLES = (Employee.__tablename__, Qualification.__tablename__)
+EXPIRES = re.compile(r"^(?P<name>.+?)\s+until\s+(?P<expires_on>\d{4}-\d{2}-\d{2})$")
+BINARY_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+NOTE_KEYS = {
+    "experience": QualificationKind.EXPERIENCE,
+    "role": QualificationKind.ROLE,
+    "roles": QualificationKind.ROLE,
+    "certification": QualificationKind.CERTIFICATION,
+    "certifications": QualificationKind.CERTIFICATION,
+}
+
+
+def normalize(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def parse_notes(notes: Optional[str]) -> EmployeeQualifications:
+    """Qualifications written into free-text notes as ``key: value`` pairs.
+
+    Pairs are separated by ``|`` and list values by commas, e.g.
+    ``experience: expert | role: rescue, check | certification: first aid until 2025-06-30``.
+    Anything else in the notes is ignored.
+    """
+
+    parsed = EmployeeQualifications()
+    for part in (notes or "").split("|"):
+        key, separator, value = part.partition(":")
+        kind = NOTE_KEYS.get(normalize(key))
+        if not separator or kind is None:
+            continue
+        if kind == QualificationKind.EXPERIENCE:
+            level = normalize(value)
+            if level in EXPERIENCE_LEVELS:
+                parsed.experience = level
+            continue
+        for item in value.split(","):
+            if kind == QualificationKind.ROLE:
+                parsed.roles.append(item)
+                continue
+            match = EXPIRES.match(item.strip())
+            try:
+                expires_on = date.fromisoformat(match["expires_on"]) if match else None
+            except ValueError:
+                expires_on = None
+            parsed.certifications.append(Certification(name=match["name"] if match else item, expires_on=expires_on))
+    return clean(parsed)
+
+
+def clean(qualifications: EmployeeQualifications) -> EmployeeQualifications:
+    """Names normalized, blanks and duplicates dropped; a certification listed twice keeps its latest expiry."""
+
+    certifications: dict[str, Optional[date]] = {}
+    for certification in qualifications.certifications:
+        name = normalize(certification.name)
+        if not name:
+            continue
+        if name in certifications:
+            current = certifications[name]
+            # No expiry outlasts any date.
+            if current is None or certification.expires_on is None:
+                certifications[name] = None
+            else:
+                certifications[name] = max(current, certification.expires_on)
+        else:
+            certifications[name] = certification.expires_on
+    return EmployeeQualifications(
+        experience=normalize(qualifications.experience) if qualifications.experience else None,
+        roles=sorted({normalize(role) for role in qualifications.roles} - {""}),
+        certifications=[Certification(name=name, expires_on=expires_on) for name, expires_on in sorted(certifications.items())],
+    )
+
+
+def check_experience(level: Optional[str]) -> None:
+    if level is not None and level not in EXPERIENCE_LEVELS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Experience must be one of {', '.join(EXPERIENCE_LEVELS)}",
+        )
+
+
+def to_rows(qualifications: EmployeeQualifications) -> list[Qualification]:
+    """``Qualification`` rows, without ``employee_id``, for an already ``clean`` set."""
+
+    rows = [Qualification(kind=QualificationKind.ROLE, name=role) for role in qualifications.roles]
+    rows.extend(
+        Qualification(kind=QualificationKind.CERTIFICATION, name=certification.name, expires_on=certification.expires_on)
+        for certification in qualifications.certifications
+    )
+    if qualifications.experience:
+        rows.append(Qualification(kind=QualificationKind.EXPERIENCE, name=qualifications.experience))
+    return rows
+
+
+def replace(employee: Employee, qualifications: EmployeeQualifications) -> None:
+    """Make ``employee``'s rows match a ``clean`` set, keeping the rows that stay.
+
+    Rows are matched on ``(kind, name)`` rather than deleted and re-added, since
+    the flush inserts before it deletes and would trip the unique index.
+    """
+
+    wanted = {(row.kind, row.name): row for row in to_rows(qualifications)}
+    kept = []
+    for row in employee.qualifications:
+        replacement = wanted.pop((row.kind, row.name), None)
+        if replacement is not None:
+            row.expires_on = replacement.expires_on
+            kept.append(row)
+    employee.qualifications = kept + list(wanted.values())
+
+
+def from_rows(rows: Iterable[Qualification]) -> EmployeeQualifications:
+    qualifications = EmployeeQualifications()
+    for row in rows:
+        if row.kind == QualificationKind.EXPERIENCE:
+            qualifications.experience = row.name
+        elif row.kind == QualificationKind.ROLE:
+            qualifications.roles.append(row.name)
+        else:
+            qualifications.certifications.append(Certification(name=row.name, expires_on=row.expires_on))
+    qualifications.roles.sort()
+    qualifications.certifications.sort(key=lambda certification: certification.name)
+    return qualifications
+
+
+class EligibilityIndex:
+    """Qualifications of all employees as bitsets; bit ``i`` is ``employee_ids[i]``.
+
+    Masks are built and read through strings of binary digits, which CPython
+    converts to and from ints in linear time; setting or testing one bit of a
+    100k-bit int at a time would copy the whole int on every step.
+    """
+
+    def __init__(self, employee_ids: Iterable[int], rows: Iterable[tuple[int, str, str, Optional[date]]]):
+        """``rows`` holds ``(employee_id, kind, name, expires_on)``."""
+
+        self.employee_ids = sorted(employee_ids)
+        self.position = {employee_id: index for index, employee_id in enumerate(self.employee_ids)}
+        self.everyone = (1 << len(self.employee_ids)) - 1
+        held: dict[str, list[int]] = {}
+        levels: dict[str, list[int]] = {level: [] for level in EXPERIENCE_LEVELS}
+        expiring: dict[str, dict[date, list[int]]] = {}
+        for employee_id, kind, name, expires_on in rows:
+            index = self.position.get(employee_id)
+            if index is None:
+                continue
+            if kind == QualificationKind.EXPERIENCE:
+                if name in levels:
+                    levels[name].append(index)
+            elif kind == QualificationKind.CERTIFICATION and expires_on is not None:
+                expiring.setdefault(name, {}).setdefault(expires_on, []).append(index)
+            else:
+                held.setdefault(name, []).append(index)
+        self._held = {name: self._bits(positions) for name, positions in held.items()}
+        # Everyone at a level or above it, accumulated from the most experienced down.
+        descending = EXPERIENCE_LEVELS[::-1]
+        self._experienced = dict(
+            zip(descending, accumulate((self._bits(levels[level]) for level in descending), int.__or__))
+        )
+        # Per name: distinct expiry dates ascending, and everyone whose expiry is at or after each.
+        self._expiring: dict[str, tuple[list[date], list[int]]] = {}
+        for name, by_date in expiring.items():
+            dates = sorted(by_date)
+            suffix = list(accumulate((self._bits(by_date[day]) for day in reversed(dates)), int.__or__))[::-1]
+            self._expiring[name] = (dates, suffix + [0])
+
+    def _bits(self, positions: Iterable[int]) -> int:
+        digits = bytearray(b"0" * len(self.employee_ids))
+        for index in positions:
+            digits[index] = ord("1")
+        digits.reverse()  # bit 0 is the last digit
+        return int(digits or b"0", 2)
+
+    def holding(self, requirement: Optional[str], on: date) -> int:
+        """Employees with a role, or a certification valid on ``on``, named ``requirement``."""
+
+        if not requirement:
+            return self.everyone
+        name = normalize(requirement)
+        mask = self._held.get(name, 0)
+        expiring = self._expiring.get(name)
+        if expiring is not None:
+            dates, suffix = expiring
+            mask |= suffix[bisect_left(dates, on)]
+        return mask
+
+    def experienced(self, level: Optional[str]) -> int:
+        """Employees at ``level`` or above; an unknown level matches nobody."""
+
+        return self._experienced.get(level, 0) if level else self.everyone
+
+    def eligible(self, requirement: Optional[str], min_experience: Optional[str], on: date) -> int:
+        return self.holding(requirement, on) & self.experienced(min_experience)
+
+    def mask(self, employee_ids: Iterable[int]) -> int:
+        position = self.position
+        return self._bits(position[employee_id] for employee_id in employee_ids if employee_id in position)
+
+    def ids(self, mask: int) -> list[int]:
+        # Lowest bit first, as 0/1 bytes to select with.
+        selectors = f"{mask:b}"[::-1].encode().translate(BINARY_DIGITS)
+        return list(compress(self.employee_ids, selectors))
+
+
+_compiled: dict[str, tuple[tuple, EligibilityIndex]] = {}
+_lock = threading.Lock()
+
+
+def _versions_statement():
+    return select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(SOURCE_TABLES))
+
+
+def _rows_statement():
+    return select(Qualification.employee_id, Qualification.kind, Qualification.name, Qualification.expires_on)
+
+
+def _cached(versions: tuple) -> Optional[EligibilityIndex]:
+    with _lock:
+        entry = _compiled.get(str(database.engine.url))
+    return entry[1] if entry is not None and entry[0] == versions else None
+
+
+def _store(versions: tuple, index: EligibilityIndex) -> EligibilityIndex:
+    with _lock:
+        _compiled[str(database.engine.url)] = (versions, index)
+    return index
+
+
+def eligibility_index(session: Session) -> EligibilityIndex:
+    """The compiled index for the current employees and qualifications."""
+
+    versions = tuple(sorted(map(tuple, session.exec(_versions_statement()).all())))
+    index = _cached(versions)
+    if index is None:
+        employee_ids = session.exec(select(Employee.id)).all()
+        index = _store(versions, EligibilityIndex(employee_ids, session.exec(_rows_statement()).all()))
+    return index
+
+
+async def read_eligibility_index(session: ReadSession) -> EligibilityIndex:
+    versions = tuple(sorted(map(tuple, await session.all(_versions_statement()))))
+    index = _cached(versions)
+    if index is None:
+        employee_ids = await session.all(select(Employee.id))
+        index = _store(versions, EligibilityIndex(employee_ids, await session.all(_rows_statement())))
+    return index
+
+
+def busy_statement(starts_at: datetime, ends_at: datetime):
+    """Employees with an assignment overlapping ``[starts_at, ends_at)``."""
+
+    return (
+        select(ShiftAssignment.employee_id)
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .where(Shift.starts_at < ends_at, Shift.ends_at > starts_at)
+        .distinct()
+    )
@@ -0,0 +1,96 @@
+"""Expansion of recurring shift templates into concrete ``Shift`` rows."""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from . import changelog
+from .models import Recurrence, Shift, ShiftTemplate, ShiftTemplateException
+
+
+def occurrence_dates(template: ShiftTemplate, start: date, end: date, skip: set[date]) -> Iterator[date]:
+    """Dates in ``[start, end]`` on which ``template`` produces a shift."""
+
+    first = max(start, template.valid_from)
+    last = min(end, template.valid_until) if template.valid_until else end
+    interval = max(template.interval, 1)
+    if template.frequency == Recurrence.WEEKLY:
+        weekdays = set(template.weekdays or [template.valid_from.weekday()])
+        anchor_week = template.valid_from - timedelta(days=template.valid_from.weekday())
+        day = first
+        while day <= last:
+            week = (day - anchor_week).days // 7
+            if week % interval == 0 and day.weekday() in weekdays and day not in skip:
+                yield day
+            day += timedelta(days=1)
+    else:
+        offset = (first - template.valid_from).days % interval
+        day = first + timedelta(days=(interval - offset) % interval)
+        step = timedelta(days=interval)
+        while day <= last:
+            if day not in skip:
+                yield day
+            day += step
+
+
+def shift_rows(template: ShiftTemplate, days: Iterable[date]) -> Iterator[dict]:
+    overnight = timedelta(days=1) if template.end_time <= template.start_time else timedelta()
+    for day in days:
+        yield {
+            "name": template.name,
+            "location": template.location,
+            "starts_at": datetime.combine(day, template.start_time),
+            "ends_at": datetime.combine(day + overnight, template.end_time),
+            "required_staff": template.required_staff,
+            "template_id": template.id,
+        }
+
+
+def expand_templates(session: Session, templates: Sequence[ShiftTemplate], start: date, end: date) -> tuple[int, int]:
+    """Insert the shifts ``templates`` produce between ``start`` and ``end``.
+
+    Shifts already expanded for a template (same ``template_id`` and ``starts_at``)
+    are skipped, so expanding a range twice is a no-op. Returns
+    ``(created, skipped)``; the caller commits.
+    """
+
+    template_ids = [template.id for template in templates]
+    if not template_ids:
+        return 0, 0
+    window_start = datetime.combine(start, datetime.min.time())
+    window_end = datetime.combine(end + timedelta(days=1), datetime.min.time())
+
+    exceptions: dict[int, set[date]] = {}
+    for template_id, on_date in session.exec(
+        select(ShiftTemplateException.template_id, ShiftTemplateException.on_date).where(
+            ShiftTemplateException.template_id.in_(template_ids),
+            ShiftTemplateException.on_date >= start,
+            ShiftTemplateException.on_date <= end,
+        )
+    ):
+        exceptions.setdefault(template_id, set()).add(on_date)
+    existing = set(
+        session.exec(
+            select(Shift.template_id, Shift.starts_at).where(
+                Shift.template_id.in_(template_ids),
+                Shift.starts_at >= window_start,
+                Shift.starts_at < window_end,
+            )
+        ).all()
+    )
+
+    rows = []
+    skipped = 0
+    for template in templates:
+        days = occurrence_dates(template, start, end, exceptions.get(template.id, set()))
+        for row in shift_rows(template, days):
+            if (row["template_id"], row["starts_at"]) in existing:
+                skipped += 1
+            else:
+                rows.append(row)
+    if rows:
+        new_ids = session.execute(insert(Shift).returning(Shift.id), rows).scalars().all()
+        changelog.record(session, Shift, new_ids)
+    return len(rows), skipped
@@ -1,10 +1,17 @@
-from . import auth, employees, tasks, shifts, assignments, reports
+from . import auth, employees, tasks, shifts, templates, assignments, schedule, reports, sync, events, dashboard, metrics, admin
 
 __all__ = [
     "auth",
     "employees",
     "tasks",
     "shifts",
+    "templates",
     "assignments",
+    "schedule",
     "reports",
+    "sync",
+    "events",
+    "dashboard",
+    "metrics",
+    "admin",
 ]
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, status
+
+from ..auth import require_role
+from ..models import Role, SlowQuery, User
+from ..slow_queries import recorder
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/slow-queries", response_model=list[SlowQuery])
+def list_slow_queries(_: User = Depends(require_role([Role.ADMIN]))):
+    """Statements over ``slow_query_threshold_ms``, newest first; empty while the recorder is off."""
+
+    return recorder.records()[::-1]
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(_: User = Depends(require_role([Role.ADMIN]))):
+    recorder.clear()
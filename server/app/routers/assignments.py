@@ -1,45 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import joinedload
 from sqlmodel import Session, select
 
+from .. import attendance
 from ..auth import require_role
-from ..database import get_session
+from ..bulk import apply_bulk, check_batch_size, existing_ids
+from ..conflicts import (
+    assignment_employees,
+    existing_interval_index,
+    find_conflicts,
+    lock_for_assignment_writes,
+    overlapping_assignment_ids,
+    shift_windows,
+)
+from ..etags import conditional
+from ..database import ReadSession, get_read_session, get_session
+from ..pagination import PageParams, paginate
 from ..models import (
+    AssignmentConflict,
+    BulkItemResult,
     Employee,
+    EmployeeRead,
     Role,
     Shift,
     ShiftAssignment,
+    ShiftAssignmentBulkItem,
     ShiftAssignmentCreate,
     ShiftAssignmentRead,
     ShiftAssignmentUpdate,
+    ShiftRead,
     Task,
+    TaskRead,
     User,
 )
+from ..serialization import RowShape, json_response
 
 
 router = APIRouter(prefix="/assignments", tags=["assignments"])
 
+ASSIGNMENT_SHAPE = RowShape(
+    ShiftAssignmentRead,
+    ShiftAssignment,
+    {"shift": (ShiftRead, Shift), "employee": (EmployeeRead, Employee), "task": (TaskRead, Task)},
+)
+
+
+def with_relations(statement):
+    """Load shift, employee and task alongside each assignment in the same query."""
+
+    return statement.options(
+        joinedload(ShiftAssignment.shift),
+        joinedload(ShiftAssignment.employee),
+        joinedload(ShiftAssignment.task),
+    )
+
+
+def ensure_no_overlap(session: Session, employee_id: int, shift: Shift, exclude_id: int | None = None) -> None:
+    overlaps = overlapping_assignment_ids(session, employee_id, shift.starts_at, shift.ends_at, exclude_id)
+    if overlaps:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Employee is already assigned to an overlapping shift (assignment {overlaps[0]})",
+        )
+
+
+def to_read(item: ShiftAssignment) -> ShiftAssignmentRead:
+    return ShiftAssignmentRead(
+        id=item.id,
+        shift=item.shift,
+        employee=item.employee,
+        task=item.task,
+        shift_id=item.shift_id,
+        employee_id=item.employee_id,
+        task_id=item.task_id,
+        note=item.note,
+        check_in_time=item.check_in_time,
+        check_out_time=item.check_out_time,
+    )
+
 
 @router.get("", response_model=list[ShiftAssignmentRead])
-def list_assignments(
+async def list_assignments(
+    response: Response,
+    session: ReadSession = Depends(get_read_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(ShiftAssignment, Shift, Employee, Task)),
+    shift_id: int | None = Query(default=None),
+    employee_id: int | None = Query(default=None),
+    task_id: int | None = Query(default=None),
+    location: str | None = Query(default=None),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
+    page: PageParams = Depends(),
+):
+    statement = (
+        select(*ASSIGNMENT_SHAPE.columns)
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .join(Employee, Employee.id == ShiftAssignment.employee_id)
+        .outerjoin(Task, Task.id == ShiftAssignment.task_id)
+    )
+    if shift_id is not None:
+        statement = statement.where(ShiftAssignment.shift_id == shift_id)
+    if employee_id is not None:
+        statement = statement.where(ShiftAssignment.employee_id == employee_id)
+    if task_id is not None:
+        statement = statement.where(ShiftAssignment.task_id == task_id)
+    if location:
+        statement = statement.where(Shift.location == location)
+    if start:
+        statement = statement.where(Shift.starts_at >= start)
+    if end:
+        statement = statement.where(Shift.ends_at <= end)
+    rows = await paginate(session, statement, (ShiftAssignment.id,), page, response)
+    return json_response(ASSIGNMENT_SHAPE.to_dicts(rows), response)
+
+
+@router.get("/conflicts", response_model=list[AssignmentConflict])
+def list_conflicts(
     session: Session = Depends(get_session),
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(ShiftAssignment, Shift)),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
 ):
-    assignments = session.exec(select(ShiftAssignment)).all()
-    return [
-        ShiftAssignmentRead(
-            id=item.id,
-            shift=item.shift,
-            employee=item.employee,
-            task=item.task,
-            shift_id=item.shift_id,
-            employee_id=item.employee_id,
-            task_id=item.task_id,
-            note=item.note,
-            check_in_time=item.check_in_time,
-            check_out_time=item.check_out_time,
-        )
-        for item in assignments
-    ]
+    statement = select(
+        ShiftAssignment.id, ShiftAssignment.employee_id, ShiftAssignment.shift_id, Shift.starts_at, Shift.ends_at
+    ).join(Shift, Shift.id == ShiftAssignment.shift_id)
+    if start:
+        statement = statement.where(Shift.ends_at > start)
+    if end:
+        statement = statement.where(Shift.starts_at < end)
+    statement = statement.order_by(ShiftAssignment.employee_id, Shift.starts_at, ShiftAssignment.id)
+    return find_conflicts(session.exec(statement))
 
 
 @router.post("", response_model=ShiftAssignmentRead, status_code=status.HTTP_201_CREATED)
@@ -48,28 +142,79 @@ def create_assignment(
     session: Session = Depends(get_session),
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
 ):
+    lock_for_assignment_writes(session, [payload.employee_id])
     shift = session.get(Shift, payload.shift_id)
     employee = session.get(Employee, payload.employee_id)
     if not shift or not employee:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Shift or employee not found")
+    ensure_no_overlap(session, employee.id, shift)
 
-    task = session.get(Task, payload.task_id) if payload.task_id else None
     assignment = ShiftAssignment.model_validate(payload)
     session.add(assignment)
+    session.flush()
+    attendance.apply_changes(session, [], attendance.snapshot(session, assignment_ids=[assignment.id]))
     session.commit()
-    session.refresh(assignment)
-    return ShiftAssignmentRead(
-        id=assignment.id,
-        shift=shift,
-        employee=employee,
-        task=task,
-        shift_id=assignment.shift_id,
-        employee_id=assignment.employee_id,
-        task_id=assignment.task_id,
-        note=assignment.note,
-        check_in_time=assignment.check_in_time,
-        check_out_time=assignment.check_out_time,
-    )
+    assignment = session.exec(
+        with_relations(select(ShiftAssignment).where(ShiftAssignment.id == assignment.id))
+    ).one()
+    return to_read(assignment)
+
+
+@router.post("/bulk", response_model=list[BulkItemResult])
+def bulk_upsert_assignments(
+    payload: list[ShiftAssignmentBulkItem],
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    check_batch_size(payload)
+    lock_for_assignment_writes(session, (item.employee_id for item in payload))
+    windows = shift_windows(session, (item.shift_id for item in payload))
+    employees = existing_ids(session, Employee.id, (item.employee_id for item in payload))
+    tasks = existing_ids(session, Task.id, (item.task_id for item in payload))
+
+    errors: dict[int, str] = {}
+    for index, item in enumerate(payload):
+        if item.shift_id not in windows or item.employee_id not in employees:
+            errors[index] = "Shift or employee not found"
+        elif item.task_id is not None and item.task_id not in tasks:
+            errors[index] = "Task not found"
+
+    # Check overlaps in item order against current assignments and the items
+    # accepted before it. A row leaves the index only once the item replacing it
+    # is accepted, so a failed or unknown update never frees its slot.
+    if windows:
+        current = assignment_employees(session, (item.id for item in payload))
+        intervals = existing_interval_index(
+            session,
+            [*(item.employee_id for item in payload), *current.values()],
+            min(starts_at for starts_at, _ in windows.values()),
+            max(ends_at for _, ends_at in windows.values()),
+        )
+        for index, item in enumerate(payload):
+            if index in errors or (item.id is not None and item.id not in current):
+                continue
+            starts_at, ends_at = windows[item.shift_id]
+            overlaps = [key for key in intervals.overlapping(item.employee_id, starts_at, ends_at) if key != item.id]
+            if overlaps:
+                other = overlaps[0]
+                errors[index] = (
+                    f"Overlaps item {other[1]} in this batch"
+                    if isinstance(other, tuple)
+                    else f"Overlaps assignment {other}"
+                )
+            else:
+                if item.id is not None:
+                    intervals.discard(current[item.id], item.id)
+                intervals.add(item.employee_id, starts_at, ends_at, ("item", index))
+
+    existing = [item.id for item in payload if item.id is not None]
+    before = attendance.snapshot(session, assignment_ids=existing)
+    results = apply_bulk(session, ShiftAssignment, payload, errors)
+    # Same ids as before, so an update that failed adds back what it subtracted.
+    created = [result.id for result in results if result.status == "created"]
+    attendance.apply_changes(session, before, attendance.snapshot(session, assignment_ids=existing + created))
+    session.commit()
+    return results
 
 
 @router.patch("/{assignment_id}", response_model=ShiftAssignmentRead)
@@ -82,25 +227,25 @@ def update_assignment(
     assignment = session.get(ShiftAssignment, assignment_id)
     if not assignment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
+    if payload.model_fields_set & {"shift_id", "employee_id"}:
+        lock_for_assignment_writes(session, {assignment.employee_id, payload.employee_id or assignment.employee_id})
 
+    before = attendance.snapshot(session, assignment_ids=[assignment_id])
     data = payload.model_dump(exclude_unset=True)
     for key, value in data.items():
         setattr(assignment, key, value)
+    if "shift_id" in data or "employee_id" in data:
+        shift = session.get(Shift, assignment.shift_id)
+        if not shift or not session.get(Employee, assignment.employee_id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Shift or employee not found")
+        ensure_no_overlap(session, assignment.employee_id, shift, exclude_id=assignment_id)
     session.add(assignment)
+    attendance.apply_changes(session, before, attendance.snapshot(session, assignment_ids=[assignment_id]))
     session.commit()
-    session.refresh(assignment)
-    return ShiftAssignmentRead(
-        id=assignment.id,
-        shift=assignment.shift,
-        employee=assignment.employee,
-        task=assignment.task,
-        shift_id=assignment.shift_id,
-        employee_id=assignment.employee_id,
-        task_id=assignment.task_id,
-        note=assignment.note,
-        check_in_time=assignment.check_in_time,
-        check_out_time=assignment.check_out_time,
-    )
+    assignment = session.exec(
+        with_relations(select(ShiftAssignment).where(ShiftAssignment.id == assignment_id))
+    ).one()
+    return to_read(assignment)
 
 
 @router.delete("/{assignment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -112,5 +257,7 @@ def delete_assignment(
     assignment = session.get(ShiftAssignment, assignment_id)
     if not assignment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
+    before = attendance.snapshot(session, assignment_ids=[assignment_id])
     session.delete(assignment)
+    attendance.apply_changes(session, before, [])
     session.commit()
@@ -1,12 +1,16 @@
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
 
-from ..auth import create_access_token, verify_password, hash_password, require_role
+from ..auth import create_access_token, principal_cache, require_role
 from ..config import get_settings
-from ..database import get_session
+from ..etags import conditional
+from ..database import ReadSession, get_read_session, get_session
+from ..pagination import PageParams, paginate
+from ..passwords import password_pool
 from ..models import User, UserCreate, UserRead, Role
 
 
@@ -15,10 +19,14 @@ settings = get_settings()
 
 
 @router.post("/token")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
     query = select(User).where(User.email == form_data.username)
-    user = session.exec(query).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(lambda: session.exec(query).first())
+    if not user:
+        # Answer in about the time a real check takes, without spending CPU on it.
+        await password_pool.reject_unknown()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password")
+    if not await password_pool.verify(form_data.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password")
 
     access_token = create_access_token(
@@ -29,12 +37,13 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = D
 
 
 @router.post("/users", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     payload: UserCreate,
     session: Session = Depends(get_session),
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
 ):
-    existing = session.exec(select(User).where(User.email == payload.email)).first()
+    query = select(User).where(User.email == payload.email)
+    existing = await run_in_threadpool(lambda: session.exec(query).first())
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
@@ -42,17 +51,34 @@ def create_user(
         email=payload.email,
         full_name=payload.full_name,
         role=payload.role,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await password_pool.hash(payload.password),
     )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-    return user
+
+    def save() -> User:
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return user
+
+    return await run_in_threadpool(save)
 
 
 @router.get("/users", response_model=list[UserRead])
-def list_users(
-    session: Session = Depends(get_session),
+async def list_users(
+    response: Response,
+    session: ReadSession = Depends(get_read_session),
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+    __: str = Depends(conditional(User)),
+    page: PageParams = Depends(),
 ):
-    return session.exec(select(User)).all()
+    return await paginate(session, select(User), (User.id,), page, response)
+
+
+@router.get("/cache-stats")
+def principal_cache_stats(_: User = Depends(require_role([Role.ADMIN]))):
+    return principal_cache.stats()
+
+
+@router.get("/password-pool-stats")
+def password_pool_stats(_: User = Depends(require_role([Role.ADMIN]))):
+    return password_pool.stats()
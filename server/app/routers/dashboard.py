@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlmodel import select
+
+from ..auth import require_role
+from ..changelog import HEAD
+from ..config import get_settings
+from ..database import ReadSession, get_read_session
+from ..etags import conditional
+from ..models import DashboardBundle, Employee, Role, Shift, ShiftAssignment, ShiftAssignmentRecord, Task, User
+from ..pagination import encode_cursor
+from ..serialization import RowShape, json_response
+from .employees import EMPLOYEE_SHAPE
+from .shifts import SHIFT_SHAPE
+from .tasks import TASK_SHAPE
+
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+ASSIGNMENT_RECORD_SHAPE = RowShape(ShiftAssignmentRecord, ShiftAssignment)
+settings = get_settings()
+
+
+async def first_page(session: ReadSession, shape: RowShape, key) -> tuple[list, str | None]:
+    """Up to ``max_page_size`` rows by ``key``, and the ``cursor`` that continues
+    them on the collection's own list endpoint when more follow."""
+
+    rows = await session.all(select(*shape.columns).order_by(key).limit(settings.max_page_size + 1))
+    if len(rows) <= settings.max_page_size:
+        return rows, None
+    rows = rows[: settings.max_page_size]
+    return rows, encode_cursor([getattr(rows[-1], key.key)])
+
+
+@router.get("", response_model=DashboardBundle)
+async def dashboard_bundle(
+    response: Response,
+    session: ReadSession = Depends(get_read_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(Employee, Task, Shift, ShiftAssignment)),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
+    location: str | None = Query(default=None),
+):
+    """Everything the dashboard shows for a window, each object exactly once.
+
+    Shifts (and their assignments) are filtered like ``/shifts``. Employees and
+    tasks are not windowed, since the forms pick from all of them; each comes as
+    a first page, and ``employees_cursor`` / ``tasks_cursor``, when set, continue
+    it on ``/employees`` and ``/tasks``. Assignments carry ids only. ``cursor``
+    lets the client continue with ``/sync``.
+
+    The window is at most ``dashboard_window_days`` long and defaults to that many
+    days from midnight today (UTC), or around whichever bound is given.
+    """
+
+    window = timedelta(days=settings.dashboard_window_days)
+    if start is None:
+        start = end - window if end else datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    if end is None:
+        end = start + window
+    if end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start")
+    if end - start > window:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window is longer than {settings.dashboard_window_days} days",
+        )
+
+    shift_filters = [Shift.starts_at >= start, Shift.ends_at <= end]
+    if location:
+        shift_filters.append(Shift.location == location)
+
+    (cursor,) = await session.all(HEAD)
+    employees, employees_cursor = await first_page(session, EMPLOYEE_SHAPE, Employee.id)
+    tasks, tasks_cursor = await first_page(session, TASK_SHAPE, Task.id)
+    shifts = await session.all(select(*SHIFT_SHAPE.columns).where(*shift_filters).order_by(Shift.starts_at, Shift.id))
+    assignments = await session.all(
+        select(*ASSIGNMENT_RECORD_SHAPE.columns)
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .where(*shift_filters)
+        .order_by(ShiftAssignment.id)
+    )
+    return json_response(
+        {
+            "cursor": cursor,
+            "employees": EMPLOYEE_SHAPE.to_dicts(employees),
+            "employees_cursor": employees_cursor,
+            "tasks": TASK_SHAPE.to_dicts(tasks),
+            "tasks_cursor": tasks_cursor,
+            "shifts": SHIFT_SHAPE.to_dicts(shifts),
+            "assignments": ASSIGNMENT_RECORD_SHAPE.to_dicts(assignments),
+        },
+        response,
+    )
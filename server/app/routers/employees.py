@@ -1,20 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlmodel import Session, select
 
-from ..database import get_session
-from ..models import Employee, EmployeeCreate, EmployeeRead, Role, User
+from .. import attendance, qualifications, search
+from ..etags import conditional
+from ..database import ReadSession, get_read_session, get_session
+from ..pagination import PageParams, paginate
+from ..models import (
+    BulkItemResult,
+    Employee,
+    EmployeeBulkItem,
+    EmployeeCreate,
+    EmployeeQualifications,
+    EmployeeRead,
+    Role,
+    User,
+)
 from ..auth import require_role
+from ..serialization import RowShape, json_response
+from ..bulk import apply_bulk, check_batch_size
 
 
 router = APIRouter(prefix="/employees", tags=["employees"])
+EMPLOYEE_SHAPE = RowShape(EmployeeRead, Employee)
 
 
 @router.get("", response_model=list[EmployeeRead])
-def list_employees(
-    session: Session = Depends(get_session),
+async def list_employees(
+    response: Response,
+    session: ReadSession = Depends(get_read_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(Employee)),
+    page: PageParams = Depends(),
+):
+    rows = await paginate(session, select(*EMPLOYEE_SHAPE.columns), (Employee.id,), page, response)
+    return json_response(EMPLOYEE_SHAPE.to_dicts(rows), response)
+
+
+@router.get("/search", response_model=list[EmployeeRead])
+async def search_employees(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    session: ReadSession = Depends(get_read_session),
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(Employee)),
+    page: PageParams = Depends(),
 ):
-    return session.exec(select(Employee)).all()
+    """Employees matching every word of ``q`` as a prefix of a name, position, phone or notes word, best first."""
+
+    terms = search.search_terms(q)
+    if not terms:
+        return json_response([], response)
+    fts = search.uses_fts()
+    order = await search.result_order(session, terms, fts, page.cursor)
+    statement = search.search_statement(select(*EMPLOYEE_SHAPE.columns), terms, fts, order)
+    rows = await paginate(session, statement, order, page, response)
+    return json_response(EMPLOYEE_SHAPE.to_dicts(rows), response)
 
 
 @router.post("", response_model=EmployeeRead, status_code=status.HTTP_201_CREATED)
@@ -30,6 +70,18 @@ def create_employee(
     return employee
 
 
+@router.post("/bulk", response_model=list[BulkItemResult])
+def bulk_upsert_employees(
+    payload: list[EmployeeBulkItem],
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    check_batch_size(payload)
+    results = apply_bulk(session, Employee, payload, {})
+    session.commit()
+    return results
+
+
 @router.put("/{employee_id}", response_model=EmployeeRead)
 def update_employee(
     employee_id: int,
@@ -48,6 +100,37 @@ def update_employee(
     return employee
 
 
+@router.get("/{employee_id}/qualifications", response_model=EmployeeQualifications)
+def get_qualifications(
+    employee_id: int,
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+):
+    employee = session.get(Employee, employee_id)
+    if not employee:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
+    return qualifications.from_rows(employee.qualifications)
+
+
+@router.put("/{employee_id}/qualifications", response_model=EmployeeQualifications)
+def replace_qualifications(
+    employee_id: int,
+    payload: EmployeeQualifications,
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    employee = session.get(Employee, employee_id)
+    if not employee:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
+    wanted = qualifications.clean(payload)
+    qualifications.check_experience(wanted.experience)
+    qualifications.replace(employee, wanted)
+    session.add(employee)
+    session.commit()
+    session.refresh(employee)
+    return qualifications.from_rows(employee.qualifications)
+
+
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_employee(
     employee_id: int,
@@ -57,5 +140,7 @@ def delete_employee(
     employee = session.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
+    before = attendance.snapshot(session, employee_ids=[employee_id])
     session.delete(employee)
+    attendance.apply_changes(session, before, attendance.snapshot(session, employee_ids=[employee_id]))
     session.commit()
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+from ..auth import get_stream_user, require_role, stream_token
+from ..changelog import HEAD
+from ..config import get_settings
+from ..database import ReadSession, get_read_session
+from ..events import HEARTBEAT_FRAME, RESYNC_FRAME, Subscription, broker
+from ..models import Role, User
+
+
+settings = get_settings()
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+async def event_stream(subscription: Subscription, expires_at: float, resync: bool):
+    try:
+        # Reconnect after 5s if dropped; the browser resends the last seen id.
+        yield b"retry: 5000\n\n"
+        if resync:
+            yield RESYNC_FRAME
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return
+            try:
+                frame = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=min(settings.event_stream_heartbeat_seconds, remaining)
+                )
+            except asyncio.TimeoutError:
+                frame = HEARTBEAT_FRAME
+            yield frame
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("")
+async def stream_events(
+    _: User = Depends(get_stream_user),
+    token: str = Depends(stream_token),
+    session: ReadSession = Depends(get_read_session),
+    last_event_id: int | None = Header(default=None),
+):
+    """Server-sent events for every committed change to the synced tables.
+
+    ``change`` frames carry the new ``/sync`` cursor and the touched row ids;
+    ``resync`` means events were missed and the client should call ``/sync``.
+    The stream ends when the token expires, so a client reconnects with a
+    fresh one.
+    """
+
+    # Subscribed before reading HEAD, so a commit landing in between is
+    # either counted in HEAD or queued, never lost.
+    subscription = broker.subscribe()
+    try:
+        resync = False
+        if last_event_id is not None:
+            (head,) = await session.all(HEAD)
+            resync = last_event_id < head
+        from jose import jwt
+
+        expires_at = jwt.get_unverified_claims(token)["exp"]
+    except BaseException:
+        broker.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        event_stream(subscription, expires_at, resync),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+def event_stream_stats(_: User = Depends(require_role([Role.ADMIN]))):
+    return broker.stats()
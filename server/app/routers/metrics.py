@@ -0,0 +1,31 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from sqlmodel import Session
+
+from ..auth import get_current_user, oauth2_scheme
+from ..config import get_settings
+from ..database import get_session
+from ..metrics import registry
+from ..models import Role
+
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+settings = get_settings()
+
+
+def authorize_scrape(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> None:
+    """Scrapers send ``metrics_token`` as their bearer token; anyone else must be an admin."""
+
+    if settings.metrics_token and hmac.compare_digest(token.encode(), settings.metrics_token.encode()):
+        return
+    if get_current_user(token, session).role != Role.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+
+
+@router.get("", response_class=PlainTextResponse, dependencies=[Depends(authorize_scrape)])
+def prometheus_metrics():
+    """Prometheus text exposition."""
+
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,69 +1,440 @@
 import csv
 import io
-from datetime import datetime
+import zlib
+from datetime import date, datetime
+from typing import AsyncIterator, Callable
 
-from fastapi import APIRouter, Depends, Response
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case
+from sqlmodel import func, select
 
 from ..auth import require_role
-from ..database import get_session
-from ..models import Role, ShiftAssignment, User, Shift
+from ..etags import conditional
+from ..database import ReadSession, get_read_session, read_session_scope
+from ..models import (
+    AttendanceDay,
+    AttendanceRollup,
+    AttendanceSummary,
+    Employee,
+    Role,
+    Shift,
+    ShiftAssignment,
+    ShiftCoverage,
+    Task,
+    TaskCoverage,
+    User,
+)
 
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+EXPORT_CHUNK_SIZE = 1000
+ASSIGNMENT_CSV_HEADER = [
+    "Assignment ID",
+    "Shift",
+    "Location",
+    "Start",
+    "End",
+    "Employee",
+    "Task",
+    "Note",
+    "Check In",
+    "Check Out",
+]
+COVERAGE_CSV_HEADER = [
+    "Shift ID",
+    "Shift",
+    "Location",
+    "Start",
+    "End",
+    "Required",
+    "Assigned",
+    "Shortfall",
+    "Tasks",
+]
+ATTENDANCE_CSV_HEADER = [
+    "Employee ID",
+    "Employee",
+    "Shifts",
+    "Attended",
+    "No-shows",
+    "Late",
+    "Late Minutes",
+    "Missing Check-out",
+    "Scheduled Hours",
+    "Worked Hours",
+]
+
+
+async def assignment_export_rows(session: ReadSession, start: datetime | None, end: datetime | None):
+    """Yield flat export rows in chunks, with shift, employee and task joined in SQL.
+
+    Outer joins keep assignments whose employee or shift has since been deleted.
+    """
+
+    statement = (
+        select(
+            ShiftAssignment.id,
+            Shift.name,
+            Shift.location,
+            Shift.starts_at,
+            Shift.ends_at,
+            Employee.first_name,
+            Employee.last_name,
+            Task.name,
+            ShiftAssignment.note,
+            ShiftAssignment.check_in_time,
+            ShiftAssignment.check_out_time,
+        )
+        .outerjoin(Shift, Shift.id == ShiftAssignment.shift_id)
+        .outerjoin(Employee, Employee.id == ShiftAssignment.employee_id)
+        .outerjoin(Task, Task.id == ShiftAssignment.task_id)
+        .order_by(ShiftAssignment.id)
+    )
+    if start:
+        statement = statement.where(Shift.starts_at >= start)
+    if end:
+        statement = statement.where(Shift.ends_at <= end)
+
+    async for partition in session.partitions(statement, EXPORT_CHUNK_SIZE):
+        yield [
+            [
+                assignment_id,
+                shift_name or "",
+                location or "",
+                starts_at.isoformat() if starts_at else "",
+                ends_at.isoformat() if ends_at else "",
+                f"{first_name} {last_name}" if first_name is not None else "",
+                task_name or "",
+                note or "",
+                check_in.isoformat() if check_in else "",
+                check_out.isoformat() if check_out else "",
+            ]
+            for (
+                assignment_id,
+                shift_name,
+                location,
+                starts_at,
+                ends_at,
+                first_name,
+                last_name,
+                task_name,
+                note,
+                check_in,
+                check_out,
+            ) in partition
+        ]
+
+
+async def stream_csv(header: list[str], produce_rows: Callable[[ReadSession], AsyncIterator[list]], compress: bool):
+    """Encode row chunks from ``produce_rows`` as CSV as they arrive, optionally gzipped."""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def flush() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    # The request-scoped session is closed before the body is sent, so the
+    # generator owns its own session for the lifetime of the stream.
+    async with read_session_scope() as session:
+        writer.writerow(header)
+        async for rows in produce_rows(session):
+            writer.writerows(rows)
+            chunk = flush()
+            if chunk:
+                yield chunk
+    chunk = flush()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def csv_response(name: str, body, compress: bool, etag: str) -> StreamingResponse:
+    filename = f"{name}.csv.gz" if compress else f"{name}.csv"
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if compress else "text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}", "ETag": etag},
+    )
+
 
 @router.get("/assignments.csv")
-def export_assignments(
-    session: Session = Depends(get_session),
+async def export_assignments(
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+    etag: str = Depends(conditional(ShiftAssignment, Shift, Employee, Task)),
     start: datetime | None = None,
     end: datetime | None = None,
+    compress: bool = Query(default=False),
 ):
-    statement = select(ShiftAssignment)
+    rows = stream_csv(ASSIGNMENT_CSV_HEADER, lambda session: assignment_export_rows(session, start, end), compress)
+    return csv_response("assignments", rows, compress, etag)
+
+
+def coverage_statement(start: datetime | None, end: datetime | None, location: str | None):
+    """One row per (shift, task) with the number of assignments, grouped in SQL."""
+
+    statement = (
+        select(
+            Shift.id,
+            Shift.name,
+            Shift.location,
+            Shift.starts_at,
+            Shift.ends_at,
+            Shift.required_staff,
+            ShiftAssignment.task_id,
+            Task.name,
+            func.count(ShiftAssignment.id),
+        )
+        .outerjoin(ShiftAssignment, ShiftAssignment.shift_id == Shift.id)
+        .outerjoin(Task, Task.id == ShiftAssignment.task_id)
+        .group_by(Shift.id, ShiftAssignment.task_id, Task.name)
+        .order_by(Shift.starts_at, Shift.id)
+    )
     if start:
-        statement = statement.where(ShiftAssignment.shift.has(Shift.starts_at >= start))
+        statement = statement.where(Shift.starts_at >= start)
     if end:
-        statement = statement.where(ShiftAssignment.shift.has(Shift.ends_at <= end))
+        statement = statement.where(Shift.ends_at <= end)
+    if location:
+        statement = statement.where(Shift.location == location)
+    return statement
 
-    assignments = session.exec(statement).all()
 
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow([
-        "Assignment ID",
-        "Shift",
-        "Location",
-        "Start",
-        "End",
-        "Employee",
-        "Task",
-        "Note",
-        "Check In",
-        "Check Out",
-    ])
-
-    for assignment in assignments:
-        shift = assignment.shift
-        employee = assignment.employee
-        task = assignment.task
-        writer.writerow(
+async def coverage_chunks(
+    session: ReadSession, start: datetime | None, end: datetime | None, location: str | None, understaffed: bool
+) -> AsyncIterator[list[ShiftCoverage]]:
+    """Fold the grouped rows into one ``ShiftCoverage`` per shift, chunk by chunk.
+
+    Rows arrive ordered by shift, so a shift is complete as soon as the next one
+    starts; only the shift in progress is carried across chunk boundaries.
+    """
+
+    current: ShiftCoverage | None = None
+    async for partition in session.partitions(coverage_statement(start, end, location), EXPORT_CHUNK_SIZE):
+        finished = []
+        for shift_id, name, shift_location, starts_at, ends_at, required, task_id, task_name, count in partition:
+            if current is None or current.shift_id != shift_id:
+                if current is not None:
+                    finished.append(current)
+                current = ShiftCoverage(
+                    shift_id=shift_id,
+                    name=name,
+                    location=shift_location,
+                    starts_at=starts_at,
+                    ends_at=ends_at,
+                    required_staff=required,
+                    assigned=0,
+                    shortfall=0,
+                )
+            if count:
+                current.assigned += count
+                current.tasks.append(TaskCoverage(task_id=task_id, task_name=task_name, assigned=count))
+        yield [finalize_coverage(item) for item in finished if not understaffed or item.assigned < item.required_staff]
+    if current is not None and (not understaffed or current.assigned < current.required_staff):
+        yield [finalize_coverage(current)]
+
+
+def finalize_coverage(item: ShiftCoverage) -> ShiftCoverage:
+    item.shortfall = max(item.required_staff - item.assigned, 0)
+    return item
+
+
+@router.get("/coverage", response_model=list[ShiftCoverage])
+async def staffing_coverage(
+    session: ReadSession = Depends(get_read_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(Shift, ShiftAssignment, Task)),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    location: str | None = None,
+    understaffed: bool = Query(default=False),
+):
+    items: list[ShiftCoverage] = []
+    async for chunk in coverage_chunks(session, start, end, location, understaffed):
+        items.extend(chunk)
+    return items
+
+
+async def coverage_csv_rows(session: ReadSession, start, end, location, understaffed) -> AsyncIterator[list]:
+    async for chunk in coverage_chunks(session, start, end, location, understaffed):
+        yield [
             [
-                assignment.id,
-                shift.name if shift else "",
-                shift.location if shift else "",
-                shift.starts_at.isoformat() if shift else "",
-                shift.ends_at.isoformat() if shift else "",
-                f"{employee.first_name} {employee.last_name}" if employee else "",
-                task.name if task else "",
-                assignment.note or "",
-                assignment.check_in_time.isoformat() if assignment.check_in_time else "",
-                assignment.check_out_time.isoformat() if assignment.check_out_time else "",
+                item.shift_id,
+                item.name,
+                item.location,
+                item.starts_at.isoformat(),
+                item.ends_at.isoformat(),
+                item.required_staff,
+                item.assigned,
+                item.shortfall,
+                "; ".join(f"{task.task_name or 'Unassigned'}: {task.assigned}" for task in item.tasks),
             ]
+            for item in chunk
+        ]
+
+
+@router.get("/coverage.csv")
+async def export_coverage(
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+    etag: str = Depends(conditional(Shift, ShiftAssignment, Task)),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    location: str | None = None,
+    understaffed: bool = Query(default=False),
+    compress: bool = Query(default=False),
+):
+    rows = stream_csv(
+        COVERAGE_CSV_HEADER,
+        lambda session: coverage_csv_rows(session, start, end, location, understaffed),
+        compress,
+    )
+    return csv_response("coverage", rows, compress, etag)
+
+
+def attendance_columns(today: date) -> list:
+    """Summed rollup metrics; a day only produces no-shows once it is over."""
+
+    return [
+        func.sum(AttendanceRollup.shifts),
+        func.sum(AttendanceRollup.attended),
+        func.sum(
+            case(
+                (AttendanceRollup.work_date < today, AttendanceRollup.shifts - AttendanceRollup.attended),
+                else_=0,
+            )
+        ),
+        func.sum(AttendanceRollup.late),
+        func.sum(AttendanceRollup.late_seconds),
+        func.sum(AttendanceRollup.missing_check_out),
+        func.sum(AttendanceRollup.scheduled_seconds),
+        func.sum(AttendanceRollup.worked_seconds),
+    ]
+
+
+def attendance_totals(values) -> dict:
+    shifts, attended, no_shows, late, late_seconds, missing_check_out, scheduled_seconds, worked_seconds = values
+    return {
+        "shifts": shifts,
+        "attended": attended,
+        "no_shows": no_shows,
+        "late": late,
+        "late_minutes": round(late_seconds / 60, 2),
+        "missing_check_out": missing_check_out,
+        "scheduled_hours": round(scheduled_seconds / 3600, 2),
+        "worked_hours": round(worked_seconds / 3600, 2),
+    }
+
+
+def attendance_filters(statement, start: date | None, end: date | None, employee_id: int | None):
+    if start:
+        statement = statement.where(AttendanceRollup.work_date >= start)
+    if end:
+        statement = statement.where(AttendanceRollup.work_date <= end)
+    if employee_id is not None:
+        statement = statement.where(AttendanceRollup.employee_id == employee_id)
+    return statement
+
+
+@router.get("/attendance/daily", response_model=list[AttendanceDay])
+async def attendance_by_day(
+    session: ReadSession = Depends(get_read_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+    __: str = Depends(conditional(AttendanceRollup, daily=True)),
+    start: date | None = None,
+    end: date | None = None,
+    employee_id: int | None = None,
+):
+    statement = (
+        select(AttendanceRollup.employee_id, AttendanceRollup.work_date, *attendance_columns(date.today()))
+        .group_by(AttendanceRollup.employee_id, AttendanceRollup.work_date)
+        .order_by(AttendanceRollup.work_date, AttendanceRollup.employee_id)
+    )
+    rows = await session.all(attendance_filters(statement, start, end, employee_id))
+    return [
+        AttendanceDay(employee_id=row[0], work_date=row[1], **attendance_totals(row[2:]))
+        for row in rows
+    ]
+
+
+def attendance_summary_statement(start: date | None, end: date | None, employee_id: int | None):
+    statement = (
+        select(
+            AttendanceRollup.employee_id,
+            Employee.first_name,
+            Employee.last_name,
+            *attendance_columns(date.today()),
+        )
+        .outerjoin(Employee, Employee.id == AttendanceRollup.employee_id)
+        .group_by(AttendanceRollup.employee_id, Employee.first_name, Employee.last_name)
+        .order_by(AttendanceRollup.employee_id)
+    )
+    return attendance_filters(statement, start, end, employee_id)
+
+
+@router.get("/attendance", response_model=list[AttendanceSummary])
+async def attendance_by_period(
+    session: ReadSession = Depends(get_read_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+    __: str = Depends(conditional(AttendanceRollup, Employee, daily=True)),
+    start: date | None = None,
+    end: date | None = None,
+    employee_id: int | None = None,
+):
+    rows = await session.all(attendance_summary_statement(start, end, employee_id))
+    return [
+        AttendanceSummary(
+            employee_id=row[0],
+            first_name=row[1],
+            last_name=row[2],
+            start=start,
+            end=end,
+            **attendance_totals(row[3:]),
         )
+        for row in rows
+    ]
+
 
-    return Response(
-        content=buffer.getvalue(),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=assignments.csv"},
+async def attendance_csv_rows(session: ReadSession, start, end, employee_id) -> AsyncIterator[list]:
+    statement = attendance_summary_statement(start, end, employee_id)
+    async for partition in session.partitions(statement, EXPORT_CHUNK_SIZE):
+        rows = []
+        for employee, first_name, last_name, *values in partition:
+            totals = attendance_totals(values)
+            rows.append(
+                [
+                    employee,
+                    f"{first_name} {last_name}" if first_name is not None else "",
+                    totals["shifts"],
+                    totals["attended"],
+                    totals["no_shows"],
+                    totals["late"],
+                    totals["late_minutes"],
+                    totals["missing_check_out"],
+                    totals["scheduled_hours"],
+                    totals["worked_hours"],
+                ]
+            )
+        yield rows
+
+
+@router.get("/attendance.csv")
+async def export_attendance(
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+    etag: str = Depends(conditional(AttendanceRollup, Employee, daily=True)),
+    start: date | None = None,
+    end: date | None = None,
+    employee_id: int | None = None,
+    compress: bool = Query(default=False),
+):
+    rows = stream_csv(
+        ATTENDANCE_CSV_HEADER,
+        lambda session: attendance_csv_rows(session, start, end, employee_id),
+        compress,
     )
+    return csv_response("attendance", rows, compress, etag)
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session, select
+
+from .. import qualifications
+from ..auth import require_role
+from ..database import ReadSession, get_read_session, get_session
+from ..etags import conditional
+from ..models import (
+    EligibleStaff,
+    Employee,
+    Qualification,
+    Role,
+    ScheduleSolveRequest,
+    ScheduleSolveResult,
+    Shift,
+    ShiftAssignment,
+    Task,
+    User,
+)
+from ..solver import solve_roster
+
+
+router = APIRouter(prefix="/schedule", tags=["schedule"])
+
+
+@router.get("/eligible", response_model=EligibleStaff)
+async def eligible_staff(
+    shift_id: int = Query(),
+    task_id: int | None = Query(default=None),
+    session: ReadSession = Depends(get_read_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(Shift, ShiftAssignment, Task, Employee, Qualification)),
+):
+    """Employees qualified for ``task_id`` on the shift's day and not already working during it."""
+
+    shifts = await session.all(select(Shift.starts_at, Shift.ends_at).where(Shift.id == shift_id))
+    if not shifts:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shift not found")
+    starts_at, ends_at = shifts[0]
+    requirement = min_experience = None
+    if task_id is not None:
+        tasks = await session.all(select(Task.certification_required, Task.min_experience).where(Task.id == task_id))
+        if not tasks:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+        requirement, min_experience = tasks[0]
+
+    index = await qualifications.read_eligibility_index(session)
+    busy = index.mask(await session.all(qualifications.busy_statement(starts_at, ends_at)))
+    eligible = index.eligible(requirement, min_experience, starts_at.date()) & ~busy
+    return EligibleStaff(shift_id=shift_id, task_id=task_id, employee_ids=index.ids(eligible))
+
+
+@router.post("/solve", response_model=ScheduleSolveResult)
+def solve_schedule(
+    payload: ScheduleSolveRequest,
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    """Propose assignments for under-staffed shifts; nothing is written.
+
+    Commit the proposal by posting ``assignments`` to ``/assignments/bulk``.
+    """
+
+    if payload.end <= payload.start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start")
+    if payload.task_id is not None and session.get(Task, payload.task_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    return solve_roster(session, payload)
@@ -1,30 +1,43 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlmodel import Session, select
 
+from .. import attendance
 from ..auth import require_role
-from ..database import get_session
-from ..models import Role, Shift, ShiftCreate, ShiftRead, User
+from ..bulk import apply_bulk, check_batch_size
+from ..conflicts import shift_move_conflicts
+from ..etags import conditional
+from ..database import ReadSession, get_read_session, get_session
+from ..pagination import PageParams, paginate
+from ..models import BulkItemResult, Role, Shift, ShiftBulkItem, ShiftCreate, ShiftRead, User
+from ..serialization import RowShape, json_response
 
 
 router = APIRouter(prefix="/shifts", tags=["shifts"])
+SHIFT_SHAPE = RowShape(ShiftRead, Shift)
 
 
 @router.get("", response_model=list[ShiftRead])
-def list_shifts(
-    session: Session = Depends(get_session),
+async def list_shifts(
+    response: Response,
+    session: ReadSession = Depends(get_read_session),
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(Shift)),
     start: datetime | None = Query(default=None),
     end: datetime | None = Query(default=None),
+    location: str | None = Query(default=None),
+    page: PageParams = Depends(),
 ):
-    statement = select(Shift)
+    statement = select(*SHIFT_SHAPE.columns)
     if start:
         statement = statement.where(Shift.starts_at >= start)
     if end:
         statement = statement.where(Shift.ends_at <= end)
-    statement = statement.order_by(Shift.starts_at)
-    return session.exec(statement).all()
+    if location:
+        statement = statement.where(Shift.location == location)
+    rows = await paginate(session, statement, (Shift.starts_at, Shift.id), page, response)
+    return json_response(SHIFT_SHAPE.to_dicts(rows), response)
 
 
 @router.post("", response_model=ShiftRead, status_code=status.HTTP_201_CREATED)
@@ -40,6 +53,30 @@ def create_shift(
     return shift
 
 
+@router.post("/bulk", response_model=list[BulkItemResult])
+def bulk_upsert_shifts(
+    payload: list[ShiftBulkItem],
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    check_batch_size(payload)
+    # A move that would double-book someone on the shift is rejected, checked in
+    # item order like assignment batches.
+    updates = [(index, item) for index, item in enumerate(payload) if item.id is not None]
+    rejected = shift_move_conflicts(session, [(item.id, item.starts_at, item.ends_at) for _, item in updates])
+    errors = {
+        updates[position][0]: f"Moves assignment {assignment_id} onto overlapping assignment {other}"
+        for position, (assignment_id, other) in rejected.items()
+    }
+    # Moving a shift moves its assignments' hours and lateness with it.
+    replaced = [item.id for item in payload if item.id is not None]
+    before = attendance.snapshot(session, shift_ids=replaced)
+    results = apply_bulk(session, Shift, payload, errors)
+    attendance.apply_changes(session, before, attendance.snapshot(session, shift_ids=replaced))
+    session.commit()
+    return results
+
+
 @router.put("/{shift_id}", response_model=ShiftRead)
 def update_shift(
     shift_id: int,
@@ -50,9 +87,19 @@ def update_shift(
     shift = session.get(Shift, shift_id)
     if not shift:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shift not found")
+    if (payload.starts_at, payload.ends_at) != (shift.starts_at, shift.ends_at):
+        rejected = shift_move_conflicts(session, [(shift_id, payload.starts_at, payload.ends_at)])
+        if rejected:
+            assignment_id, other = rejected[0]
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Moving the shift would double-book assignment {assignment_id} (overlaps assignment {other})",
+            )
+    before = attendance.snapshot(session, shift_ids=[shift_id])
     for key, value in payload.model_dump().items():
         setattr(shift, key, value)
     session.add(shift)
+    attendance.apply_changes(session, before, attendance.snapshot(session, shift_ids=[shift_id]))
     session.commit()
     session.refresh(shift)
     return shift
@@ -67,5 +114,7 @@ def delete_shift(
     shift = session.get(Shift, shift_id)
     if not shift:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shift not found")
+    before = attendance.snapshot(session, shift_ids=[shift_id])
     session.delete(shift)
+    attendance.apply_changes(session, before, attendance.snapshot(session, shift_ids=[shift_id]))
     session.commit()
@@ -0,0 +1,76 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session, select
+
+from ..auth import require_role
+from ..bulk import IN_CLAUSE_CHUNK
+from ..changelog import HEAD, HORIZON, SYNCED_MODELS, compact
+from ..config import get_settings
+from ..database import ReadSession, get_read_session, get_session
+from ..models import ChangeLog, Role, SyncChanges, SyncDeletions, User
+
+
+settings = get_settings()
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+# Response field for each synced table.
+FIELDS = {"employee": "employees", "task": "tasks", "shift": "shifts", "shiftassignment": "assignments"}
+
+
+@router.get("", response_model=SyncChanges)
+async def sync_changes(
+    session: ReadSession = Depends(get_read_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    since: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=settings.sync_page_size, ge=1, le=settings.sync_page_size),
+):
+    """Rows created, updated or deleted after ``since``, in their current state.
+
+    Without ``since`` only the current cursor is returned, to start syncing
+    after a full load. A cursor older than the compaction horizon gets 410 and
+    the client reloads in full. ``has_more`` means call again with the new cursor.
+    """
+
+    (oldest,) = await session.all(HORIZON)
+    if since is None:
+        # Compaction may have dropped the newest entries; never hand out a cursor below the horizon.
+        (head,) = await session.all(HEAD)
+        return SyncChanges(cursor=max(head, oldest))
+    if since < oldest:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Cursor expired, reload everything")
+
+    entries = await session.all(
+        select(ChangeLog.id, ChangeLog.table_name, ChangeLog.row_id)
+        .where(ChangeLog.id > since)
+        .order_by(ChangeLog.id)
+        .limit(limit)
+    )
+    changed: dict[str, set[int]] = defaultdict(set)
+    for _, table, row_id in entries:
+        changed[table].add(row_id)
+
+    result = SyncChanges(cursor=entries[-1][0] if entries else since, has_more=len(entries) == limit)
+    deleted = SyncDeletions()
+    for table, ids in changed.items():
+        model = SYNCED_MODELS[table]
+        wanted = sorted(ids)
+        rows = []
+        for start in range(0, len(wanted), IN_CLAUSE_CHUNK):
+            rows.extend(await session.all(select(model).where(model.id.in_(wanted[start : start + IN_CLAUSE_CHUNK]))))
+        setattr(result, FIELDS[table], rows)
+        # Whatever no longer exists was deleted, however often it changed before that.
+        setattr(deleted, FIELDS[table], sorted(ids - {row.id for row in rows}))
+    result.deleted = deleted
+    return result
+
+
+@router.post("/compact")
+def compact_change_log(
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN])),
+):
+    removed = compact(session, timedelta(days=settings.change_log_retention_days))
+    session.commit()
+    return {"removed": removed}
@@ -1,20 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel import Session, select
 
+from .. import qualifications
 from ..auth import require_role
-from ..database import get_session
+from ..etags import conditional
+from ..database import ReadSession, get_read_session, get_session
+from ..pagination import PageParams, paginate
 from ..models import Role, Task, TaskCreate, TaskRead, User
+from ..serialization import RowShape, json_response
 
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
+TASK_SHAPE = RowShape(TaskRead, Task)
 
 
 @router.get("", response_model=list[TaskRead])
-def list_tasks(
-    session: Session = Depends(get_session),
+async def list_tasks(
+    response: Response,
+    session: ReadSession = Depends(get_read_session),
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(Task)),
+    page: PageParams = Depends(),
 ):
-    return session.exec(select(Task)).all()
+    rows = await paginate(session, select(*TASK_SHAPE.columns), (Task.id,), page, response)
+    return json_response(TASK_SHAPE.to_dicts(rows), response)
 
 
 @router.post("", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
@@ -23,6 +32,7 @@ def create_task(
     session: Session = Depends(get_session),
     _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
 ):
+    qualifications.check_experience(payload.min_experience)
     task = Task.model_validate(payload)
     session.add(task)
     session.commit()
@@ -40,6 +50,7 @@ def update_task(
     task = session.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    qualifications.check_experience(payload.min_experience)
     for key, value in payload.model_dump().items():
         setattr(task, key, value)
     session.add(task)
@@ -0,0 +1,153 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from .. import changelog
+from ..auth import require_role
+from ..config import get_settings
+from ..database import get_session
+from ..etags import conditional
+from ..models import (
+    Recurrence,
+    Role,
+    Shift,
+    ShiftTemplate,
+    ShiftTemplateCreate,
+    ShiftTemplateException,
+    ShiftTemplateExpansion,
+    ShiftTemplateRead,
+    User,
+)
+from ..recurrence import expand_templates
+
+
+router = APIRouter(prefix="/shift-templates", tags=["shift-templates"])
+settings = get_settings()
+
+
+def to_read(template: ShiftTemplate) -> ShiftTemplateRead:
+    return ShiftTemplateRead(
+        **template.model_dump(),
+        exceptions=sorted(exception.on_date for exception in template.exceptions),
+    )
+
+
+def validate_template(payload: ShiftTemplateCreate) -> None:
+    if payload.frequency not in (Recurrence.DAILY, Recurrence.WEEKLY):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Frequency must be daily or weekly")
+    if payload.interval < 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Interval must be at least 1")
+    if payload.weekdays and not all(0 <= day <= 6 for day in payload.weekdays):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Weekdays must be between 0 and 6")
+    if payload.valid_until and payload.valid_until < payload.valid_from:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="valid_until is before valid_from")
+
+
+def validate_range(start: date, end: date) -> None:
+    if end < start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end is before start")
+    if (end - start).days >= settings.max_template_expansion_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range is longer than {settings.max_template_expansion_days} days",
+        )
+
+
+@router.get("", response_model=list[ShiftTemplateRead])
+def list_templates(
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.VIEWER])),
+    __: str = Depends(conditional(ShiftTemplate, ShiftTemplateException)),
+):
+    templates = session.exec(select(ShiftTemplate).options(selectinload(ShiftTemplate.exceptions))).all()
+    return [to_read(template) for template in templates]
+
+
+@router.post("", response_model=ShiftTemplateRead, status_code=status.HTTP_201_CREATED)
+def create_template(
+    payload: ShiftTemplateCreate,
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    validate_template(payload)
+    template = ShiftTemplate.model_validate(payload.model_dump(exclude={"exceptions"}))
+    template.exceptions = [ShiftTemplateException(on_date=day) for day in set(payload.exceptions)]
+    session.add(template)
+    session.commit()
+    session.refresh(template)
+    return to_read(template)
+
+
+@router.put("/{template_id}", response_model=ShiftTemplateRead)
+def update_template(
+    template_id: int,
+    payload: ShiftTemplateCreate,
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    template = session.get(ShiftTemplate, template_id)
+    if not template:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    validate_template(payload)
+    for key, value in payload.model_dump(exclude={"exceptions"}).items():
+        setattr(template, key, value)
+    wanted = set(payload.exceptions)
+    template.exceptions = [exception for exception in template.exceptions if exception.on_date in wanted]
+    kept = {exception.on_date for exception in template.exceptions}
+    template.exceptions.extend(ShiftTemplateException(on_date=day) for day in wanted - kept)
+    session.add(template)
+    session.commit()
+    session.refresh(template)
+    return to_read(template)
+
+
+@router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_template(
+    template_id: int,
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN])),
+):
+    template = session.get(ShiftTemplate, template_id)
+    if not template:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    # Shifts already expanded stay on the roster, detached from the template.
+    detached = session.execute(
+        update(Shift).where(Shift.template_id == template_id).values(template_id=None).returning(Shift.id)
+    ).scalars()
+    changelog.record(session, Shift, detached)
+    session.delete(template)
+    session.commit()
+
+
+@router.post("/expand", response_model=ShiftTemplateExpansion)
+def expand_all_templates(
+    start: date = Query(),
+    end: date = Query(),
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    validate_range(start, end)
+    templates = session.exec(select(ShiftTemplate)).all()
+    created, skipped = expand_templates(session, templates, start, end)
+    session.commit()
+    return ShiftTemplateExpansion(created=created, skipped=skipped)
+
+
+@router.post("/{template_id}/expand", response_model=ShiftTemplateExpansion)
+def expand_template(
+    template_id: int,
+    start: date = Query(),
+    end: date = Query(),
+    session: Session = Depends(get_session),
+    _: User = Depends(require_role([Role.ADMIN, Role.MANAGER])),
+):
+    template = session.get(ShiftTemplate, template_id)
+    if not template:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    validate_range(start, end)
+    created, skipped = expand_templates(session, [template], start, end)
+    session.commit()
+    return ShiftTemplateExpansion(created=created, skipped=skipped)
@@ -0,0 +1,61 @@
+"""Fast JSON path for the hot list endpoints.
+
+The endpoints select exactly the columns of their read model, turn each
+result tuple into the dict that model would dump to, and hand the list to
+orjson. No ORM objects are built and nothing is validated twice; the
+``response_model`` on the route still documents the shape.
+"""
+
+from typing import Iterable
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from sqlmodel import SQLModel
+
+
+class RowShape:
+    """Columns to select for ``read_model`` and how to fold result rows into its JSON shape.
+
+    ``nested`` maps a field of ``read_model`` to ``(nested_read_model, table_model)``;
+    those columns are selected under ``<field>__<name>`` labels from joined tables.
+    A nested object whose ``id`` is NULL (an outer join that found nothing) becomes
+    ``None``.
+    """
+
+    def __init__(
+        self,
+        read_model: type[SQLModel],
+        table_model: type[SQLModel],
+        nested: dict[str, tuple[type[SQLModel], type[SQLModel]]] | None = None,
+    ):
+        nested = nested or {}
+        self.fields = tuple(name for name in read_model.model_fields if name not in nested)
+        self.columns = [getattr(table_model, name) for name in self.fields]
+        self.groups: list[tuple[str, tuple[str, ...], int, int, int]] = []
+        start = len(self.fields)
+        for key, (nested_read, nested_table) in nested.items():
+            names = tuple(nested_read.model_fields)
+            self.columns.extend(getattr(nested_table, name).label(f"{key}__{name}") for name in names)
+            self.groups.append((key, names, start, start + len(names), start + names.index("id")))
+            start += len(names)
+
+    def to_dicts(self, rows: Iterable) -> list[dict]:
+        fields, width, groups = self.fields, len(self.fields), self.groups
+        items = []
+        for row in rows:
+            item = dict(zip(fields, row[:width]))
+            for key, names, start, end, id_index in groups:
+                item[key] = dict(zip(names, row[start:end])) if row[id_index] is not None else None
+            items.append(item)
+        return items
+
+
+def json_response(content, response: Response) -> ORJSONResponse:
+    """Encode ``content`` with orjson, keeping headers dependencies set on ``response``
+    (pagination cursor, ETag), which FastAPI drops when a handler returns a Response."""
+
+    fast = ORJSONResponse(content)
+    fast.raw_headers.extend(
+        (name, value) for name, value in response.raw_headers if name != b"content-length"
+    )
+    return fast
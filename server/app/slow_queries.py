@@ -0,0 +1,141 @@
+"""Opt-in recorder for slow SQL statements and their query plans.
+
+With ``slow_query_threshold_ms`` set, every statement that takes longer is
+logged and kept, newest last, in a bounded ring buffer served at
+``GET /admin/slow-queries``. Each record carries the route that ran it (taken from the request context ``metrics`` keeps) and the
+``EXPLAIN QUERY PLAN`` of the statement, captured on the same connection right
+after it finished, so a ``SCAN`` where an index ``SEARCH`` was expected shows
+up on live traffic. The plan costs one extra round trip, paid only by
+statements that were already slow. Bound parameters are kept only with
+``slow_query_log_parameters`` on, and never for statements on the ``user``
+table, whose rows hold emails and password hashes.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Engine, event
+
+from .config import get_settings
+from .metrics import current_request
+from .models import SlowQuery
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+MAX_PARAMETERS_LENGTH = 1000
+REDACTED_TABLE = re.compile(r'\b(?:from|into|update|join)\s+"?user"?(?:\s|$)', re.IGNORECASE)
+
+
+class SlowQueryRecorder:
+    def __init__(self, threshold_ms: Optional[float], size: int, log_parameters: bool = False):
+        self.threshold_ms = threshold_ms
+        self.log_parameters = log_parameters
+        self._records: deque[SlowQuery] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, record: SlowQuery) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> list[SlowQuery]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+recorder = SlowQueryRecorder(
+    settings.slow_query_threshold_ms, settings.slow_query_log_size, settings.slow_query_log_parameters
+)
+
+
+def explain(dbapi_connection, dialect_name: str, statement: str, parameters) -> list[str]:
+    """Plan lines for ``statement``, indented by depth for SQLite's plan tree."""
+
+    if not statement.lstrip().lower().startswith(EXPLAINABLE):
+        return []
+    plan_cursor = dbapi_connection.cursor()
+    try:
+        if dialect_name == "sqlite":
+            plan_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            depth: dict[int, int] = {}
+            lines = []
+            for node_id, parent, _, detail in plan_cursor.fetchall():
+                depth[node_id] = depth.get(parent, -1) + 1
+                lines.append("  " * depth[node_id] + detail)
+            return lines
+        plan_cursor.execute(f"EXPLAIN {statement}", parameters)
+        return [" ".join(str(value) for value in row) for row in plan_cursor.fetchall()]
+    finally:
+        plan_cursor.close()
+
+
+def _route() -> Optional[str]:
+    stats = current_request.get()
+    route = stats.scope.get("route") if stats is not None and stats.scope is not None else None
+    return f"{stats.scope['method']} {route.path}" if route is not None else None
+
+
+def _logged_parameters(statement: str, parameters) -> Optional[str]:
+    if not parameters:
+        return None
+    if not recorder.log_parameters or REDACTED_TABLE.search(statement):
+        return "[redacted]"
+    return repr(parameters)[:MAX_PARAMETERS_LENGTH]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context.slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    threshold_ms = recorder.threshold_ms
+    duration_ms = (time.perf_counter() - context.slow_query_started) * 1000
+    if threshold_ms is None or duration_ms < threshold_ms:
+        return
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    try:
+        plan = explain(conn.connection.dbapi_connection, conn.dialect.name, statement, parameters)
+    except Exception as error:  # the plan is a hint; never fail the query over it
+        plan = [f"EXPLAIN failed: {error}"]
+    record = SlowQuery(
+        recorded_at=datetime.utcnow(),
+        duration_ms=round(duration_ms, 3),
+        statement=statement,
+        parameters=_logged_parameters(statement, parameters),
+        route=_route(),
+        plan=plan,
+    )
+    recorder.add(record)
+    logger.warning(
+        "Slow query %.1f ms%s: %s | %s | plan: %s",
+        duration_ms,
+        f" in {record.route}" if record.route else "",
+        " ".join(statement.split()),
+        record.parameters,
+        "; ".join(line.strip() for line in plan),
+    )
+
+
+def install() -> None:
+    """Start timing statements on every engine (the async engine's sync core included)."""
+
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def uninstall() -> None:
+    if event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
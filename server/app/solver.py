@@ -0,0 +1,211 @@
+"""Roster solver: fill under-staffed shifts with eligible, free employees.
+
+A greedy pass walks the shifts in start order and gives each open slot to the
+least-loaded employee who is eligible, free and under the hour cap. A bounded local
+search then moves proposed assignments from the busiest employees to lighter
+ones while that lowers the spread of hours, until the time budget runs out.
+"""
+
+import functools
+import heapq
+import operator
+import random
+import time
+from datetime import date, datetime
+from typing import Callable, Iterable, Optional, Sequence
+
+from sqlmodel import Session, func, select
+
+from .conflicts import IntervalIndex
+from .qualifications import eligibility_index
+from .models import (
+    ProposedAssignment,
+    ScheduleSolveRequest,
+    ScheduleSolveResult,
+    Shift,
+    ShiftAssignment,
+    Task,
+    UnfilledShift,
+)
+
+
+def hours_between(starts_at: datetime, ends_at: datetime) -> float:
+    return (ends_at - starts_at).total_seconds() / 3600
+
+
+class RosterSolver:
+    def __init__(
+        self,
+        shifts: Sequence[tuple[int, datetime, datetime, int]],
+        employee_ids: Sequence[int],
+        busy: Iterable[tuple[int, datetime, datetime]],
+        max_hours: Optional[float] = None,
+        seed: int = 0,
+        eligible: Optional[Callable[[int, int], bool]] = None,
+    ):
+        """``shifts`` holds ``(shift_id, starts_at, ends_at, open_slots)``; ``busy``
+        holds ``(employee_id, starts_at, ends_at)`` for work already on the roster.
+        ``eligible(employee_id, shift_id)``, when given, further limits who may take a shift."""
+
+        self.shifts = sorted(shifts, key=lambda shift: (shift[1], shift[0]))
+        self.employee_ids = list(employee_ids)
+        self.max_hours = max_hours
+        self.eligible = eligible
+        self.random = random.Random(seed)
+        self.hours = {employee_id: 0.0 for employee_id in self.employee_ids}
+        self.intervals = IntervalIndex()
+        for employee_id, starts_at, ends_at in busy:
+            if employee_id in self.hours:
+                self.hours[employee_id] += hours_between(starts_at, ends_at)
+                self.intervals.add(employee_id, starts_at, ends_at, None)
+        # Proposed assignments as [shift_index, employee_id]; moves edit them in place.
+        self.proposed: list[list[int]] = []
+        self.by_employee: dict[int, list[int]] = {employee_id: [] for employee_id in self.employee_ids}
+        self.unfilled: dict[int, int] = {}
+        self.moves = 0
+
+    def _fits(self, employee_id: int, shift_index: int) -> bool:
+        shift_id, starts_at, ends_at, _ = self.shifts[shift_index]
+        if self.eligible is not None and not self.eligible(employee_id, shift_id):
+            return False
+        if self.max_hours is not None and self.hours[employee_id] + hours_between(starts_at, ends_at) > self.max_hours:
+            return False
+        return not self.intervals.overlapping(employee_id, starts_at, ends_at)
+
+    def _assign(self, employee_id: int, shift_index: int, proposal: int) -> None:
+        _, starts_at, ends_at, _ = self.shifts[shift_index]
+        self.hours[employee_id] += hours_between(starts_at, ends_at)
+        self.intervals.add(employee_id, starts_at, ends_at, proposal)
+        self.by_employee[employee_id].append(proposal)
+
+    def _unassign(self, employee_id: int, shift_index: int, proposal: int) -> None:
+        _, starts_at, ends_at, _ = self.shifts[shift_index]
+        self.hours[employee_id] -= hours_between(starts_at, ends_at)
+        self.intervals.remove(employee_id, starts_at, ends_at, proposal)
+        self.by_employee[employee_id].remove(proposal)
+
+    def construct(self) -> None:
+        # Lazy heap of (hours, employee); stale entries are refreshed when popped.
+        heap = [(self.hours[employee_id], employee_id) for employee_id in self.employee_ids]
+        heapq.heapify(heap)
+        for shift_index, (shift_id, _, _, open_slots) in enumerate(self.shifts):
+            skipped = []
+            filled = 0
+            while filled < open_slots and heap:
+                hours, employee_id = heapq.heappop(heap)
+                if hours != self.hours[employee_id]:
+                    heapq.heappush(heap, (self.hours[employee_id], employee_id))
+                    continue
+                if self._fits(employee_id, shift_index):
+                    proposal = len(self.proposed)
+                    self.proposed.append([shift_index, employee_id])
+                    self._assign(employee_id, shift_index, proposal)
+                    filled += 1
+                skipped.append((self.hours[employee_id], employee_id))
+            for entry in skipped:
+                heapq.heappush(heap, entry)
+            if filled < open_slots:
+                self.unfilled[shift_id] = open_slots - filled
+
+    def improve(self, deadline: float, max_stale: int = 2000) -> None:
+        """Move proposals from heavy to light employees while that narrows the spread."""
+
+        stale = 0
+        while stale < max_stale and time.perf_counter() < deadline:
+            stale += 1
+            loaded = [employee_id for employee_id in self.employee_ids if self.by_employee[employee_id]]
+            if not loaded:
+                return
+            heavy = max(loaded, key=self.hours.__getitem__)
+            proposal = self.random.choice(self.by_employee[heavy])
+            shift_index = self.proposed[proposal][0]
+            _, starts_at, ends_at, _ = self.shifts[shift_index]
+            duration = hours_between(starts_at, ends_at)
+            # Moving lowers the sum of squared hours only if the target ends up lighter.
+            for light in sorted(self.employee_ids, key=self.hours.__getitem__)[:16]:
+                if self.hours[light] + duration >= self.hours[heavy]:
+                    break
+                if self._fits(light, shift_index):
+                    self._unassign(heavy, shift_index, proposal)
+                    self._assign(light, shift_index, proposal)
+                    self.proposed[proposal][1] = light
+                    self.moves += 1
+                    stale = 0
+                    break
+
+    def solve(self, time_budget_seconds: float) -> None:
+        deadline = time.perf_counter() + time_budget_seconds
+        self.construct()
+        self.improve(deadline)
+
+    def assignments(self) -> list[tuple[int, int]]:
+        return [(self.shifts[shift_index][0], employee_id) for shift_index, employee_id in self.proposed]
+
+
+def solve_roster(session: Session, request: ScheduleSolveRequest) -> ScheduleSolveResult:
+    started = time.perf_counter()
+    shift_statement = select(Shift.id, Shift.starts_at, Shift.ends_at, Shift.required_staff).where(
+        Shift.starts_at >= request.start, Shift.ends_at <= request.end
+    )
+    if request.location:
+        shift_statement = shift_statement.where(Shift.location == request.location)
+    shift_rows = session.exec(shift_statement).all()
+
+    staffed = dict(
+        session.exec(
+            select(ShiftAssignment.shift_id, func.count(ShiftAssignment.id))
+            .join(Shift, Shift.id == ShiftAssignment.shift_id)
+            .where(Shift.starts_at >= request.start, Shift.ends_at <= request.end)
+            .group_by(ShiftAssignment.shift_id)
+        ).all()
+    )
+    open_shifts = [
+        (shift_id, starts_at, ends_at, required - staffed.get(shift_id, 0))
+        for shift_id, starts_at, ends_at, required in shift_rows
+        if required > staffed.get(shift_id, 0)
+    ]
+
+    requirement = min_experience = None
+    if request.task_id is not None:
+        task = session.get(Task, request.task_id)
+        if task is None:
+            raise ValueError(f"unknown task {request.task_id}")
+        requirement, min_experience = task.certification_required, task.min_experience
+    index = eligibility_index(session)
+    eligible: Optional[Callable[[int, int], bool]] = None
+    employee_ids = index.employee_ids
+    if requirement or min_experience:
+        # Certifications expire, so eligibility is per shift day: one mask per day.
+        by_day: dict[date, int] = {}
+        for _, starts_at, _, _ in open_shifts:
+            day = starts_at.date()
+            if day not in by_day:
+                by_day[day] = index.eligible(requirement, min_experience, day)
+        employee_ids = index.ids(functools.reduce(operator.or_, by_day.values(), 0))
+        staff = {day: frozenset(index.ids(mask)) for day, mask in by_day.items()}
+        days = {shift_id: starts_at.date() for shift_id, starts_at, _, _ in open_shifts}
+
+        def qualified(employee_id: int, shift_id: int) -> bool:
+            return employee_id in staff[days[shift_id]]
+
+        eligible = qualified
+
+    busy = session.exec(
+        select(ShiftAssignment.employee_id, Shift.starts_at, Shift.ends_at)
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .where(Shift.starts_at < request.end, Shift.ends_at > request.start)
+    ).all()
+
+    solver = RosterSolver(open_shifts, employee_ids, busy, max_hours=request.max_hours, eligible=eligible)
+    remaining = request.time_budget_ms / 1000 - (time.perf_counter() - started)
+    solver.solve(max(remaining, 0.0))
+    return ScheduleSolveResult(
+        assignments=[
+            ProposedAssignment(shift_id=shift_id, employee_id=employee_id, task_id=request.task_id)
+            for shift_id, employee_id in solver.assignments()
+        ],
+        unfilled=[UnfilledShift(shift_id=shift_id, missing=missing) for shift_id, missing in solver.unfilled.items()],
+        hours_by_employee={employee_id: round(hours, 2) for employee_id, hours in solver.hours.items()},
+        improvement_moves=solver.moves,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
@@ -0,0 +1,80 @@
+"""Requests per second on the read endpoints, sync database path vs async.
+
+Run from the project root:
+
+    python -m server.benchmarks.async_load --assignments 20000 --concurrency 64 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from server.app.database import build_engine
+
+from .harness import login, percentile, running_server
+from .query_plans import populate
+
+
+PATHS = ["/employees", "/shifts?limit=100", "/assignments?limit=100", "/tasks"]
+
+
+async def load(base_url: str, headers: dict[str, str], concurrency: int, seconds: float) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60.0) as client:
+
+        async def user(index: int) -> None:
+            request = 0
+            while time.perf_counter() < deadline:
+                path = PATHS[(index + request) % len(PATHS)]
+                request += 1
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(user(index) for index in range(concurrency)))
+    return latencies
+
+
+def run(label: str, async_database: bool, args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        env = {
+            "SHIFT_MANAGER_DATABASE_URL": database_url,
+            "SHIFT_MANAGER_ASYNC_DATABASE": str(async_database).lower(),
+        }
+        with running_server(env) as base_url:
+            engine = build_engine(database_url)
+            populate(engine, args.assignments)
+            engine.dispose()
+            headers = login(base_url)
+            latencies = asyncio.run(load(base_url, headers, args.concurrency, args.seconds))
+
+    print(
+        f"{label}: {len(latencies) / args.seconds:7.0f} req/s  "
+        f"p50={percentile(latencies, 50):.1f}ms p99={percentile(latencies, 99):.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    run("sync sessions in threadpool", False, args)
+    run("async engine", True, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Bulk-load a realistic synthetic roster at a chosen scale.
+
+Run from the project root:
+
+    python -m server.benchmarks.dataset --scale 100k --database /tmp/roster-100k.db
+
+The database is migrated to head, then filled with employees and their
+qualifications (some first-aid certificates lapse mid-season), tasks, shifts
+(three slots a day per location, one of them overnight) and assignments that
+never double-book anyone, plus check-in/out times with some lateness, early
+leavers and no-shows. The derived tables (attendance rollup, sync change log)
+are filled too, so every endpoint sees what production would. Rows go in
+through the driver's executemany in chunks, which is what keeps 1M
+assignments to seconds rather than minutes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import itertools
+import math
+import random
+import time
+from datetime import date, datetime, time as clock, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from alembic import command
+from sqlalchemy import Engine, text
+
+from server.app import database
+from server.app.attendance import rollup_rows
+from server.app.qualifications import parse_notes
+
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SEASON_END = date(2024, 9, 30)
+CHUNK = 50_000
+SLOTS = ((clock(6), 8), (clock(14), 8), (clock(22), 8))
+TASKS = [
+    ("Tower", "Elevated chair watch", "lifeguard"),
+    ("Rescue", "Roving rescue response", "rescue"),
+    ("Slide Dispatch", "Top-of-slide dispatch", None),
+    ("Wave Pool", "Wave pool perimeter", "lifeguard"),
+    ("Lazy River", "River walk patrol", None),
+    ("First Aid", "First aid station", "first aid"),
+    ("Safety Check", "Opening and closing checks", None),
+    ("Kids Zone", "Splash pad supervision", "lifeguard"),
+    ("Gate", "Entry gate and headcount", None),
+    ("Support", "Breaks and rotations", None),
+]
+POSITIONS = [
+    ("Head Lifeguard", "expert", "head"),
+    ("Rescue Specialist", "expert", "rescue"),
+    ("Safety Checker", "medium", "check"),
+    ("Support Crew", "medium", "support"),
+    ("Part-time Lifeguard", "easy", "parttime"),
+    ("Rescue Trainee", "easy", "rescue"),
+]
+FIRST_NAMES = ["Avery", "Jordan", "Maya", "Liam", "Nora", "Eli", "Priya", "Kai", "Sofia", "Noah", "Zara", "Omar"]
+LAST_NAMES = ["Brooks", "Nguyen", "Lopez", "Harper", "Kim", "Sanchez", "Patel", "Morgan", "Reyes", "Chen", "Ali"]
+
+
+def layout(assignments: int) -> tuple[int, int, int]:
+    """Locations, days and employees for a target assignment count.
+
+    Shifts average a little under 3.9 staff, so the roster ends a few days
+    past ``SEASON_END`` and the last days stay unchecked, like upcoming shifts.
+    """
+
+    locations = min(max(assignments // 2_000, 4), 100)
+    days = max(math.ceil(assignments / (locations * len(SLOTS) * 3.9)), 1)
+    # One crew per slot, each big enough to fill every location at full strength.
+    employees = max(locations * 6 * len(SLOTS), assignments // 200)
+    return locations, days, employees
+
+
+def employee_rows(count: int, rng: random.Random) -> Iterator[tuple]:
+    for index in range(count):
+        position, experience, role = rng.choice(POSITIONS)
+        yield (
+            f"{rng.choice(FIRST_NAMES)}{index}",
+            rng.choice(LAST_NAMES),
+            position,
+            f"555-{index:05d}",
+            f"experience: {experience} | role: {role}",
+        )
+
+
+def qualification_rows(employees: list[tuple], rng: random.Random) -> Iterator[tuple]:
+    """``(employee_id, kind, name, expires_on)`` for the rows of ``employee_rows``, ids from 1."""
+
+    for employee_id, (_, _, position, _, notes) in enumerate(employees, start=1):
+        parsed = parse_notes(notes)
+        yield employee_id, "experience", parsed.experience, None
+        for role in parsed.roles:
+            yield employee_id, "role", role, None
+        if "Lifeguard" in position or "rescue" in parsed.roles:
+            yield employee_id, "certification", "lifeguard", None
+        if rng.random() < 0.6:
+            expires_on = SEASON_END + timedelta(days=rng.randint(-120, 365))
+            yield employee_id, "certification", "first aid", expires_on.isoformat()
+
+
+def check_times(rng: random.Random, starts_at: datetime, ends_at: datetime) -> tuple:
+    if starts_at.date() >= SEASON_END or rng.random() < 0.04:
+        return None, None  # upcoming, or a no-show
+    check_in = starts_at + timedelta(minutes=rng.choice((-10, -5, -2, 0, 0, 3, 12)))
+    if rng.random() < 0.03:
+        return check_in.time(), None
+    check_out = ends_at + timedelta(minutes=rng.randint(-30, 15))
+    return check_in.time(), check_out.time()
+
+
+def roster_rows(target: int, locations: int, days: int, employees: int, rng: random.Random):
+    """Yield ``(shift_row, [assignment_row, ...])`` until ``target`` assignments exist.
+
+    Each slot has its own crew, and within one slot of one day every assignment
+    takes the next crew member from a rotating cursor, so nobody is on two
+    overlapping shifts or works back-to-back slots.
+    """
+
+    crew = employees // len(SLOTS)
+    first_day = SEASON_END - timedelta(days=days - 1)
+    produced = 0
+    for day in itertools.count():
+        on_date = first_day + timedelta(days=day)
+        for slot, (start_time, hours) in enumerate(SLOTS):
+            cursor = rng.randrange(crew)
+            starts_at = datetime.combine(on_date, start_time)
+            ends_at = starts_at + timedelta(hours=hours)
+            for location in range(locations):
+                required = rng.randint(2, 6)
+                staffed = min(max(required - (rng.random() < 0.15), 1), target - produced)
+                shift = (f"{start_time:%H}:00 L{location}", f"Location {location}", starts_at, ends_at, required)
+                assignments = []
+                for _ in range(staffed):
+                    check_in, check_out = check_times(rng, starts_at, ends_at)
+                    task = rng.randint(1, len(TASKS)) if rng.random() < 0.9 else None
+                    employee_id = slot * crew + cursor % crew + 1
+                    assignments.append((employee_id, task, None, check_in, check_out, starts_at, ends_at))
+                    cursor += 1
+                produced += staffed
+                yield shift, assignments
+                if produced >= target:
+                    return
+
+
+def _stored(value: datetime) -> str:
+    """Literal in the format SQLAlchemy's SQLite types store, so range filters compare correctly."""
+
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+@functools.lru_cache(maxsize=None)
+def _stored_time(value: clock | None) -> str | None:
+    return None if value is None else value.strftime("%H:%M:%S.%f")
+
+
+def generate(engine: Engine, assignments: int, seed: int = 7) -> dict[str, int]:
+    rng = random.Random(seed)
+    locations, days, employee_count = layout(assignments)
+    with engine.begin() as connection:
+        command.upgrade(database.alembic_config(connection), "head")
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("PRAGMA synchronous = OFF")
+        employees = list(employee_rows(employee_count, rng))
+        cursor.executemany(
+            "INSERT INTO employee (first_name, last_name, position, phone, notes) VALUES (?, ?, ?, ?, ?)", employees
+        )
+        # Their own generator, so the roster below does not change with them.
+        cursor.executemany(
+            "INSERT INTO qualification (employee_id, kind, name, expires_on) VALUES (?, ?, ?, ?)",
+            qualification_rows(employees, random.Random(seed + 1)),
+        )
+        cursor.executemany(
+            "INSERT INTO task (name, description, certification_required) VALUES (?, ?, ?)", TASKS
+        )
+
+        shift_id = 0
+        shift_batch: list[tuple] = []
+        assignment_batch: list[tuple] = []
+        contributions: list[tuple] = []
+
+        def flush() -> None:
+            cursor.executemany(
+                "INSERT INTO shift (id, name, location, starts_at, ends_at, required_staff) VALUES (?, ?, ?, ?, ?, ?)",
+                shift_batch,
+            )
+            cursor.executemany(
+                "INSERT INTO shiftassignment (shift_id, employee_id, task_id, note, check_in_time, check_out_time) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                assignment_batch,
+            )
+            shift_batch.clear()
+            assignment_batch.clear()
+
+        for shift, rows in roster_rows(assignments, locations, days, employee_count, rng):
+            shift_id += 1
+            name, location, starts_at, ends_at, required = shift
+            shift_batch.append((shift_id, name, location, _stored(starts_at), _stored(ends_at), required))
+            for employee_id, task_id, note, check_in, check_out, _, _ in rows:
+                assignment_batch.append((shift_id, employee_id, task_id, note, _stored_time(check_in), _stored_time(check_out)))
+                contributions.append((employee_id, starts_at, ends_at, check_in, check_out))
+            if len(assignment_batch) >= CHUNK:
+                flush()
+        flush()
+
+        cursor.executemany(
+            "INSERT INTO attendancerollup (employee_id, work_date, shifts, attended, late, missing_check_out, "
+            "scheduled_seconds, worked_seconds, late_seconds) VALUES (:employee_id, :work_date, :shifts, :attended, "
+            ":late, :missing_check_out, :scheduled_seconds, :worked_seconds, :late_seconds)",
+            ({**row, "work_date": row["work_date"].isoformat()} for row in rollup_rows(contributions)),
+        )
+        now = _stored(datetime.utcnow())
+        for table in ("employee", "task", "shift", "shiftassignment"):
+            cursor.execute(
+                f"INSERT INTO changelog (table_name, row_id, deleted, changed_at) SELECT ?, id, 0, ? FROM {table}",
+                (table, now),
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        counts = {
+            table: connection.execute(text(f"SELECT count(*) FROM {table}")).scalar_one()
+            for table in ("employee", "qualification", "task", "shift", "shiftassignment", "attendancerollup", "changelog")
+        }
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="100k")
+    parser.add_argument("--database", type=Path, required=True, help="SQLite file to create")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.database.exists():
+        parser.error(f"{args.database} already exists")
+    engine = database.build_engine(f"sqlite:///{args.database}")
+    started = time.perf_counter()
+    counts = generate(engine, SCALES[args.scale], args.seed)
+    engine.dispose()
+    print(f"{args.scale} dataset in {time.perf_counter() - started:.1f}s: " + ", ".join(f"{table}={count:,}" for table, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
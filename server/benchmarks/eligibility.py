@@ -0,0 +1,78 @@
+"""Time eligibility questions against the compiled qualification bitsets.
+
+Run from the project root:
+
+    python -m server.benchmarks.eligibility --employees 100000
+
+Generates employees and qualifications as the dataset does, compiles an
+``EligibilityIndex`` and times "who may staff this task on this day, and is
+free", against the free-text scan of position and notes it replaced.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date
+
+from server.app.qualifications import EligibilityIndex
+
+from .dataset import SEASON_END, employee_rows, qualification_rows
+
+
+QUESTIONS = [
+    ("lifeguard", None),
+    ("first aid", None),
+    ("rescue", "expert"),
+    (None, "medium"),
+]
+
+
+def per_call_us(function, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    employees = list(employee_rows(args.employees, rng))
+    rows = [
+        (employee_id, kind, name, date.fromisoformat(expires_on) if expires_on else None)
+        for employee_id, kind, name, expires_on in qualification_rows(employees, random.Random(8))
+    ]
+    started = time.perf_counter()
+    index = EligibilityIndex(range(1, args.employees + 1), rows)
+    print(f"{args.employees} employees, {len(rows)} qualifications: compiled in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    # A shift's busy set: everyone already on an overlapping shift.
+    busy = index.mask(rng.sample(range(1, args.employees + 1), args.employees // 10))
+    on = SEASON_END
+    for requirement, min_experience in QUESTIONS:
+        mask = index.eligible(requirement, min_experience, on) & ~busy
+        compiled = per_call_us(lambda: index.eligible(requirement, min_experience, on) & ~busy, args.repeat)
+        decode = per_call_us(lambda: index.ids(mask), max(1, args.repeat // 100))
+        needle = (requirement or "").casefold()
+        scan = per_call_us(
+            lambda: [
+                employee_id
+                for employee_id, (_, _, position, _, notes) in enumerate(employees, start=1)
+                if needle in position.casefold() or needle in notes.casefold()
+            ],
+            3,
+        )
+        print(
+            f"{requirement or '-':<10} {min_experience or '-':<7} {bin(mask).count('1'):>6} free and eligible   "
+            f"bitsets {compiled:8.1f}us   to ids {decode / 1000:6.1f}ms   free-text scan {scan / 1000:6.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Time GET /employees/search queries against 100k employees.
+
+Run from the project root:
+
+    python -m server.benchmarks.employee_search --employees 100000
+
+Builds a migrated database holding only generated employees (the FTS index is
+filled by its triggers as they are inserted), then fetches the first page of
+each query the way the endpoint does, once through the FTS5 index and once
+through the LIKE fallback other databases use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from fastapi import Response
+from sqlmodel import Session, select
+
+from server.app import database, search
+from server.app.database import ReadSession
+from server.app.pagination import PageParams, paginate
+from server.app.routers.employees import EMPLOYEE_SHAPE
+
+from .dataset import employee_rows
+from .harness import summarize
+
+
+PAGE_SIZE = 50
+QUERIES = [
+    "nora4217",  # one person
+    "maya lop",  # two prefixes narrowing each other
+    "555-0421",  # phone prefix
+    "maya",  # a common first name: an eighth of everyone
+    "rescue train",
+    "ex",  # every employee's notes
+    "zzz",  # no matches
+]
+
+
+async def first_page(session: ReadSession, terms: list[str], fts: bool) -> tuple[list, tuple]:
+    order = await search.result_order(session, terms, fts, None)
+    statement = search.search_statement(select(*EMPLOYEE_SHAPE.columns), terms, fts, order)
+    rows = await paginate(session, statement, order, PageParams(cursor=None, limit=PAGE_SIZE), Response())
+    return rows, order
+
+
+async def run(engine, repeat: int) -> None:
+    with Session(engine) as sync_session:
+        session = ReadSession(sync_session)
+        for q in QUERIES:
+            terms = search.search_terms(q)
+            for fts in (True, False):
+                rows, order = await first_page(session, terms, fts)
+                samples = []
+                for _ in range(repeat if fts else max(1, repeat // 20)):
+                    started = time.perf_counter()
+                    await first_page(session, terms, fts)
+                    samples.append((time.perf_counter() - started) * 1000)
+                label = "like" if not fts else "fts5 ranked" if order is search.RANKED_ORDER else "fts5 by id"
+                print(f"{q!r:<15} {label:<12} {len(rows):>3} rows  {summarize(samples)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = database.build_engine(f"sqlite:///{Path(directory) / 'search.db'}")
+        with engine.begin() as connection:
+            command.upgrade(database.alembic_config(connection), "head")
+        started = time.perf_counter()
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO employee (first_name, last_name, position, phone, notes) VALUES (?, ?, ?, ?, ?)",
+                list(employee_rows(args.employees, random.Random(7))),
+            )
+            connection.exec_driver_sql("ANALYZE")
+        print(f"inserted and indexed {args.employees} employees in {time.perf_counter() - started:.2f}s")
+        asyncio.run(run(engine, args.repeat))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Hold many idle /events streams open, then time one change fanning out to all of them.
+
+Run from the project root:
+
+    python -m server.benchmarks.event_fanout --connections 300 --idle 10
+
+Reports the server's CPU use while the streams sit idle and the latency from
+a committed write until every stream has received its change frame.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from .harness import cpu_seconds, login, percentile, server_process
+
+
+async def listen(client: httpx.AsyncClient, token: str, ready: asyncio.Event, arrivals: list[float], total: int, opened: list):
+    async with client.stream("GET", "/events", params={"access_token": token}) as response:
+        opened.append(response)
+        if len(opened) == total:
+            ready.set()
+        async for line in response.aiter_lines():
+            if line == "event: change":
+                arrivals.append(time.perf_counter())
+                return
+
+
+async def run(base_url: str, pid: int, connections: int, idle: float) -> None:
+    headers = login(base_url)
+    token = headers["Authorization"].split()[1]
+    limits = httpx.Limits(max_connections=connections + 10, max_keepalive_connections=connections + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+        ready = asyncio.Event()
+        arrivals: list[float] = []
+        opened: list = []
+        listeners = [
+            asyncio.create_task(listen(client, token, ready, arrivals, connections, opened)) for _ in range(connections)
+        ]
+        await asyncio.wait_for(ready.wait(), timeout=60)
+
+        before = cpu_seconds(pid)
+        await asyncio.sleep(idle)
+        spent = cpu_seconds(pid) - before
+        print(f"{connections} idle streams for {idle:.0f}s: server CPU {spent:.3f}s ({spent / idle * 100:.2f}% of a core)")
+
+        started = time.perf_counter()
+        response = await client.post("/employees", json={"first_name": "Fan", "last_name": "Out"}, headers=headers)
+        response.raise_for_status()
+        await asyncio.wait_for(asyncio.gather(*listeners), timeout=60)
+        latencies = [(arrival - started) * 1000 for arrival in arrivals]
+        print(
+            f"fan-out to {len(latencies)} streams: first {min(latencies):.1f}ms "
+            f"p50 {percentile(latencies, 50):.1f}ms last {max(latencies):.1f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=300)
+    parser.add_argument("--idle", type=float, default=10.0, help="seconds to hold the streams idle")
+    args = parser.parse_args()
+
+    with server_process() as (base_url, process):
+        asyncio.run(run(base_url, process.pid, args.connections, args.idle))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Helpers shared by the benchmark scripts: a throwaway API server and stats."""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ADMIN_EMAIL = "admin@wavepark.local"
+ADMIN_PASSWORD = "ChangeMe123!"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def running_server(env: dict[str, str] | None = None, workers: int = 1) -> Iterator[str]:
+    """Start uvicorn on a temporary SQLite database and yield its base URL."""
+
+    with server_process(env, workers) as (base_url, _):
+        yield base_url
+
+
+@contextmanager
+def server_process(
+    env: dict[str, str] | None = None, workers: int = 1
+) -> Iterator[tuple[str, subprocess.Popen]]:
+    """Like ``running_server``, but also yield the process, e.g. for ``cpu_seconds``."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        port = free_port()
+        server_env = {
+            **os.environ,
+            "SHIFT_MANAGER_DATABASE_URL": f"sqlite:///{Path(directory) / 'bench.db'}",
+            **(env or {}),
+        }
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "server.app.main:app",
+                "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+            ],
+            cwd=PROJECT_ROOT,
+            env=server_env,
+            start_new_session=True,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            wait_until_ready(base_url)
+            yield base_url, process
+        finally:
+            # Signal the whole group so password-pool workers go down with the server.
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+
+
+def cpu_seconds(pid: int) -> float:
+    """User plus system CPU time of ``pid`` so far (Linux /proc)."""
+
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.02)
+    raise RuntimeError(f"server at {base_url} did not start within {timeout}s")
+
+
+def login(base_url: str, email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> dict[str, str]:
+    response = httpx.post(f"{base_url}/auth/token", data={"username": email, "password": password}, timeout=30.0)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_ms: list[float]) -> str:
+    return (
+        f"n={len(samples_ms)} p50={percentile(samples_ms, 50):.1f}ms "
+        f"p95={percentile(samples_ms, 95):.1f}ms p99={percentile(samples_ms, 99):.1f}ms"
+    )
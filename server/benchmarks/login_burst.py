@@ -0,0 +1,82 @@
+"""Measure /employees latency while a burst of logins hashes passwords.
+
+Run from the project root:
+
+    python -m server.benchmarks.login_burst --logins 60
+
+The server is started twice: once hashing inline on the request threads
+(SHIFT_MANAGER_PASSWORD_HASH_WORKERS=0, the old behaviour) and once with the
+dedicated password process pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from .harness import ADMIN_EMAIL, ADMIN_PASSWORD, login, running_server, summarize
+
+
+def probe(base_url: str, headers: dict[str, str], stop: threading.Event) -> list[float]:
+    samples = []
+    with httpx.Client(base_url=base_url, headers=headers, timeout=30.0) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get("/employees")
+            samples.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.005)
+    return samples
+
+
+def burst(base_url: str, logins: int, concurrency: int) -> list[int]:
+    def one(_: int) -> int:
+        return httpx.post(
+            f"{base_url}/auth/token",
+            data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+            timeout=60.0,
+        ).status_code
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(logins)))
+
+
+def run(label: str, env: dict[str, str], logins: int, concurrency: int) -> None:
+    with running_server(env) as base_url:
+        headers = login(base_url)
+        stop = threading.Event()
+        idle_stop = threading.Event()
+        timer = threading.Timer(1.0, idle_stop.set)
+        timer.start()
+        idle = probe(base_url, headers, idle_stop)
+
+        with ThreadPoolExecutor(max_workers=1) as prober:
+            future = prober.submit(probe, base_url, headers, stop)
+            started = time.perf_counter()
+            statuses = burst(base_url, logins, concurrency)
+            elapsed = time.perf_counter() - started
+            stop.set()
+            busy = future.result()
+
+    accepted = statuses.count(200)
+    print(f"{label}")
+    print(f"  /employees idle:        {summarize(idle)}")
+    print(f"  /employees during burst: {summarize(busy)}")
+    print(f"  logins: {accepted}/{logins} accepted in {elapsed:.1f}s, {logins - accepted} shed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=40)
+    args = parser.parse_args()
+
+    run("inline hashing", {"SHIFT_MANAGER_PASSWORD_HASH_WORKERS": "0"}, args.logins, args.concurrency)
+    run("password process pool", {}, args.logins, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
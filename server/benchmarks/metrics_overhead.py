@@ -0,0 +1,155 @@
+"""Measure what the /metrics instrumentation costs per request and per SQL statement.
+
+Run from the project root:
+
+    python -m server.benchmarks.metrics_overhead --requests 2000
+
+First the pieces in isolation: the middleware around a do-nothing ASGI app,
+and the engine listeners around ``SELECT 1``. Then end to end: two servers on
+the same generated 1k dataset, one with ``SHIFT_MANAGER_METRICS_ENABLED=false``,
+queried in alternation so drift on the machine hits both equally.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import Engine, event, text
+
+from server.app import database
+from server.app.metrics import (
+    MetricsMiddleware,
+    RequestStats,
+    _after_cursor_execute,
+    _before_cursor_execute,
+    current_request,
+)
+
+from .harness import login, percentile, server_process
+from .suite import WEEK, dataset_path
+
+
+ROUNDS = 5
+ENDPOINTS = [
+    ("health check", "/", {}),
+    ("employees page", "/employees", {"limit": 100}),
+    ("assignments week", "/assignments", {**WEEK, "limit": 100}),
+]
+
+
+async def empty_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def best_of_alternating(bare, instrumented) -> tuple[float, float]:
+    """Best time of each over alternating rounds; one pass of either is mostly warm-up and noise."""
+
+    bare_times, instrumented_times = [], []
+    for _ in range(ROUNDS):
+        bare_times.append(bare())
+        instrumented_times.append(instrumented())
+    return min(bare_times), min(instrumented_times)
+
+
+def middleware_cost(iterations: int) -> float:
+    """Microseconds the middleware adds to one request."""
+
+    scope = {"type": "http", "method": "GET", "path": "/"}
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        pass
+
+    async def loop(app) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations // ROUNDS):
+            await app(dict(scope), receive, send)
+        return time.perf_counter() - started
+
+    wrapped_app = MetricsMiddleware(empty_app)
+    bare, wrapped = best_of_alternating(
+        lambda: asyncio.run(loop(empty_app)), lambda: asyncio.run(loop(wrapped_app))
+    )
+    return (wrapped - bare) / (iterations // ROUNDS) * 1e6
+
+
+def statement_cost(iterations: int) -> float:
+    """Microseconds the engine listeners add to one statement."""
+
+    engine = database.build_engine("sqlite://")
+    with engine.connect() as connection:
+        def loop() -> float:
+            started = time.perf_counter()
+            for _ in range(iterations // ROUNDS):
+                connection.execute(text("SELECT 1"))
+            return time.perf_counter() - started
+
+        def instrumented_loop() -> float:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            token = current_request.set(RequestStats())
+            try:
+                return loop()
+            finally:
+                current_request.reset(token)
+                event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+                event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+        loop()
+        bare, instrumented = best_of_alternating(loop, instrumented_loop)
+    engine.dispose()
+    return (instrumented - bare) / (iterations // ROUNDS) * 1e6
+
+
+def end_to_end(requests: int) -> None:
+    with tempfile.TemporaryDirectory() as directory, contextlib.ExitStack() as stack:
+        servers = {}
+        for enabled in (False, True):
+            copy = Path(directory) / f"metrics-{enabled}.db"
+            shutil.copyfile(dataset_path("1k"), copy)
+            env = {
+                "SHIFT_MANAGER_DATABASE_URL": f"sqlite:///{copy}",
+                "SHIFT_MANAGER_METRICS_ENABLED": str(enabled).lower(),
+            }
+            base_url, _ = stack.enter_context(server_process(env))
+            servers[enabled] = httpx.Client(base_url=base_url, headers=login(base_url), timeout=30.0)
+
+        for name, path, params in ENDPOINTS:
+            samples: dict[bool, list[float]] = {False: [], True: []}
+            for _ in range(requests):
+                for enabled, client in servers.items():
+                    started = time.perf_counter()
+                    client.get(path, params=params).raise_for_status()
+                    samples[enabled].append((time.perf_counter() - started) * 1000)
+            off, on = (percentile(samples[enabled], 50) for enabled in (False, True))
+            print(
+                f"{name:<18} p50 off {off:6.2f}ms  on {on:6.2f}ms  "
+                f"({(on - off) * 1000:+.0f}us, {(on / off - 1) * 100:+.1f}%)"
+            )
+        for client in servers.values():
+            client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="per endpoint and server")
+    parser.add_argument("--iterations", type=int, default=100_000, help="for the isolated measurements")
+    args = parser.parse_args()
+
+    print(f"middleware: {middleware_cost(args.iterations):.1f}us per request")
+    print(f"engine listeners: {statement_cost(args.iterations):.1f}us per statement")
+    end_to_end(args.requests)
+
+
+if __name__ == "__main__":
+    main()
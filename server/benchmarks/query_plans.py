@@ -0,0 +1,136 @@
+"""Compare SQLite query plans and timings before and after the scheduling indexes.
+
+Run from the project root:
+
+    python -m server.benchmarks.query_plans --assignments 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from alembic import command
+from sqlalchemy import insert, text
+from sqlmodel import create_engine
+
+from server.app import database
+from server.app.models import Employee, Shift, ShiftAssignment, Task
+
+
+QUERIES = {
+    "shifts in range (list_shifts)": (
+        "SELECT * FROM shift WHERE starts_at >= :start AND ends_at <= :end ORDER BY starts_at, id LIMIT 100",
+        {"start": "2024-07-01 00:00:00.000000", "end": "2024-07-08 00:00:00.000000"},
+    ),
+    "shifts at location in range": (
+        "SELECT * FROM shift WHERE location = :location AND starts_at >= :start ORDER BY starts_at LIMIT 100",
+        {"location": "Location 3", "start": "2024-07-01 00:00:00.000000"},
+    ),
+    "assignments for employee": (
+        "SELECT * FROM shiftassignment WHERE employee_id = :employee_id",
+        {"employee_id": 42},
+    ),
+    "assignments for shift": (
+        "SELECT * FROM shiftassignment WHERE shift_id = :shift_id",
+        {"shift_id": 1234},
+    ),
+    "export range join": (
+        "SELECT shiftassignment.id FROM shiftassignment JOIN shift ON shift.id = shiftassignment.shift_id "
+        "WHERE shift.starts_at >= :start AND shift.ends_at <= :end",
+        {"start": "2024-07-01 00:00:00.000000", "end": "2024-07-08 00:00:00.000000"},
+    ),
+    "coverage by shift and task": (
+        "SELECT shift.id, shift.required_staff, shiftassignment.task_id, count(shiftassignment.id) FROM shift "
+        "LEFT OUTER JOIN shiftassignment ON shiftassignment.shift_id = shift.id "
+        "WHERE shift.starts_at >= :start AND shift.ends_at <= :end "
+        "GROUP BY shift.id, shiftassignment.task_id ORDER BY shift.starts_at, shift.id",
+        {"start": "2024-06-01 00:00:00.000000", "end": "2024-09-01 00:00:00.000000"},
+    ),
+}
+
+
+def populate(engine, assignment_count: int) -> None:
+    rng = random.Random(7)
+    shift_count = max(assignment_count // 4, 1)
+    employee_count = 200
+    season_start = datetime(2024, 6, 1, 8, 0)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Employee),
+            [{"first_name": f"Guard{i}", "last_name": "Bench"} for i in range(employee_count)],
+        )
+        connection.execute(insert(Task), [{"name": f"Task {i}"} for i in range(10)])
+        connection.execute(
+            insert(Shift),
+            [
+                {
+                    "name": f"Shift {i}",
+                    "location": f"Location {i % 10}",
+                    "starts_at": season_start + timedelta(hours=i % 2400),
+                    "ends_at": season_start + timedelta(hours=i % 2400 + 8),
+                    "required_staff": 4,
+                }
+                for i in range(shift_count)
+            ],
+        )
+        connection.execute(
+            insert(ShiftAssignment),
+            [
+                {
+                    "shift_id": rng.randint(1, shift_count),
+                    "employee_id": rng.randint(1, employee_count),
+                    "task_id": rng.randint(1, 10),
+                }
+                for _ in range(assignment_count)
+            ],
+        )
+
+
+def measure(engine, repeat: int) -> dict[str, tuple[list[str], float]]:
+    results = {}
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        for label, (sql, params) in QUERIES.items():
+            plan = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)]
+            started = time.perf_counter()
+            for _ in range(repeat):
+                connection.execute(text(sql), params).fetchall()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+            results[label] = (plan, elapsed_ms)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        database.override_engine(engine)
+        with engine.begin() as connection:
+            command.upgrade(database.alembic_config(connection), database.BASELINE_REVISION)
+        populate(engine, args.assignments)
+        before = measure(engine, args.repeat)
+        with engine.begin() as connection:
+            command.upgrade(database.alembic_config(connection), "head")
+        after = measure(engine, args.repeat)
+        engine.dispose()
+
+    print(f"{args.assignments} assignments, mean of {args.repeat} runs\n")
+    for label in QUERIES:
+        plan_before, ms_before = before[label]
+        plan_after, ms_after = after[label]
+        print(f"{label}: {ms_before:.2f} ms -> {ms_after:.2f} ms")
+        print(f"  before: {' | '.join(plan_before)}")
+        print(f"  after:  {' | '.join(plan_after)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Solve a season-sized roster with the greedy + local search solver.
+
+Run from the project root:
+
+    python -m server.benchmarks.roster_solver --shifts 10000 --employees 200 --budget 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from server.app.solver import RosterSolver
+
+
+def season(shift_count: int, locations: int, seed: int = 11):
+    rng = random.Random(seed)
+    start = datetime(2024, 6, 1)
+    per_day = locations * 3
+    shifts = []
+    for shift_id in range(shift_count):
+        day, slot = divmod(shift_id, per_day)
+        block = slot % 3
+        starts_at = start + timedelta(days=day, hours=7 + block * 5)
+        shifts.append((shift_id, starts_at, starts_at + timedelta(hours=5), rng.randint(1, 2)))
+    return shifts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shifts", type=int, default=10_000)
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--locations", type=int, default=10)
+    parser.add_argument("--max-hours", type=float, default=None)
+    parser.add_argument("--budget", type=float, default=3.0, help="local search time budget in seconds")
+    args = parser.parse_args()
+
+    shifts = season(args.shifts, args.locations)
+    slots = sum(open_slots for *_, open_slots in shifts)
+    solver = RosterSolver(shifts, range(1, args.employees + 1), [], max_hours=args.max_hours)
+
+    started = time.perf_counter()
+    solver.construct()
+    constructed = time.perf_counter() - started
+    spread_before = statistics.pstdev(solver.hours.values())
+    solver.improve(time.perf_counter() + args.budget)
+    total = time.perf_counter() - started
+
+    filled = len(solver.proposed)
+    print(f"{args.shifts} shifts, {slots} open slots, {args.employees} employees")
+    print(f"  greedy construction: {constructed:.2f}s, {filled} slots filled, {slots - filled} unfilled")
+    print(f"  local search:        {total - constructed:.2f}s, {solver.moves} moves")
+    print(f"  hours stdev:         {spread_before:.2f} -> {statistics.pstdev(solver.hours.values()):.2f}")
+    print(f"  hours min/max:       {min(solver.hours.values()):.0f} / {max(solver.hours.values()):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare rows/sec of the old and new /assignments response paths, without HTTP.
+
+Run from the project root:
+
+    python -m server.benchmarks.serialization --assignments 20000 --page 500
+
+"before" loads ORM objects with joinedload, builds ShiftAssignmentRead by
+hand and then validates and dumps them again the way FastAPI's
+``response_model`` does. "after" selects the read-model columns and encodes
+the folded tuples with orjson.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import orjson
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel, select
+
+from server.app import database
+from server.app.models import Employee, Shift, ShiftAssignment, ShiftAssignmentRead, Task
+from server.app.routers.assignments import ASSIGNMENT_SHAPE, to_read, with_relations
+
+from .query_plans import populate
+
+
+RESPONSE_ADAPTER = TypeAdapter(list[ShiftAssignmentRead])
+
+
+def before(session: Session, limit: int) -> bytes:
+    statement = with_relations(select(ShiftAssignment)).order_by(ShiftAssignment.id).limit(limit)
+    items = [to_read(item) for item in session.exec(statement).unique()]
+    validated = RESPONSE_ADAPTER.validate_python(items, from_attributes=True)
+    content = RESPONSE_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def after(session: Session, limit: int) -> bytes:
+    statement = (
+        select(*ASSIGNMENT_SHAPE.columns)
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .join(Employee, Employee.id == ShiftAssignment.employee_id)
+        .outerjoin(Task, Task.id == ShiftAssignment.task_id)
+        .order_by(ShiftAssignment.id)
+        .limit(limit)
+    )
+    return orjson.dumps(ASSIGNMENT_SHAPE.to_dicts(session.exec(statement).all()))
+
+
+def rows_per_second(path, session: Session, limit: int, repeat: int) -> float:
+    path(session, limit)  # warm up statement caches
+    started = time.perf_counter()
+    for _ in range(repeat):
+        path(session, limit)
+    return limit * repeat / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=20_000)
+    parser.add_argument("--page", type=int, default=500, help="rows per response (max_page_size)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = database.build_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        populate(engine, args.assignments)
+        with Session(engine) as session:
+            assert json.loads(before(session, 50)) == json.loads(after(session, 50))
+            print(f"{args.page} rows per response, {args.repeat} responses")
+            slow = rows_per_second(before, session, args.page, args.repeat)
+            fast = rows_per_second(after, session, args.page, args.repeat)
+        engine.dispose()
+
+    print(f"before: {slow:,.0f} rows/s")
+    print(f"after:  {fast:,.0f} rows/s ({fast / slow:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
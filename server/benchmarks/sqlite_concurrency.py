@@ -0,0 +1,124 @@
+"""Many readers plus a few writers against SQLite, default engine vs tuned profile.
+
+Run from the project root:
+
+    python -m server.benchmarks.sqlite_concurrency --readers 16 --writers 4 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, create_engine
+
+from server.app import database
+from server.app.models import Employee, Shift, ShiftAssignment
+
+from .harness import percentile
+
+
+def seed(engine) -> None:
+    SQLModel.metadata.create_all(engine)
+    start = datetime(2024, 6, 1, 8, 0)
+    with engine.begin() as connection:
+        connection.execute(insert(Employee), [{"first_name": f"Guard{i}", "last_name": "Bench"} for i in range(200)])
+        connection.execute(
+            insert(Shift),
+            [
+                {
+                    "name": f"Shift {i}",
+                    "location": f"Location {i % 10}",
+                    "starts_at": start + timedelta(hours=i),
+                    "ends_at": start + timedelta(hours=i + 8),
+                    "required_staff": 4,
+                }
+                for i in range(2000)
+            ],
+        )
+        connection.execute(
+            insert(ShiftAssignment),
+            [{"shift_id": i % 2000 + 1, "employee_id": i % 200 + 1} for i in range(8000)],
+        )
+
+
+def worker(engine, write: bool, stop: threading.Event, latencies: list, errors: list) -> None:
+    counter = 0
+    while not stop.is_set():
+        counter += 1
+        started = time.perf_counter()
+        try:
+            with engine.begin() as connection:
+                if write:
+                    connection.execute(
+                        update(ShiftAssignment)
+                        .where(ShiftAssignment.id == counter % 8000 + 1)
+                        .values(note=f"note {counter}")
+                    )
+                else:
+                    connection.execute(
+                        select(ShiftAssignment, Shift)
+                        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+                        .where(ShiftAssignment.employee_id == counter % 200 + 1)
+                    ).all()
+        except OperationalError as exc:
+            errors.append(str(exc.orig))
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+def run(label: str, engine, readers: int, writers: int, seconds: float) -> None:
+    seed(engine)
+    stop = threading.Event()
+    read_latencies: list[float] = []
+    write_latencies: list[float] = []
+    errors: list[str] = []
+    threads = [
+        threading.Thread(target=worker, args=(engine, False, stop, read_latencies, errors)) for _ in range(readers)
+    ] + [threading.Thread(target=worker, args=(engine, True, stop, write_latencies, errors)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    print(label)
+    print(
+        f"  reads:  {len(read_latencies) / seconds:8.0f}/s  p99={percentile(read_latencies, 99):.1f}ms"
+    )
+    print(
+        f"  writes: {len(write_latencies) / seconds:8.0f}/s  p99={percentile(write_latencies, 99):.1f}ms"
+    )
+    print(f"  errors: {len(errors)} ({errors[0] if errors else 'none'})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Both engines get a connection per thread so only the SQLite settings differ.
+        connections = args.readers + args.writers
+        default_engine = create_engine(
+            f"sqlite:///{Path(directory) / 'default.db'}",
+            connect_args={"check_same_thread": False},
+            pool_size=connections,
+        )
+        run("default engine (rollback journal)", default_engine, args.readers, args.writers, args.seconds)
+        tuned_engine = database.build_engine(f"sqlite:///{Path(directory) / 'tuned.db'}", pool_size=connections)
+        run("tuned engine (WAL profile)", tuned_engine, args.readers, args.writers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
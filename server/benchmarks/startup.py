@@ -0,0 +1,120 @@
+"""Time a worker's cold start: importing the app, then serving its first requests.
+
+Run from the project root:
+
+    python -m server.benchmarks.startup --repeat 5
+
+Each measurement is a fresh interpreter. "import" is ``import
+server.app.main`` on its own, and also lists which heavy packages it left
+unloaded. "ready" starts uvicorn on an already bootstrapped database and
+times the first ``GET /`` and the first authenticated ``GET /employees``,
+once with the default per-worker bootstrap and once with
+``SHIFT_MANAGER_BOOTSTRAP_ON_STARTUP=false``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from .harness import PROJECT_ROOT, free_port
+
+
+DEFERRED = ("alembic", "jose", "cryptography", "passlib", "bcrypt")
+IMPORT_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import server.app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [name for name in {DEFERRED!r} if name in sys.modules]}}))
+"""
+MODES = {"bootstrap on startup": "true", "fast start": "false"}
+
+
+def import_time(env: dict[str, str]) -> tuple[float, list[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    return result["seconds"], result["loaded"]
+
+
+def first_requests(env: dict[str, str], token: str) -> tuple[float, float]:
+    """Seconds from spawning uvicorn to the first ``/`` and the first authenticated response."""
+
+    port = free_port()
+    # One client for all polls: a new one per poll builds an SSL context each
+    # time and steals enough CPU from the starting server to double its start.
+    client = httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10.0)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server.app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with {process.returncode}")
+            try:
+                if client.get("/").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.005)
+        ready = time.perf_counter() - started
+        client.get("/employees", headers={"Authorization": f"Bearer {token}"}).raise_for_status()
+        return ready, time.perf_counter() - started
+    finally:
+        client.close()
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "SHIFT_MANAGER_DATABASE_URL": f"sqlite:///{Path(directory) / 'startup.db'}",
+            "SHIFT_MANAGER_PASSWORD_HASH_WORKERS": "0",
+        }
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "server.bootstrap"], cwd=PROJECT_ROOT, env=env, check=True, capture_output=True
+        )
+        print(f"one-off bootstrap: {time.perf_counter() - started:.2f}s")
+
+        samples = [import_time(env) for _ in range(args.repeat)]
+        loaded = samples[-1][1]
+        print(
+            f"import server.app.main: median {statistics.median(seconds for seconds, _ in samples) * 1000:.0f}ms; "
+            f"heavy packages loaded: {', '.join(loaded) or 'none'}"
+        )
+
+        # Minted here with the same secret, so no login (and no bcrypt) is part of the timing.
+        from server.app.auth import create_access_token
+
+        token = create_access_token({"sub": "1", "role": "admin"})
+        for mode, bootstrap in MODES.items():
+            mode_env = {**env, "SHIFT_MANAGER_BOOTSTRAP_ON_STARTUP": bootstrap}
+            runs = [first_requests(mode_env, token) for _ in range(args.repeat)]
+            print(
+                f"{mode:<21} first GET / {statistics.median(ready for ready, _ in runs) * 1000:6.0f}ms   "
+                f"first authenticated request {statistics.median(first for _, first in runs) * 1000:6.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""Run every API endpoint in-process against a generated dataset and compare with a saved baseline.
+
+Run from the project root:
+
+    python -m server.benchmarks.suite --scale 100k --save   # record server/benchmarks/baselines/100k.json
+    python -m server.benchmarks.suite --scale 100k          # exit 1 on a regression
+
+The dataset from ``dataset.py`` is built once per scale under
+``server/benchmarks/data/`` and copied to a scratch file for each run, so the
+write cases never drift it. Requests go through ``TestClient``, so the whole
+stack (auth, ETags, serialization, streaming) is measured without sockets.
+Each case reports latency percentiles, the SQL statements one request runs,
+its peak traced allocation and its response size. A case regresses when its
+median grows by more than ``--tolerance`` (the tails are reported but swing
+too much between runs to gate on), it runs more queries, or its peak memory
+grows by half. Latency baselines are machine-specific: record them on the
+machine that checks them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
+
+from server.app import database
+from server.app.auth import principal_cache
+from server.app.main import app
+
+from .dataset import SCALES, generate
+from .harness import ADMIN_EMAIL, ADMIN_PASSWORD, percentile
+
+
+BENCHMARKS = Path(__file__).resolve().parent
+DATA_DIR = BENCHMARKS / "data"
+BASELINE_DIR = BENCHMARKS / "baselines"
+WEEK = {"start": "2024-09-23T00:00:00", "end": "2024-09-30T00:00:00"}
+MONTH = {"start": "2024-09-01T00:00:00", "end": "2024-09-30T00:00:00"}
+MONTH_DAYS = {"start": "2024-09-01", "end": "2024-09-30"}
+
+
+def delete_created(client: TestClient, response: httpx.Response) -> None:
+    client.delete(f"/employees/{response.json()['id']}")
+
+
+def clear_note(client: TestClient, response: httpx.Response) -> None:
+    client.patch(f"/assignments/{response.json()['id']}", json={"note": None})
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    path: str
+    params: dict = field(default_factory=dict)
+    body: Optional[dict] = None
+    # Send back the ETag of a first response, to time the 304 path.
+    revalidate: bool = False
+    # Untimed; puts back whatever the request wrote.
+    undo: Optional[Callable[[TestClient, httpx.Response], None]] = None
+
+
+CASES = [
+    Case("employees page", "GET", "/employees", {"limit": 500}),
+    Case("employee search two prefixes", "GET", "/employees/search", {"q": "maya kim"}),
+    Case("employee search common name", "GET", "/employees/search", {"q": "maya", "limit": 50}),
+    Case("tasks", "GET", "/tasks"),
+    Case("shifts week", "GET", "/shifts", {**WEEK, "limit": 500}),
+    Case("shifts week 304", "GET", "/shifts", {**WEEK, "limit": 500}, revalidate=True),
+    Case("shifts at location", "GET", "/shifts", {**MONTH, "location": "Location 1"}),
+    Case("assignments week", "GET", "/assignments", {**WEEK, "limit": 500}),
+    Case("assignments of employee", "GET", "/assignments", {"employee_id": 42, "limit": 500}),
+    Case("assignments of shift", "GET", "/assignments", {"shift_id": 100}),
+    Case("conflicts week", "GET", "/assignments/conflicts", WEEK),
+    Case("eligible for shift", "GET", "/schedule/eligible", {"shift_id": 100}),
+    Case("eligible for shift task", "GET", "/schedule/eligible", {"shift_id": 100, "task_id": 1}),
+    Case("templates", "GET", "/shift-templates"),
+    Case("users", "GET", "/auth/users"),
+    Case("coverage week", "GET", "/reports/coverage", WEEK),
+    Case("coverage month understaffed", "GET", "/reports/coverage", {**MONTH, "understaffed": True}),
+    Case("coverage csv month", "GET", "/reports/coverage.csv", MONTH),
+    Case("assignments csv week", "GET", "/reports/assignments.csv", WEEK),
+    Case("attendance daily month", "GET", "/reports/attendance/daily", MONTH_DAYS),
+    Case("attendance month", "GET", "/reports/attendance", MONTH_DAYS),
+    Case("attendance csv month", "GET", "/reports/attendance.csv", MONTH_DAYS),
+    Case("dashboard week", "GET", "/dashboard", WEEK),
+    Case("sync first page", "GET", "/sync", {"since": 0}),
+    Case(
+        "solve one day",
+        "POST",
+        "/schedule/solve",
+        body={**{key: value.replace("23", "29") for key, value in WEEK.items()}, "location": "Location 0", "time_budget_ms": 100},
+    ),
+    Case(
+        "create employee",
+        "POST",
+        "/employees",
+        body={"first_name": "Bench", "last_name": "Mark", "position": "Support Crew"},
+        undo=delete_created,
+    ),
+    Case("annotate assignment", "PATCH", "/assignments/1", body={"note": "swapped towers"}, undo=clear_note),
+]
+
+
+class QueryCounter:
+    """Counts statements sent on any engine, the async engine's sync core included."""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(Engine, "before_cursor_execute", self._before)
+
+    def _before(self, *args) -> None:
+        self.count += 1
+
+    def close(self) -> None:
+        event.remove(Engine, "before_cursor_execute", self._before)
+
+
+def dataset_path(scale: str) -> Path:
+    path = DATA_DIR / f"{scale}.db"
+    if not path.exists():
+        DATA_DIR.mkdir(exist_ok=True)
+        scratch = path.with_suffix(".partial")
+        scratch.unlink(missing_ok=True)
+        engine = database.build_engine(f"sqlite:///{scratch}")
+        started = time.perf_counter()
+        generate(engine, SCALES[scale])
+        engine.dispose()
+        scratch.rename(path)
+        print(f"generated {scale} dataset in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return path
+
+
+def send(client: TestClient, case: Case, headers: dict) -> httpx.Response:
+    response = client.request(case.method, case.path, params=case.params, json=case.body, headers=headers)
+    if response.status_code >= 400:
+        raise RuntimeError(f"{case.name}: {case.method} {case.path} returned {response.status_code} {response.text[:200]}")
+    return response
+
+
+def measure(client: TestClient, case: Case, auth: dict, runs: int, counter: QueryCounter) -> dict:
+    headers = dict(auth)
+    if case.revalidate:
+        headers["If-None-Match"] = send(client, case, auth).headers["etag"]
+
+    def once() -> httpx.Response:
+        response = send(client, case, headers)
+        if case.undo is not None:
+            case.undo(client, response)
+        return response
+
+    once()  # warm statement and principal caches
+    counter.count = 0
+    response = send(client, case, headers)
+    queries = counter.count
+    if case.undo is not None:
+        case.undo(client, response)
+
+    tracemalloc.start()
+    response = send(client, case, headers)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if case.undo is not None:
+        case.undo(client, response)
+
+    # Like timeit: a full collection over the app's import-time heap takes ~100 ms
+    # and would land on a random case, so it is kept out of the samples.
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            response = send(client, case, headers)
+            samples.append((time.perf_counter() - started) * 1000)
+            if case.undo is not None:
+                case.undo(client, response)
+    finally:
+        gc.enable()
+    return {
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "queries": queries,
+        "peak_kib": round(peak / 1024, 1),
+        "bytes": len(response.content),
+    }
+
+
+def run(scale: str, runs: int, only: Optional[str]) -> dict[str, dict]:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        copy = Path(directory) / f"{scale}.db"
+        shutil.copyfile(dataset_path(scale), copy)
+        engine = database.build_engine(f"sqlite:///{copy}")
+        database.override_engine(engine)
+        principal_cache.clear()
+        counter = QueryCounter()
+        try:
+            with TestClient(app) as client:
+                token = client.post("/auth/token", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+                token.raise_for_status()
+                auth = {"Authorization": f"Bearer {token.json()['access_token']}"}
+                for case in CASES:
+                    if only and only not in case.name:
+                        continue
+                    results[case.name] = measure(client, case, auth, runs, counter)
+        finally:
+            counter.close()
+            engine.dispose()
+    return results
+
+
+def regressions(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> dict[str, list[str]]:
+    found: dict[str, list[str]] = {}
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        problems = []
+        # The 1 ms floor keeps sub-millisecond cases from flapping on scheduler noise.
+        if current["p50_ms"] > before["p50_ms"] * (1 + tolerance) + 1.0:
+            problems.append(f"p50 {before['p50_ms']:.1f} -> {current['p50_ms']:.1f} ms")
+        if current["queries"] > before["queries"]:
+            problems.append(f"queries {before['queries']} -> {current['queries']}")
+        if current["peak_kib"] > before["peak_kib"] * 1.5 + 64:
+            problems.append(f"peak {before['peak_kib']:.0f} -> {current['peak_kib']:.0f} KiB")
+        if problems:
+            found[name] = problems
+    return found
+
+
+def report(results: dict[str, dict], baseline: dict[str, dict]) -> None:
+    print(f"{'case':<30}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'peak KiB':>10}{'bytes':>10}  vs baseline p50")
+    for name, item in results.items():
+        before = baseline.get(name)
+        change = f"{(item['p50_ms'] / before['p50_ms'] - 1) * 100:+.0f}%" if before and before["p50_ms"] else "-"
+        print(
+            f"{name:<30}{item['p50_ms']:>9.1f}{item['p95_ms']:>9.1f}{item['p99_ms']:>9.1f}"
+            f"{item['queries']:>9}{item['peak_kib']:>10.0f}{item['bytes']:>10}  {change}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="100k")
+    parser.add_argument("--runs", type=int, default=30, help="timed requests per case")
+    parser.add_argument("--case", help="only cases whose name contains this")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth of the median")
+    args = parser.parse_args()
+
+    baseline_path = BASELINE_DIR / f"{args.scale}.json"
+    baseline = json.loads(baseline_path.read_text())["cases"] if baseline_path.exists() else {}
+    results = run(args.scale, args.runs, args.case)
+    report(results, baseline)
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        saved = {"scale": args.scale, "runs": args.runs, "python": platform.python_version(), "cases": results}
+        baseline_path.write_text(json.dumps(saved, indent=2) + "\n")
+        print(f"baseline written to {baseline_path.relative_to(BENCHMARKS.parents[1])}")
+        return
+    if not baseline:
+        print(f"no baseline at {baseline_path}; record one with --save")
+        return
+    found = regressions(results, baseline, args.tolerance)
+    for name, problems in found.items():
+        print(f"REGRESSION {name}: {'; '.join(problems)}")
+    sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
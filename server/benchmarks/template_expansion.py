@@ -0,0 +1,72 @@
+"""Time expanding a season of shift templates into Shift rows.
+
+Run from the project root:
+
+    python -m server.benchmarks.template_expansion --days 100 --locations 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import date, time as clock, timedelta
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, func, select
+
+from server.app.database import build_engine
+from server.app.models import Shift, ShiftTemplate
+from server.app.recurrence import expand_templates
+
+
+DAILY_PATTERN = [("Opening", clock(7, 0), clock(12, 0)), ("Midday", clock(12, 0), clock(17, 0)), ("Closing", clock(17, 0), clock(22, 0))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--locations", type=int, default=10)
+    args = parser.parse_args()
+
+    season_start = date(2024, 6, 1)
+    season_end = season_start + timedelta(days=args.days - 1)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            for location in range(args.locations):
+                for name, starts, ends in DAILY_PATTERN:
+                    session.add(
+                        ShiftTemplate(
+                            name=name,
+                            location=f"Location {location}",
+                            start_time=starts,
+                            end_time=ends,
+                            required_staff=4,
+                            valid_from=season_start,
+                        )
+                    )
+            session.commit()
+            templates = session.exec(select(ShiftTemplate)).all()
+
+            started = time.perf_counter()
+            created, skipped = expand_templates(session, templates, season_start, season_end)
+            session.commit()
+            first = time.perf_counter() - started
+
+            started = time.perf_counter()
+            again_created, again_skipped = expand_templates(session, templates, season_start, season_end)
+            session.commit()
+            second = time.perf_counter() - started
+            total = session.exec(select(func.count()).select_from(Shift)).one()
+        engine.dispose()
+
+    print(f"{len(templates)} templates over {args.days} days")
+    print(f"  first expansion:  created={created} skipped={skipped} in {first * 1000:.0f} ms")
+    print(f"  re-expansion:     created={again_created} skipped={again_skipped} in {second * 1000:.0f} ms")
+    print(f"  shifts in table:  {total}")
+
+
+if __name__ == "__main__":
+    main()
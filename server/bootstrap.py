@@ -0,0 +1,32 @@
+"""One-off deploy step: migrate the database and create the default admin.
+
+Run it once before starting workers with ``SHIFT_MANAGER_BOOTSTRAP_ON_STARTUP=false``;
+those workers then only check the stored schema revision at startup.
+
+    python -m server.bootstrap
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from server.app import database  # noqa: E402
+from server.app.auth import create_initial_admin  # noqa: E402
+
+
+def main() -> None:
+    database.init_db()
+    with database.session_scope() as session:
+        admin = create_initial_admin(session)
+    print(f"Schema at revision {database.SCHEMA_REVISION}; admin user {admin.email}")
+
+
+if __name__ == "__main__":
+    main()
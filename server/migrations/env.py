@@ -0,0 +1,53 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlmodel import SQLModel
+
+from server.app import database, search
+import server.app.models  # noqa: F401 ensures models registered
+
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = SQLModel.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=str(database.engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_name=search.include_in_autogenerate,
+        render_as_batch=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with(connection)
+        return
+    with database.engine.connect() as connection:
+        _run_with(connection)
+
+
+def _run_with(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True,
+        include_name=search.include_in_autogenerate,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
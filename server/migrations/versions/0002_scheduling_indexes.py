@@ -0,0 +1,32 @@
+"""Indexes for shift range filters and assignment lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-06-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_shift_starts_at_ends_at", "shift", ["starts_at", "ends_at"])
+    op.create_index("ix_shift_location_starts_at", "shift", ["location", "starts_at"])
+    op.create_index("ix_shiftassignment_employee_id_shift_id", "shiftassignment", ["employee_id", "shift_id"])
+    op.create_index("ix_shiftassignment_shift_id", "shiftassignment", ["shift_id"])
+    op.create_index("ix_shiftassignment_task_id", "shiftassignment", ["task_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_shiftassignment_task_id", table_name="shiftassignment")
+    op.drop_index("ix_shiftassignment_shift_id", table_name="shiftassignment")
+    op.drop_index("ix_shiftassignment_employee_id_shift_id", table_name="shiftassignment")
+    op.drop_index("ix_shift_location_starts_at", table_name="shift")
+    op.drop_index("ix_shift_starts_at_ends_at", table_name="shift")
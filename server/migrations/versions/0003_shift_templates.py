@@ -0,0 +1,63 @@
+"""Recurring shift templates
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-07-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "shifttemplate",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("location", sa.String(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("required_staff", sa.Integer(), nullable=False),
+        sa.Column("frequency", sa.String(), nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("weekdays", sa.JSON(), nullable=True),
+        sa.Column("valid_from", sa.Date(), nullable=False),
+        sa.Column("valid_until", sa.Date(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "shifttemplateexception",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("template_id", sa.Integer(), nullable=False),
+        sa.Column("on_date", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(["template_id"], ["shifttemplate.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ux_shifttemplateexception_template_id_on_date",
+        "shifttemplateexception",
+        ["template_id", "on_date"],
+        unique=True,
+    )
+    with op.batch_alter_table("shift") as batch_op:
+        batch_op.add_column(sa.Column("template_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("fk_shift_template_id_shifttemplate", "shifttemplate", ["template_id"], ["id"])
+        batch_op.create_index("ux_shift_template_id_starts_at", ["template_id", "starts_at"], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("shift") as batch_op:
+        batch_op.drop_index("ux_shift_template_id_starts_at")
+        batch_op.drop_constraint("fk_shift_template_id_shifttemplate", type_="foreignkey")
+        batch_op.drop_column("template_id")
+    op.drop_index("ux_shifttemplateexception_template_id_on_date", table_name="shifttemplateexception")
+    op.drop_table("shifttemplateexception")
+    op.drop_table("shifttemplate")
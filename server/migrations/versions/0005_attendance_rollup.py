@@ -0,0 +1,109 @@
+"""Per-employee, per-day attendance rollup, backfilled from existing assignments
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-08-01 00:00:00
+
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The attendance rules as of this revision, frozen here so later changes to
+# server.app.attendance cannot change what this backfill writes.
+ONE_DAY = timedelta(days=1)
+HALF_DAY = timedelta(hours=12)
+METRICS = ("shifts", "attended", "late", "missing_check_out", "scheduled_seconds", "worked_seconds", "late_seconds")
+
+
+def _anchor(moment: time, near: datetime) -> datetime:
+    candidate = datetime.combine(near.date(), moment)
+    if candidate - near >= HALF_DAY:
+        return candidate - ONE_DAY
+    if candidate - near < -HALF_DAY:
+        return candidate + ONE_DAY
+    return candidate
+
+
+def _contribution(
+    starts_at: datetime, ends_at: datetime, check_in_time: Optional[time], check_out_time: Optional[time]
+) -> tuple[int, ...]:
+    worked = late = missing_check_out = 0
+    if check_in_time is not None:
+        check_in = _anchor(check_in_time, starts_at)
+        late = max(int((check_in - starts_at).total_seconds()), 0)
+        if check_out_time is None:
+            missing_check_out = 1
+        else:
+            check_out = _anchor(check_out_time, ends_at)
+            if check_out <= check_in:
+                check_out += ONE_DAY
+            worked = int((check_out - check_in).total_seconds())
+    scheduled = int((ends_at - starts_at).total_seconds())
+    return 1, int(check_in_time is not None), int(late > 0), missing_check_out, scheduled, worked, late
+
+
+def _rollup_rows(rows) -> list[dict]:
+    totals: dict = defaultdict(lambda: [0] * len(METRICS))
+    for employee_id, starts_at, ends_at, check_in_time, check_out_time in rows:
+        day = totals[(employee_id, starts_at.date())]
+        for index, value in enumerate(_contribution(starts_at, ends_at, check_in_time, check_out_time)):
+            day[index] += value
+    return [
+        {"employee_id": employee_id, "work_date": work_date, **dict(zip(METRICS, values))}
+        for (employee_id, work_date), values in sorted(totals.items())
+    ]
+
+
+def upgrade() -> None:
+    rollup = op.create_table(
+        "attendancerollup",
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.Column("work_date", sa.Date(), nullable=False),
+        sa.Column("shifts", sa.Integer(), nullable=False),
+        sa.Column("attended", sa.Integer(), nullable=False),
+        sa.Column("late", sa.Integer(), nullable=False),
+        sa.Column("missing_check_out", sa.Integer(), nullable=False),
+        sa.Column("scheduled_seconds", sa.Integer(), nullable=False),
+        sa.Column("worked_seconds", sa.Integer(), nullable=False),
+        sa.Column("late_seconds", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("employee_id", "work_date"),
+    )
+    op.create_index("ix_attendancerollup_work_date", "attendancerollup", ["work_date"])
+
+    # One pass over history when the table is created; every write after this
+    # only adjusts the days it touches.
+    shift = sa.table("shift", sa.column("id"), sa.column("starts_at", sa.DateTime()), sa.column("ends_at", sa.DateTime()))
+    assignment = sa.table(
+        "shiftassignment",
+        sa.column("shift_id"),
+        sa.column("employee_id"),
+        sa.column("check_in_time", sa.Time()),
+        sa.column("check_out_time", sa.Time()),
+    )
+    rows = op.get_bind().execute(
+        sa.select(
+            assignment.c.employee_id,
+            shift.c.starts_at,
+            shift.c.ends_at,
+            assignment.c.check_in_time,
+            assignment.c.check_out_time,
+        ).join(shift, shift.c.id == assignment.c.shift_id)
+    )
+    values = _rollup_rows(rows)
+    if values:
+        op.bulk_insert(rollup, values)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendancerollup_work_date", table_name="attendancerollup")
+    op.drop_table("attendancerollup")
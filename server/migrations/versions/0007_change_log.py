@@ -0,0 +1,59 @@
+"""Append-only change log for /sync, seeded with every existing row
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-09-01 00:00:00
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ("employee", "task", "shift", "shiftassignment")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "changelog",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("row_id", sa.Integer(), nullable=False),
+        sa.Column("deleted", sa.Boolean(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_changelog_table_name_row_id", "changelog", ["table_name", "row_id"])
+    op.create_table(
+        "changelogcompaction",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("compacted_at", sa.DateTime(), nullable=False),
+        sa.Column("horizon", sa.Integer(), nullable=False),
+        sa.Column("removed", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Existing rows enter the log as one upsert each, so a client syncing
+    # from cursor 0 sees everything.
+    now = datetime.utcnow()
+    for table in SYNCED_TABLES:
+        op.execute(
+            sa.text(
+                "INSERT INTO changelog (table_name, row_id, deleted, changed_at) "
+                f"SELECT :table_name, id, 0, :now FROM {table} ORDER BY id"
+            ).bindparams(table_name=table, now=now)
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("changelogcompaction")
+    op.drop_index("ix_changelog_table_name_row_id", table_name="changelog")
+    op.drop_table("changelog")
@@ -0,0 +1,57 @@
+"""FTS5 index over employee names, position, phone and notes, kept in sync by triggers
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-09-08 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = ("employee_fts_insert", "employee_fts_delete", "employee_fts_update")
+
+
+def upgrade() -> None:
+    # FTS5 is SQLite only; other databases search with LIKE instead.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE employee_fts USING fts5("
+        "first_name, last_name, position, phone, notes, content='employee', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute("INSERT INTO employee_fts(employee_fts, rank) VALUES ('rank', 'bm25(10.0, 10.0, 4.0, 2.0, 1.0)')")
+    op.execute(
+        "CREATE TRIGGER employee_fts_insert AFTER INSERT ON employee BEGIN "
+        "INSERT INTO employee_fts(rowid, first_name, last_name, position, phone, notes) "
+        "VALUES (new.id, new.first_name, new.last_name, new.position, new.phone, new.notes); END"
+    )
+    op.execute(
+        "CREATE TRIGGER employee_fts_delete AFTER DELETE ON employee BEGIN "
+        "INSERT INTO employee_fts(employee_fts, rowid, first_name, last_name, position, phone, notes) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name, old.position, old.phone, old.notes); END"
+    )
+    op.execute(
+        "CREATE TRIGGER employee_fts_update AFTER UPDATE ON employee BEGIN "
+        "INSERT INTO employee_fts(employee_fts, rowid, first_name, last_name, position, phone, notes) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name, old.position, old.phone, old.notes); "
+        "INSERT INTO employee_fts(rowid, first_name, last_name, position, phone, notes) "
+        "VALUES (new.id, new.first_name, new.last_name, new.position, new.phone, new.notes); END"
+    )
+    # Index every existing employee.
+    op.execute("INSERT INTO employee_fts(employee_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS employee_fts")
@@ -0,0 +1,130 @@
+"""Structured qualifications parsed from employee notes, and task experience requirements
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-09-15 00:00:00
+
+"""
+import re
+from datetime import date
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHUNK = 10_000
+# The notes format as of this revision, frozen here so later changes to
+# server.app.qualifications cannot change what this backfill writes.
+EXPERIENCE_LEVELS = ("easy", "medium", "expert")
+EXPIRES = re.compile(r"^(?P<name>.+?)\s+until\s+(?P<expires_on>\d{4}-\d{2}-\d{2})$")
+NOTE_KEYS = {
+    "experience": "experience",
+    "role": "role",
+    "roles": "role",
+    "certification": "certification",
+    "certifications": "certification",
+}
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def _parse_notes(notes: Optional[str]) -> tuple[Optional[str], list[str], dict[str, Optional[date]]]:
+    """``(experience, roles, {certification: expires_on})`` from ``key: value | ...`` notes."""
+
+    experience = None
+    roles: set[str] = set()
+    certifications: dict[str, Optional[date]] = {}
+    for part in (notes or "").split("|"):
+        key, separator, value = part.partition(":")
+        kind = NOTE_KEYS.get(_normalize(key))
+        if not separator or kind is None:
+            continue
+        if kind == "experience":
+            if _normalize(value) in EXPERIENCE_LEVELS:
+                experience = _normalize(value)
+            continue
+        for item in value.split(","):
+            if kind == "role":
+                roles.add(_normalize(item))
+                continue
+            match = EXPIRES.match(item.strip())
+            try:
+                expires_on = date.fromisoformat(match["expires_on"]) if match else None
+            except ValueError:
+                expires_on = None
+            name = _normalize(match["name"] if match else item)
+            if not name:
+                continue
+            if name in certifications:
+                # No expiry outlasts any date.
+                current = certifications[name]
+                certifications[name] = None if current is None or expires_on is None else max(current, expires_on)
+            else:
+                certifications[name] = expires_on
+    return experience, sorted(roles - {""}), dict(sorted(certifications.items()))
+
+
+def upgrade() -> None:
+    qualification = op.create_table(
+        "qualification",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("expires_on", sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(["employee_id"], ["employee.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ux_qualification_employee_id_kind_name", "qualification", ["employee_id", "kind", "name"], unique=True
+    )
+    with op.batch_alter_table("task") as batch_op:
+        batch_op.add_column(sa.Column("min_experience", sa.String(), nullable=True))
+
+    connection = op.get_bind()
+    # Tasks used to match any employee whose position or notes contained the
+    # requirement. Whoever qualified that way, without the matching role in
+    # their notes, keeps it as a certification with no expiry.
+    requirements = {
+        requirement.casefold()
+        for (requirement,) in connection.execute(sa.text("SELECT DISTINCT certification_required FROM task"))
+        if requirement and requirement.strip()
+    }
+    values = []
+    employees = connection.execute(sa.text("SELECT id, position, notes FROM employee")).all()
+    for employee_id, position, notes in employees:
+        experience, roles, certifications = _parse_notes(notes)
+        if experience:
+            values.append({"employee_id": employee_id, "kind": "experience", "name": experience, "expires_on": None})
+        for role in roles:
+            values.append({"employee_id": employee_id, "kind": "role", "name": role, "expires_on": None})
+        held = set(roles)
+        for name, expires_on in certifications.items():
+            held.add(name)
+            values.append({"employee_id": employee_id, "kind": "certification", "name": name, "expires_on": expires_on})
+        texts = ((position or "").casefold(), (notes or "").casefold())
+        for requirement in sorted(requirements):
+            name = _normalize(requirement)
+            if name not in held and any(requirement in text for text in texts):
+                held.add(name)
+                values.append({"employee_id": employee_id, "kind": "certification", "name": name, "expires_on": None})
+        if len(values) >= CHUNK:
+            op.bulk_insert(qualification, values)
+            values = []
+    if values:
+        op.bulk_insert(qualification, values)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("task") as batch_op:
+        batch_op.drop_column("min_experience")
+    op.drop_index("ux_qualification_employee_id_kind_name", table_name="qualification")
+    op.drop_table("qualification")
@@ -16,6 +16,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from server.app.database import init_db, session_scope  # noqa: E402
 from server.app.models import Employee, Role, User  # noqa: E402
+from server.app.qualifications import from_rows, parse_notes, replace, to_rows  # noqa: E402
 
 
 ADMIN_EMAIL = "admin@example.com"
@@ -118,7 +119,7 @@ def ensure_admin_user(session) -> User:
 
 
 def ensure_lifeguards(session) -> Iterable[Employee]:
-    """Create or update the sample lifeguards."""
+    """Create or update the sample lifeguards, with the qualifications their notes describe."""
 
     employees: list[Employee] = []
     has_changes = False
@@ -132,8 +133,10 @@ def ensure_lifeguards(session) -> Iterable[Employee]:
             )
         ).first()
 
+        qualifications = parse_notes(data["notes"])
         if existing is None:
             new_employee = Employee(**data)
+            new_employee.qualifications = to_rows(qualifications)
             session.add(new_employee)
             employees.append(new_employee)
             has_changes = True
@@ -145,6 +148,9 @@ def ensure_lifeguards(session) -> Iterable[Employee]:
             if getattr(existing, field) != value:
                 setattr(existing, field, value)
                 updated = True
+        if from_rows(existing.qualifications) != qualifications:
+            replace(existing, qualifications)
+            updated = True
 
         if updated:
             session.add(existing)
@@ -3,18 +3,19 @@ from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, create_engine
+from sqlmodel import SQLModel
 
 from server.app.main import app
 from server.app import database
-from server.app.auth import create_initial_admin
+from server.app.auth import create_initial_admin, principal_cache
 
 
 @pytest.fixture(autouse=True)
 def setup_db(tmp_path: Path):
     test_db_path = tmp_path / "test.db"
-    test_engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
+    test_engine = database.build_engine(f"sqlite:///{test_db_path}")
     database.override_engine(test_engine)
+    principal_cache.clear()
     SQLModel.metadata.create_all(test_engine)
     with database.session_scope() as session:
         create_initial_admin(session)
@@ -25,3 +26,24 @@ def setup_db(tmp_path: Path):
 @pytest.fixture()
 def client():
     return TestClient(app)
+
+
+@pytest.fixture()
+def login(client):
+    """``login(email, password)`` returns a bearer token for that user; the admin by default."""
+
+    def login(username: str = "admin@wavepark.local", password: str = "ChangeMe123!") -> str:
+        response = client.post(
+            "/auth/token",
+            data={"username": username, "password": password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+    return login
+
+
+@pytest.fixture()
+def auth_headers(login):
+    return {"Authorization": f"Bearer {login()}"}
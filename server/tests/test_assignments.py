@@ -0,0 +1,250 @@
+import gzip
+from datetime import datetime, time, timedelta
+
+from fastapi import status
+from sqlalchemy import event
+from sqlmodel import select
+
+from server.app import database
+from server.app.models import Employee, Shift, ShiftAssignment, Task
+from server.app.routers.assignments import to_read, with_relations
+
+
+def add_assignments(count: int):
+    start = datetime(2024, 6, 1, 8, 0)
+    with database.session_scope() as session:
+        for index in range(count):
+            shift = Shift(
+                name=f"Shift {index}",
+                location="Main Pool",
+                starts_at=start + timedelta(days=index),
+                ends_at=start + timedelta(days=index, hours=8),
+            )
+            employee = Employee(first_name=f"Guard{index}", last_name="Test")
+            task = Task(name=f"Task {index}")
+            session.add(ShiftAssignment(shift=shift, employee=employee, task=task))
+        session.commit()
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def count_queries(client, headers, path):
+    # Prime the principal cache so only the endpoint's own queries are counted.
+    client.get("/auth/cache-stats", headers=headers)
+    with QueryCounter(database.engine) as counter:
+        response = client.get(path, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    return counter.count, response
+
+
+def test_list_assignments_query_count_is_constant(client, auth_headers):
+    add_assignments(2)
+    small_count, small_response = count_queries(client, auth_headers, "/assignments")
+    add_assignments(20)
+    large_count, large_response = count_queries(client, auth_headers, "/assignments")
+
+    assert len(small_response.json()) == 2
+    assert len(large_response.json()) == 22
+    assert large_count == small_count
+    assert large_response.json()[0]["shift"]["name"] == "Shift 0"
+    assert large_response.json()[0]["task"]["name"] == "Task 0"
+
+
+def test_export_assignments_query_count_is_constant(client, auth_headers):
+    add_assignments(2)
+    small_count, _ = count_queries(client, auth_headers, "/reports/assignments.csv")
+    add_assignments(20)
+    large_count, large_response = count_queries(client, auth_headers, "/reports/assignments.csv")
+
+    assert large_count == small_count
+    assert len(large_response.text.strip().splitlines()) == 23
+
+
+def test_create_and_update_assignment(client, auth_headers):
+    shift = client.post(
+        "/shifts",
+        json={
+            "name": "Morning",
+            "location": "Wave Pool",
+            "starts_at": "2024-06-01T08:00:00",
+            "ends_at": "2024-06-01T16:00:00",
+        },
+        headers=auth_headers,
+    ).json()
+    employee = client.post("/employees", json={"first_name": "Ali", "last_name": "Rezaei"}, headers=auth_headers).json()
+    task = client.post("/tasks", json={"name": "Tower"}, headers=auth_headers).json()
+
+    created = client.post(
+        "/assignments",
+        json={"shift_id": shift["id"], "employee_id": employee["id"]},
+        headers=auth_headers,
+    )
+    assert created.status_code == status.HTTP_201_CREATED
+    assert created.json()["shift"]["name"] == "Morning"
+    assert created.json()["task"] is None
+
+    updated = client.patch(
+        f"/assignments/{created.json()['id']}", json={"task_id": task["id"]}, headers=auth_headers
+    )
+    assert updated.status_code == status.HTTP_200_OK
+    assert updated.json()["task"]["name"] == "Tower"
+    assert updated.json()["employee"]["first_name"] == "Ali"
+
+
+def test_list_assignments_filters(client, auth_headers):
+    add_assignments(4)
+    with database.session_scope() as session:
+        first = session.get(ShiftAssignment, 1)
+        employee_id = first.employee_id
+
+    by_employee = client.get("/assignments", params={"employee_id": employee_id}, headers=auth_headers)
+    assert [item["employee_id"] for item in by_employee.json()] == [employee_id]
+
+    by_range = client.get(
+        "/assignments",
+        params={"location": "Main Pool", "start": "2024-06-03T00:00:00"},
+        headers=auth_headers,
+    )
+    assert [item["shift"]["name"] for item in by_range.json()] == ["Shift 2", "Shift 3"]
+
+    paged = client.get("/assignments", params={"limit": 3}, headers=auth_headers)
+    assert len(paged.json()) == 3
+    assert "X-Next-Cursor" in paged.headers
+
+
+def test_export_assignments_streams_gzip(client, auth_headers):
+    add_assignments(3)
+
+    plain = client.get("/reports/assignments.csv", headers=auth_headers)
+    compressed = client.get("/reports/assignments.csv", params={"compress": True}, headers=auth_headers)
+
+    assert compressed.headers["content-type"] == "application/gzip"
+    assert gzip.decompress(compressed.content) == plain.content
+    lines = plain.text.strip().splitlines()
+    assert lines[0].startswith("Assignment ID,Shift,Location")
+    assert lines[1].startswith("1,Shift 0,Main Pool,2024-06-01T08:00:00")
+
+
+def test_bulk_endpoints_publish_a_roster(client, auth_headers):
+    shifts = client.post(
+        "/shifts/bulk",
+        json=[
+            {
+                "name": f"Day {day}",
+                "location": "Wave Pool",
+                "starts_at": f"2024-06-{day:02d}T08:00:00",
+                "ends_at": f"2024-06-{day:02d}T16:00:00",
+            }
+            for day in range(1, 4)
+        ],
+        headers=auth_headers,
+    )
+    assert shifts.status_code == status.HTTP_200_OK
+    shift_ids = [item["id"] for item in shifts.json()]
+    assert [item["status"] for item in shifts.json()] == ["created"] * 3
+
+    employees = client.post(
+        "/employees/bulk",
+        json=[{"first_name": "Ali", "last_name": "Rezaei"}, {"first_name": "Sara", "last_name": "Ahmadi"}],
+        headers=auth_headers,
+    )
+    employee_ids = [item["id"] for item in employees.json()]
+
+    roster = [
+        {"shift_id": shift_id, "employee_id": employee_id}
+        for shift_id in shift_ids
+        for employee_id in employee_ids
+    ]
+    roster.append({"shift_id": 999, "employee_id": employee_ids[0]})
+    roster.append({"shift_id": shift_ids[0], "employee_id": employee_ids[0], "task_id": 999})
+    results = client.post("/assignments/bulk", json=roster, headers=auth_headers).json()
+
+    assert [item["status"] for item in results] == ["created"] * 6 + ["error", "error"]
+    assert results[6]["detail"] == "Shift or employee not found"
+    assert results[7]["detail"] == "Task not found"
+    assert len(client.get("/assignments", headers=auth_headers).json()) == 6
+
+
+def test_bulk_update_replaces_existing_rows(client, auth_headers):
+    created = client.post("/employees/bulk", json=[{"first_name": "Ali", "last_name": "Rezaei"}], headers=auth_headers)
+    employee_id = created.json()[0]["id"]
+
+    updated = client.post(
+        "/employees/bulk",
+        json=[
+            {"id": employee_id, "first_name": "Ali", "last_name": "Rezaei", "position": "Head Lifeguard"},
+            {"id": 999, "first_name": "Ghost", "last_name": "Guard"},
+        ],
+        headers=auth_headers,
+    )
+    assert [item["status"] for item in updated.json()] == ["updated", "error"]
+    employees = client.get("/employees", headers=auth_headers).json()
+    assert employees == [
+        {"id": employee_id, "first_name": "Ali", "last_name": "Rezaei", "position": "Head Lifeguard", "phone": None, "notes": None}
+    ]
+
+
+def test_coverage_report_counts_assignments_per_shift_and_task(client, auth_headers):
+    with database.session_scope() as session:
+        rescue = Task(name="Rescue")
+        covered = Shift(name="Covered", location="Main Pool", starts_at=datetime(2024, 6, 1, 8), ends_at=datetime(2024, 6, 1, 16), required_staff=2)
+        short = Shift(name="Short", location="Main Pool", starts_at=datetime(2024, 6, 2, 8), ends_at=datetime(2024, 6, 2, 16), required_staff=3)
+        empty = Shift(name="Empty", location="Lazy River", starts_at=datetime(2024, 6, 3, 8), ends_at=datetime(2024, 6, 3, 16))
+        guards = [Employee(first_name=f"Guard{index}", last_name="Test") for index in range(3)]
+        session.add_all([
+            ShiftAssignment(shift=covered, employee=guards[0], task=rescue),
+            ShiftAssignment(shift=covered, employee=guards[1]),
+            ShiftAssignment(shift=short, employee=guards[2], task=rescue),
+            empty,
+        ])
+        session.commit()
+
+    coverage = client.get("/reports/coverage", headers=auth_headers).json()
+    assert [(item["name"], item["assigned"], item["shortfall"]) for item in coverage] == [
+        ("Covered", 2, 0),
+        ("Short", 1, 2),
+        ("Empty", 0, 1),
+    ]
+    assert sorted((task["task_name"] or "", task["assigned"]) for task in coverage[0]["tasks"]) == [("", 1), ("Rescue", 1)]
+
+    understaffed = client.get(
+        "/reports/coverage", params={"understaffed": True, "location": "Main Pool"}, headers=auth_headers
+    ).json()
+    assert [item["name"] for item in understaffed] == ["Short"]
+
+    exported = client.get(
+        "/reports/coverage.csv", params={"understaffed": True}, headers=auth_headers
+    ).text.splitlines()
+    assert exported[0] == "Shift ID,Shift,Location,Start,End,Required,Assigned,Shortfall,Tasks"
+    assert [line.split(",")[1] for line in exported[1:]] == ["Short", "Empty"]
+    assert exported[1].endswith(",3,1,2,Rescue: 1")
+
+
+def test_fast_list_matches_pydantic_serialization(client, auth_headers):
+    add_assignments(3)
+    with database.session_scope() as session:
+        untasked = session.get(ShiftAssignment, 2)
+        untasked.task_id = None
+        untasked.check_in_time = time(8, 5, 30)
+        untasked.note = "Covering for Ava"
+        session.add(untasked)
+        session.commit()
+        statement = with_relations(select(ShiftAssignment)).order_by(ShiftAssignment.id)
+        expected = [to_read(item).model_dump_json() for item in session.exec(statement).unique()]
+
+    response = client.get("/assignments", headers=auth_headers)
+    assert response.content == ("[" + ",".join(expected) + "]").encode()
@@ -0,0 +1,132 @@
+from datetime import date, datetime, time
+
+from sqlmodel import select
+
+from server.app import database
+from server.app.attendance import contribution, rollup_rows
+from server.app.models import AttendanceRollup, Employee, Shift, ShiftAssignment
+
+
+def test_check_times_are_anchored_to_the_shift_dates():
+    overnight = contribution(1, datetime(2024, 6, 1, 22), datetime(2024, 6, 2, 6), time(21, 50), time(6, 15))
+    assert overnight.work_date == date(2024, 6, 1)
+    assert overnight.worked_seconds == (8 * 60 + 25) * 60
+    assert overnight.late == 0
+
+    # Checking in just before midnight for a shift starting at 00:30 is early, not 23 hours late.
+    after_midnight = contribution(1, datetime(2024, 6, 2, 0, 30), datetime(2024, 6, 2, 8), time(23, 55), time(8))
+    assert after_midnight.late_seconds == 0
+    assert after_midnight.worked_seconds == (8 * 60 + 5) * 60
+
+    left_early = contribution(1, datetime(2024, 6, 1, 22), datetime(2024, 6, 2, 6), time(22, 10), time(23))
+    assert (left_early.late, left_early.late_seconds, left_early.worked_seconds) == (1, 600, 50 * 60)
+
+    open_check_in = contribution(1, datetime(2024, 6, 1, 8), datetime(2024, 6, 1, 16), time(8), None)
+    assert (open_check_in.attended, open_check_in.missing_check_out, open_check_in.worked_seconds) == (1, 1, 0)
+
+
+def rollup_table():
+    with database.session_scope() as session:
+        return {
+            (row.employee_id, row.work_date): (row.shifts, row.attended, row.worked_seconds, row.late_seconds)
+            for row in session.exec(select(AttendanceRollup))
+        }
+
+
+def recomputed():
+    with database.session_scope() as session:
+        rows = session.exec(
+            select(
+                ShiftAssignment.employee_id,
+                Shift.starts_at,
+                Shift.ends_at,
+                ShiftAssignment.check_in_time,
+                ShiftAssignment.check_out_time,
+            ).join(Shift, Shift.id == ShiftAssignment.shift_id)
+        )
+        return {
+            (row["employee_id"], row["work_date"]): (
+                row["shifts"],
+                row["attended"],
+                row["worked_seconds"],
+                row["late_seconds"],
+            )
+            for row in rollup_rows(rows)
+        }
+
+
+def test_rollup_follows_every_write_path(client, auth_headers):
+    with database.session_scope() as session:
+        guards = [Employee(first_name=f"Guard{index}", last_name="Test") for index in range(2)]
+        shifts = [
+            Shift(name="Morning", location="Main Pool", starts_at=datetime(2024, 6, 1, 8), ends_at=datetime(2024, 6, 1, 16)),
+            Shift(name="Night", location="Main Pool", starts_at=datetime(2024, 6, 1, 22), ends_at=datetime(2024, 6, 2, 6)),
+        ]
+        session.add_all(guards + shifts)
+        session.commit()
+        guard_ids = [guard.id for guard in guards]
+        shift_ids = [shift.id for shift in shifts]
+
+    created = client.post(
+        "/assignments",
+        json={"shift_id": shift_ids[0], "employee_id": guard_ids[0], "check_in_time": "08:05:00"},
+        headers=auth_headers,
+    ).json()
+    client.post(
+        "/assignments/bulk",
+        json=[
+            {"shift_id": shift_ids[1], "employee_id": guard_ids[0]},
+            {"shift_id": shift_ids[0], "employee_id": guard_ids[1], "check_in_time": "07:55:00", "check_out_time": "16:00:00"},
+        ],
+        headers=auth_headers,
+    ).raise_for_status()
+    client.patch(f"/assignments/{created['id']}", json={"check_out_time": "16:05:00"}, headers=auth_headers)
+    assert rollup_table() == recomputed()
+    assert rollup_table()[(guard_ids[0], date(2024, 6, 1))] == (2, 1, 8 * 3600, 300)
+
+    moved = {"name": "Morning", "location": "Main Pool", "starts_at": "2024-06-03T08:00:00", "ends_at": "2024-06-03T16:00:00"}
+    client.put(f"/shifts/{shift_ids[0]}", json=moved, headers=auth_headers).raise_for_status()
+    assert rollup_table() == recomputed()
+    assert (guard_ids[1], date(2024, 6, 1)) not in rollup_table()
+
+    client.delete(f"/assignments/{created['id']}", headers=auth_headers)
+    assert rollup_table() == recomputed()
+
+    daily = client.get("/reports/attendance/daily", params={"employee_id": guard_ids[1]}, headers=auth_headers).json()
+    assert [(day["work_date"], day["worked_hours"], day["no_shows"]) for day in daily] == [("2024-06-03", 8.08, 0)]
+
+    summary = client.get(
+        "/reports/attendance", params={"start": "2024-06-01", "end": "2024-06-30"}, headers=auth_headers
+    )
+    by_employee = {row["employee_id"]: row for row in summary.json()}
+    assert by_employee[guard_ids[0]]["no_shows"] == 1
+    assert by_employee[guard_ids[0]]["scheduled_hours"] == 8
+    assert by_employee[guard_ids[1]]["first_name"] == "Guard1"
+
+    exported = client.get("/reports/attendance.csv", headers=auth_headers).text.splitlines()
+    assert exported[0].startswith("Employee ID,Employee,Shifts,Attended,No-shows")
+    assert len(exported) == 3
+
+
+def test_failed_bulk_update_keeps_its_rollup(client, auth_headers):
+    with database.session_scope() as session:
+        guard = Employee(first_name="Guard", last_name="Test")
+        shift = Shift(name="Morning", location="Main Pool", starts_at=datetime(2024, 6, 1, 8), ends_at=datetime(2024, 6, 1, 16))
+        session.add_all([guard, shift])
+        session.commit()
+        guard_id, shift_id = guard.id, shift.id
+    created = client.post(
+        "/assignments",
+        json={"shift_id": shift_id, "employee_id": guard_id, "check_in_time": "08:00:00", "check_out_time": "16:00:00"},
+        headers=auth_headers,
+    ).json()
+    before = rollup_table()
+
+    response = client.post(
+        "/assignments/bulk",
+        json=[{"id": created["id"], "shift_id": shift_id, "employee_id": guard_id, "task_id": 999, "check_out_time": None}],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["status"] == "error"
+    assert rollup_table() == before == recomputed()
@@ -1,4 +1,13 @@
+import asyncio
+import time
+
 from fastapi import status
+from sqlmodel import select
+
+from server.app import database
+from server.app.auth import get_current_user
+from server.app.models import Role, User
+from server.app.passwords import PasswordPool, password_pool
 
 
 def test_login_default_admin(client):
@@ -24,3 +33,109 @@ def test_create_user_requires_auth(client):
         },
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_principal_cache_hits_after_first_request(client, auth_headers):
+    client.get("/employees", headers=auth_headers)
+    client.get("/employees", headers=auth_headers)
+
+    stats = client.get("/auth/cache-stats", headers=auth_headers).json()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    assert stats["size"] == 1
+
+
+def test_principal_cache_invalidated_on_demotion(client, auth_headers, login):
+    client.post(
+        "/auth/users",
+        json={
+            "email": "manager@wavepark.local",
+            "full_name": "Shift Manager",
+            "role": "manager",
+            "password": "password123",
+        },
+        headers=auth_headers,
+    )
+    manager_headers = {"Authorization": f"Bearer {login('manager@wavepark.local', 'password123')}"}
+    assert client.post("/tasks", json={"name": "Tower"}, headers=manager_headers).status_code == status.HTTP_201_CREATED
+
+    with database.session_scope() as session:
+        manager = session.exec(select(User).where(User.email == "manager@wavepark.local")).one()
+        manager.role = Role.VIEWER
+        session.add(manager)
+        session.commit()
+
+    response = client.post("/tasks", json={"name": "Gate"}, headers=manager_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_principal_cached_between_flush_and_commit_is_dropped(client, auth_headers, login):
+    client.post(
+        "/auth/users",
+        json={"email": "manager@wavepark.local", "full_name": "Shift Manager", "role": "manager", "password": "password123"},
+        headers=auth_headers,
+    ).raise_for_status()
+    token = login("manager@wavepark.local", "password123")
+
+    with database.session_scope() as session:
+        manager = session.exec(select(User).where(User.email == "manager@wavepark.local")).one()
+        manager.role = Role.VIEWER
+        session.add(manager)
+        session.flush()
+        # A concurrent request still sees the committed manager and caches it.
+        with database.session_scope() as other:
+            assert get_current_user(token, other).role == Role.MANAGER
+        session.commit()
+
+    response = client.post("/tasks", json={"name": "Gate"}, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_login_unknown_email_is_rejected(client):
+    response = client.post(
+        "/auth/token",
+        data={"username": "nobody@wavepark.local", "password": "whatever"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Incorrect email or password"
+
+
+def test_login_rejected_when_password_pool_is_saturated(client, monkeypatch):
+    monkeypatch.setattr(password_pool, "pending", password_pool.max_pending)
+    response = client.post(
+        "/auth/token",
+        data={"username": "admin@wavepark.local", "password": "ChangeMe123!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_unknown_email_is_shed_like_a_real_one_when_saturated(client, monkeypatch):
+    monkeypatch.setattr(password_pool, "pending", password_pool.max_pending)
+    response = client.post(
+        "/auth/token",
+        data={"username": "nobody@wavepark.local", "password": "whatever"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert password_pool.pending == password_pool.max_pending
+
+
+def test_unknown_email_waits_in_the_same_queue_as_a_real_check():
+    pool = PasswordPool(workers=1, max_pending=4)
+    pool.verify_seconds = 0.05
+
+    async def reject_behind_a_busy_worker() -> float:
+        busy = asyncio.wrap_future(pool.submit(time.sleep, 0.5))
+        started = time.perf_counter()
+        await pool.reject_unknown()
+        elapsed = time.perf_counter() - started
+        await busy
+        return elapsed
+
+    try:
+        assert asyncio.run(reject_behind_a_busy_worker()) >= 0.5
+    finally:
+        pool.shutdown()
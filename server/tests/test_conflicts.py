@@ -0,0 +1,169 @@
+import random
+from datetime import datetime, timedelta
+
+from fastapi import status
+from sqlalchemy import event
+
+from server.app import database
+from server.app.conflicts import IntervalIndex, find_conflicts
+from server.app.models import ShiftAssignment
+
+
+def create_shift(client, headers, name, starts_at, ends_at):
+    response = client.post(
+        "/shifts",
+        json={"name": name, "location": "Wave Pool", "starts_at": starts_at, "ends_at": ends_at},
+        headers=headers,
+    )
+    return response.json()["id"]
+
+
+def random_rows(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    base = datetime(2024, 6, 1)
+    rows = []
+    for assignment_id in range(1, count + 1):
+        starts_at = base + timedelta(hours=rng.randint(0, 200))
+        rows.append((assignment_id, rng.randint(1, 5), assignment_id, starts_at, starts_at + timedelta(hours=rng.randint(1, 10))))
+    return sorted(rows, key=lambda row: (row[1], row[3], row[0]))
+
+
+def test_find_conflicts_matches_pairwise_check():
+    rows = random_rows(300)
+    expected = {
+        frozenset((a[0], b[0]))
+        for i, a in enumerate(rows)
+        for b in rows[i + 1 :]
+        if a[1] == b[1] and a[3] < b[4] and b[3] < a[4]
+    }
+    found = {frozenset((item.assignment_id, item.conflicting_assignment_id)) for item in find_conflicts(rows)}
+    assert found == expected
+
+
+def test_interval_index_finds_long_enclosing_interval():
+    index = IntervalIndex()
+    start = datetime(2024, 6, 1, 8)
+    index.add(1, start, start + timedelta(hours=12), "long")
+    index.add(1, start + timedelta(hours=1), start + timedelta(hours=2), "short")
+    assert index.overlapping(1, start + timedelta(hours=5), start + timedelta(hours=6)) == ["long"]
+    assert index.overlapping(1, start + timedelta(hours=12), start + timedelta(hours=13)) == []
+    assert index.overlapping(2, start, start + timedelta(hours=1)) == []
+
+
+def test_assignment_writes_reject_overlapping_shifts(client, auth_headers):
+    morning = create_shift(client, auth_headers, "Morning", "2024-06-01T08:00:00", "2024-06-01T14:00:00")
+    midday = create_shift(client, auth_headers, "Midday", "2024-06-01T12:00:00", "2024-06-01T18:00:00")
+    evening = create_shift(client, auth_headers, "Evening", "2024-06-01T14:00:00", "2024-06-01T20:00:00")
+    employee = client.post(
+        "/employees", json={"first_name": "Ali", "last_name": "Rezaei"}, headers=auth_headers
+    ).json()["id"]
+
+    first = client.post("/assignments", json={"shift_id": morning, "employee_id": employee}, headers=auth_headers)
+    assert first.status_code == status.HTTP_201_CREATED
+    clash = client.post("/assignments", json={"shift_id": midday, "employee_id": employee}, headers=auth_headers)
+    assert clash.status_code == status.HTTP_409_CONFLICT
+    back_to_back = client.post(
+        "/assignments", json={"shift_id": evening, "employee_id": employee}, headers=auth_headers
+    )
+    assert back_to_back.status_code == status.HTTP_201_CREATED
+
+    moved = client.patch(f"/assignments/{back_to_back.json()['id']}", json={"shift_id": midday}, headers=auth_headers)
+    assert moved.status_code == status.HTTP_409_CONFLICT
+    same_shift = client.patch(f"/assignments/{first.json()['id']}", json={"shift_id": morning}, headers=auth_headers)
+    assert same_shift.status_code == status.HTTP_200_OK
+
+
+def test_bulk_and_conflict_report(client, auth_headers):
+    morning = create_shift(client, auth_headers, "Morning", "2024-06-01T08:00:00", "2024-06-01T14:00:00")
+    midday = create_shift(client, auth_headers, "Midday", "2024-06-01T12:00:00", "2024-06-01T18:00:00")
+    employee = client.post(
+        "/employees", json={"first_name": "Ali", "last_name": "Rezaei"}, headers=auth_headers
+    ).json()["id"]
+
+    results = client.post(
+        "/assignments/bulk",
+        json=[{"shift_id": morning, "employee_id": employee}, {"shift_id": midday, "employee_id": employee}],
+        headers=auth_headers,
+    ).json()
+    assert [item["status"] for item in results] == ["created", "error"]
+    assert results[1]["detail"] == "Overlaps item 0 in this batch"
+
+    # Rows written before overlap checks existed are still reported.
+    with database.session_scope() as session:
+        session.add(ShiftAssignment(shift_id=midday, employee_id=employee))
+        session.commit()
+
+    conflicts = client.get(
+        "/assignments/conflicts", params={"start": "2024-06-01T00:00:00"}, headers=auth_headers
+    ).json()
+    assert len(conflicts) == 1
+    assert conflicts[0]["shift_id"] == morning
+    assert conflicts[0]["conflicting_shift_id"] == midday
+
+
+def test_bulk_update_frees_its_slot_only_when_accepted(client, auth_headers):
+    morning = create_shift(client, auth_headers, "Morning", "2024-06-01T08:00:00", "2024-06-01T14:00:00")
+    midday = create_shift(client, auth_headers, "Midday", "2024-06-01T12:00:00", "2024-06-01T18:00:00")
+    evening = create_shift(client, auth_headers, "Evening", "2024-06-01T18:00:00", "2024-06-01T22:00:00")
+    employee = client.post(
+        "/employees", json={"first_name": "Ali", "last_name": "Rezaei"}, headers=auth_headers
+    ).json()["id"]
+    booked = client.post("/assignments", json={"shift_id": morning, "employee_id": employee}, headers=auth_headers)
+    booked_id = booked.json()["id"]
+
+    failed_move = [
+        {"id": booked_id, "shift_id": evening, "employee_id": employee, "task_id": 999},
+        {"shift_id": midday, "employee_id": employee},
+    ]
+    results = client.post("/assignments/bulk", json=failed_move, headers=auth_headers).json()
+    assert [item["status"] for item in results] == ["error", "error"]
+    assert results[1]["detail"] == f"Overlaps assignment {booked_id}"
+
+    accepted_move = [{"id": booked_id, "shift_id": evening, "employee_id": employee}, failed_move[1]]
+    results = client.post("/assignments/bulk", json=accepted_move, headers=auth_headers).json()
+    assert [item["status"] for item in results] == ["updated", "created"]
+
+
+def test_moving_a_shift_cannot_double_book_its_staff(client, auth_headers):
+    morning = create_shift(client, auth_headers, "Morning", "2024-06-01T08:00:00", "2024-06-01T14:00:00")
+    evening = create_shift(client, auth_headers, "Evening", "2024-06-01T14:00:00", "2024-06-01T20:00:00")
+    employee = client.post(
+        "/employees", json={"first_name": "Ali", "last_name": "Rezaei"}, headers=auth_headers
+    ).json()["id"]
+    for shift_id in (morning, evening):
+        client.post(
+            "/assignments", json={"shift_id": shift_id, "employee_id": employee}, headers=auth_headers
+        ).raise_for_status()
+
+    earlier = {
+        "name": "Evening", "location": "Wave Pool", "starts_at": "2024-06-01T12:00:00", "ends_at": "2024-06-01T18:00:00"
+    }
+    assert client.put(f"/shifts/{evening}", json=earlier, headers=auth_headers).status_code == status.HTTP_409_CONFLICT
+    results = client.post("/shifts/bulk", json=[{"id": evening, **earlier}], headers=auth_headers).json()
+    assert results[0]["status"] == "error"
+
+    later = {**earlier, "starts_at": "2024-06-01T15:00:00", "ends_at": "2024-06-01T21:00:00"}
+    assert client.put(f"/shifts/{evening}", json=later, headers=auth_headers).status_code == status.HTTP_200_OK
+    # Both shifts move together, so neither lands on the other's old slot.
+    swap = [
+        {**earlier, "id": morning, "starts_at": "2024-06-02T08:00:00", "ends_at": "2024-06-02T14:00:00"},
+        {**earlier, "id": evening, "starts_at": "2024-06-01T09:00:00", "ends_at": "2024-06-01T15:00:00"},
+    ]
+    results = client.post("/shifts/bulk", json=swap, headers=auth_headers).json()
+    assert [item["status"] for item in results] == ["updated", "updated"]
+
+
+def test_assignment_writes_take_the_write_lock_before_checking(client, auth_headers):
+    shift = create_shift(client, auth_headers, "Morning", "2024-06-01T08:00:00", "2024-06-01T14:00:00")
+    employee = client.post(
+        "/employees", json={"first_name": "Ali", "last_name": "Rezaei"}, headers=auth_headers
+    ).json()["id"]
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        client.post("/assignments", json={"shift_id": shift, "employee_id": employee}, headers=auth_headers)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+    locked = statements.index("BEGIN IMMEDIATE")
+    assert locked < next(index for index, statement in enumerate(statements) if "FROM shiftassignment" in statement)
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from fastapi import status
+from sqlalchemy import event
+
+from server.app import database
+from server.app.models import Employee, Shift, ShiftAssignment, Task
+
+
+def test_dashboard_bundle_is_normalized_and_windowed(client, auth_headers):
+    start = datetime(2024, 6, 1, 8)
+    with database.session_scope() as session:
+        guards = [Employee(first_name=f"Guard{index}", last_name="Test") for index in range(8)]
+        rescue = Task(name="Rescue")
+        shifts = [
+            Shift(name=f"Day {day}", location="Main Pool", starts_at=start + timedelta(days=day),
+                  ends_at=start + timedelta(days=day, hours=8), required_staff=8)
+            for day in range(3)
+        ]
+        session.add_all(
+            ShiftAssignment(shift=shift, employee=guard, task=rescue) for shift in shifts for guard in guards
+        )
+        session.commit()
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    client.get("/auth/cache-stats", headers=auth_headers)
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        bundle = client.get(
+            "/dashboard", params={"start": "2024-06-02T00:00:00", "end": "2024-06-04T00:00:00"}, headers=auth_headers
+        )
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+    # Table versions, sync cursor, then one query per collection.
+    assert len(statements) == 6
+
+    data = bundle.json()
+    assert data["cursor"] > 0
+    assert len(data["employees"]) == 8 and len(data["tasks"]) == 1
+    assert [shift["name"] for shift in data["shifts"]] == ["Day 1", "Day 2"]
+    assert len(data["assignments"]) == 16
+    assert set(data["assignments"][0]) == {
+        "id", "shift_id", "employee_id", "task_id", "note", "check_in_time", "check_out_time",
+    }
+    assert {item["shift_id"] for item in data["assignments"]} == {shift["id"] for shift in data["shifts"]}
+
+    separate = sum(
+        len(client.get(path, headers=auth_headers).content)
+        for path in ("/employees", "/tasks", "/shifts", "/assignments")
+    )
+    everything = client.get("/dashboard", params={"start": "2024-06-01T00:00:00"}, headers=auth_headers).content
+    assert len(everything) < separate / 2
+
+
+def test_dashboard_window_is_bounded(client, auth_headers):
+    response = client.get(
+        "/dashboard", params={"start": "2024-01-01T00:00:00", "end": "2025-01-01T00:00:00"}, headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get("/dashboard", headers=auth_headers).status_code == status.HTTP_200_OK
+
+
+def test_dashboard_pages_employees_and_tasks(client, auth_headers, monkeypatch):
+    from server.app.routers import dashboard
+
+    monkeypatch.setattr(dashboard.settings, "max_page_size", 3)
+    with database.session_scope() as session:
+        session.add_all(Employee(first_name=f"Guard{index}", last_name="Test") for index in range(5))
+        session.add(Task(name="Rescue"))
+        session.commit()
+
+    data = client.get("/dashboard", headers=auth_headers).json()
+    assert len(data["employees"]) == 3 and data["tasks_cursor"] is None
+    rest = client.get("/employees", params={"cursor": data["employees_cursor"]}, headers=auth_headers).json()
+    assert [item["id"] for item in data["employees"] + rest] == sorted(item["id"] for item in data["employees"] + rest)
+    assert len(data["employees"] + rest) == 5
@@ -0,0 +1,95 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+import pytest
+from sqlalchemy import inspect, text
+from sqlmodel import SQLModel, create_engine
+
+from server.app import database, search
+
+
+def use_fresh_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    database.override_engine(engine)
+    return engine
+
+
+def test_migrations_match_models(tmp_path):
+    engine = use_fresh_engine(tmp_path)
+    database.init_db()
+
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"include_name": search.include_in_autogenerate})
+        diff = compare_metadata(context, SQLModel.metadata)
+    assert diff == []
+
+
+def test_init_db_upgrades_legacy_create_all_database(tmp_path):
+    engine = use_fresh_engine(tmp_path)
+    with engine.begin() as connection:
+        command.upgrade(database.alembic_config(connection), database.BASELINE_REVISION)
+        connection.execute(text("DROP TABLE alembic_version"))
+
+    database.init_db()
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("shiftassignment")}
+    assert "ix_shiftassignment_employee_id_shift_id" in indexes
+    database.init_db()
+
+
+def test_schema_revision_is_the_migration_head():
+    assert ScriptDirectory.from_config(database.alembic_config()).get_current_head() == database.SCHEMA_REVISION
+
+
+def test_check_schema_requires_a_bootstrapped_database(tmp_path, monkeypatch):
+    use_fresh_engine(tmp_path)
+    with pytest.raises(RuntimeError, match="server.bootstrap"):
+        database.check_schema()
+
+    database.init_db()
+    database.check_schema()
+
+    # A current database is not migrated again.
+    monkeypatch.setattr(database, "alembic_config", lambda *args: pytest.fail("Alembic was loaded"))
+    database.init_db()
+
+
+def test_sqlite_engine_applies_pragmas(tmp_path):
+    engine = database.build_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
+
+
+def test_read_endpoints_use_async_engine(client, monkeypatch, auth_headers):
+    shift = client.post(
+        "/shifts",
+        json={
+            "name": "Morning",
+            "location": "Wave Pool",
+            "starts_at": "2024-06-01T08:00:00",
+            "ends_at": "2024-06-01T16:00:00",
+        },
+        headers=auth_headers,
+    ).json()
+    employee = client.post("/employees", json={"first_name": "Ali", "last_name": "Rezaei"}, headers=auth_headers).json()
+    client.post("/assignments", json={"shift_id": shift["id"], "employee_id": employee["id"]}, headers=auth_headers)
+
+    monkeypatch.setattr(database.settings, "async_database", True)
+    assert database.get_async_engine().url.drivername == "sqlite+aiosqlite"
+
+    employees = client.get("/employees", headers=auth_headers)
+    assert [item["first_name"] for item in employees.json()] == ["Ali"]
+    assignments = client.get("/assignments", params={"location": "Wave Pool"}, headers=auth_headers)
+    assert assignments.json()[0]["shift"]["name"] == "Morning"
+    export = client.get("/reports/assignments.csv", headers=auth_headers)
+    assert export.text.splitlines()[1].startswith("1,Morning,Wave Pool")
+
+    old = database.get_async_engine()
+    assert old.sync_engine.pool.checkedin() > 0
+    database.override_engine(database.engine)
+    assert old.sync_engine.pool.checkedin() == 0
+    assert database.get_async_engine() is not old
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import status
+
+from server.app import search
+
+
+def add_employee(client, headers, **fields):
+    response = client.post("/employees", json={"last_name": "Test", **fields}, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+def run_search(client, headers, q, **params):
+    response = client.get("/employees/search", params={"q": q, **params}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    return response
+
+
+def test_search_matches_word_prefixes_and_ranks_names_first(client, auth_headers):
+    in_notes = add_employee(client, auth_headers, first_name="Sam", notes="Covers for Maryam on weekends")
+    in_name = add_employee(client, auth_headers, first_name="Maryam", last_name="Karimi", position="Lifeguard")
+    add_employee(client, auth_headers, first_name="Reza", position="Instructor")
+
+    assert [item["id"] for item in run_search(client, auth_headers, "mary").json()] == [in_name["id"], in_notes["id"]]
+    # Every word must match, in any column.
+    assert [item["id"] for item in run_search(client, auth_headers, "kar life").json()] == [in_name["id"]]
+    assert [item["id"] for item in run_search(client, auth_headers, "MARYAM weekend").json()] == [in_notes["id"]]
+    assert run_search(client, auth_headers, "nobody").json() == []
+    # FTS5 syntax in the query is plain text, not an error.
+    assert run_search(client, auth_headers, 'maryam" NEAR(').json() == []
+    assert len(run_search(client, auth_headers, 'maryam"*(').json()) == 2
+    assert run_search(client, auth_headers, "***").json() == []
+
+
+def test_search_follows_updates_and_deletes(client, auth_headers):
+    employee = add_employee(client, auth_headers, first_name="Dana", position="Lifeguard")
+
+    client.put(
+        f"/employees/{employee['id']}",
+        json={"first_name": "Dana", "last_name": "Test", "position": "Cashier"},
+        headers=auth_headers,
+    ).raise_for_status()
+    assert run_search(client, auth_headers, "lifeguard").json() == []
+    assert [item["id"] for item in run_search(client, auth_headers, "cash").json()] == [employee["id"]]
+
+    client.delete(f"/employees/{employee['id']}", headers=auth_headers).raise_for_status()
+    assert run_search(client, auth_headers, "dana").json() == []
+
+
+@pytest.mark.parametrize("ranked_match_limit", [search.RANKED_MATCH_LIMIT, 2])
+def test_search_keyset_pagination(client, monkeypatch, ranked_match_limit, auth_headers):
+    # Past the limit, results are paged in id order instead of by rank.
+    monkeypatch.setattr(search, "RANKED_MATCH_LIMIT", ranked_match_limit)
+    expected = [
+        add_employee(client, auth_headers, first_name=f"Guard{index}", position="Lifeguard")["id"] for index in range(5)
+    ]
+
+    ids = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = run_search(client, auth_headers, "life", **params)
+        ids.extend(item["id"] for item in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert sorted(ids) == expected and len(ids) == len(set(ids))
+    if ranked_match_limit < len(expected):
+        assert ids == expected
+    assert client.get("/employees/search", params={"q": ""}, headers=auth_headers).status_code == 422
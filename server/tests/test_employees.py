@@ -31,3 +31,32 @@ def test_create_and_list_employee(client):
     assert list_response.status_code == status.HTTP_200_OK
     assert len(data) == 1
     assert data[0]["first_name"] == "Ali"
+
+
+def test_list_employees_keyset_pagination(client, auth_headers):
+    for index in range(5):
+        client.post("/employees", json={"first_name": f"Guard{index}", "last_name": "Test"}, headers=auth_headers)
+
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/employees", params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) <= 2
+        names.extend(item["first_name"] for item in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert names == [f"Guard{index}" for index in range(5)]
+
+
+def test_list_employees_rejects_bad_cursor(client, auth_headers):
+    response = client.get("/employees", params={"cursor": "not-a-cursor"}, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
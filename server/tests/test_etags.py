@@ -0,0 +1,54 @@
+from fastapi import status
+from sqlalchemy import event
+
+from server.app import database
+
+
+def test_unchanged_list_answers_304_with_a_single_version_lookup(client, auth_headers):
+    client.post("/employees", json={"first_name": "Ava", "last_name": "Lopez"}, headers=auth_headers)
+
+    first = client.get("/employees", headers=auth_headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        cached = client.get("/employees", headers={**auth_headers, "If-None-Match": etag})
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert not any("FROM employee" in statement for statement in statements)
+
+    assert client.get("/employees", params={"limit": 1}, headers=auth_headers).headers["ETag"] != etag
+    assert client.get("/employees", headers={"If-None-Match": etag}).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_every_write_path_changes_the_etag(client, auth_headers):
+    def etag(path):
+        return client.get(path, headers=auth_headers).headers["ETag"]
+
+    before = etag("/employees")
+    created = client.post("/employees", json={"first_name": "Ava", "last_name": "Lopez"}, headers=auth_headers).json()
+    after_create = etag("/employees")
+    assert after_create != before
+
+    client.post(
+        "/employees/bulk",
+        json=[{"id": created["id"], "first_name": "Ava", "last_name": "Chen"}],
+        headers=auth_headers,
+    ).raise_for_status()
+    after_bulk = etag("/employees")
+    assert after_bulk != after_create
+
+    # Writes to other tables leave the employee list alone but invalidate lists that embed them.
+    assignments = etag("/assignments")
+    client.post("/tasks", json={"name": "Rescue"}, headers=auth_headers)
+    assert etag("/employees") == after_bulk
+    assert etag("/assignments") != assignments
+
+    client.delete(f"/employees/{created['id']}", headers=auth_headers)
+    assert etag("/employees") != after_bulk
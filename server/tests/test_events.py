@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+from fastapi import status
+
+from server.app.auth import create_access_token
+from server.app.events import RESYNC_FRAME, EventBroker, broker, sse_frame
+
+
+def test_broker_fans_out_across_threads_and_bounds_slow_consumers():
+    async def scenario():
+        broker = EventBroker(queue_size=2)
+        fast, slow = broker.subscribe(), broker.subscribe()
+        frames = [sse_frame("change", {"cursor": cursor}, event_id=cursor) for cursor in range(4)]
+
+        publisher = threading.Thread(target=broker.publish, args=(frames[0],))
+        publisher.start()
+        publisher.join()
+        assert await asyncio.wait_for(fast.queue.get(), timeout=1) == frames[0]
+
+        for frame in frames[1:]:
+            broker.publish(frame)
+            if not fast.queue.empty():
+                await fast.queue.get()
+        # The slow consumer never read: its backlog collapsed into one resync frame.
+        assert [slow.queue.get_nowait() for _ in range(slow.queue.qsize())] == [RESYNC_FRAME, frames[3]]
+        assert broker.stats()["overflows"] == 1
+
+        broker.unsubscribe(slow)
+        assert broker.stats()["subscribers"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_event_stream_requires_a_token_and_pushes_committed_changes(client, auth_headers):
+    assert client.get("/events").status_code == status.HTTP_401_UNAUTHORIZED
+    # A short-lived token ends the stream, so the whole body can be inspected.
+    short_token = create_access_token({"sub": "1", "role": "admin"}, expires_delta=timedelta(seconds=2))
+
+    received = {}
+
+    def listen():
+        received["body"] = client.get("/events", params={"access_token": short_token}).text
+
+    listener = threading.Thread(target=listen)
+    subscribers = broker.stats()["subscribers"]
+    listener.start()
+    deadline = time.monotonic() + 5
+    while broker.stats()["subscribers"] == subscribers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    employee = client.post("/employees", json={"first_name": "Ava", "last_name": "Lopez"}, headers=auth_headers).json()
+    listener.join(timeout=10)
+
+    body = received["body"]
+    assert body.startswith("retry: 5000")
+    assert "event: change" in body
+    assert f'{{"table":"employee","id":{employee["id"]},"deleted":false}}' in body
+
+    short_token = create_access_token({"sub": "1", "role": "admin"}, expires_delta=timedelta(seconds=1))
+    resumed = client.get("/events", params={"access_token": short_token}, headers={"Last-Event-ID": "0"})
+    assert "event: resync" in resumed.text
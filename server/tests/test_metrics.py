@@ -0,0 +1,97 @@
+import asyncio
+import re
+
+from fastapi import status
+
+from server.app.metrics import MetricsMiddleware, registry
+from server.app.routers import metrics
+
+
+def sample(text: str, name: str, **labels) -> float:
+    for line in text.splitlines():
+        metric = line.partition("{")[0].partition(" ")[0]
+        if metric == name and all(f'{key}="{value}"' in line for key, value in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"no {name} sample with {labels}")
+
+
+def test_metrics_are_labelled_by_route_template(client, auth_headers):
+    created = client.post("/employees", json={"first_name": "Ava", "last_name": "Lopez"}, headers=auth_headers).json()
+    registry.clear()
+
+    listing = client.get("/employees", headers=auth_headers)
+    client.put(f"/employees/{created['id']}", json={"first_name": "Ava", "last_name": "Reyes"}, headers=auth_headers)
+    client.put("/employees/999", json={"first_name": "No", "last_name": "One"}, headers=auth_headers)
+    client.get("/no-such-page")
+
+    response = client.get("/metrics", headers=auth_headers)
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    route = {"method": "GET", "route": "/employees"}
+    assert sample(text, "http_requests_total", status="200", **route) == 1
+    assert sample(text, "http_response_size_bytes_sum", **route) == len(listing.content)
+    assert sample(text, "http_request_duration_seconds_count", **route) == 1
+    assert sample(text, "http_request_duration_seconds_bucket", le="+Inf", **route) == 1
+    # The ETag version lookup and the page query.
+    assert sample(text, "http_request_sql_statements_sum", **route) >= 2
+    assert sample(text, "http_request_sql_seconds_total", **route) > 0
+
+    updates = {"method": "PUT", "route": "/employees/{employee_id}"}
+    assert sample(text, "http_requests_total", status="200", **updates) == 1
+    assert sample(text, "http_requests_total", status="404", **updates) == 1
+    assert sample(text, "http_requests_total", method="GET", route="(unmatched)", status="404") == 1
+    assert not re.search(r'route="/employees/\d+"', text)
+    assert sample(text, "db_statements_total") >= sample(text, "http_request_sql_statements_sum", **route)
+
+
+def test_histogram_buckets_are_cumulative(client, auth_headers):
+    registry.clear()
+    for _ in range(3):
+        client.get("/")
+    text = client.get("/metrics", headers=auth_headers).text
+
+    buckets = [
+        float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line.startswith('http_request_sql_statements_bucket{method="GET",route="/"')
+    ]
+    assert buckets == sorted(buckets)
+    assert buckets[0] == 3  # le="0": the health check runs no SQL
+    assert buckets[-1] == 3
+
+
+def test_event_streams_stay_out_of_latency_and_size(client, auth_headers):
+    registry.clear()
+
+    async def stream(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]})
+        await send({"type": "http.response.body", "body": b": heartbeat\n\n" * 1000})
+
+    async def ignore(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/stream"}
+    asyncio.run(MetricsMiddleware(stream)(scope, None, ignore))
+    text = client.get("/metrics", headers=auth_headers).text
+
+    route = {"method": "GET", "route": "(unmatched)"}
+    assert sample(text, "http_requests_total", status="200", **route) == 1
+    assert sample(text, "http_request_duration_seconds_count", **route) == 0
+    assert sample(text, "http_response_size_bytes_count", **route) == 0
+
+
+def test_metrics_need_an_admin_or_the_scrape_token(client, monkeypatch, auth_headers, login):
+    assert client.get("/metrics").status_code == status.HTTP_401_UNAUTHORIZED
+    client.post(
+        "/auth/users",
+        json={"email": "viewer@wavepark.local", "full_name": "Viewer", "password": "Viewer123!", "role": "viewer"},
+        headers=auth_headers,
+    ).raise_for_status()
+    viewer = login("viewer@wavepark.local", "Viewer123!")
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {viewer}"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    monkeypatch.setattr(metrics.settings, "metrics_token", "scrape-secret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == status.HTTP_200_OK
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,177 @@
+from datetime import date
+
+from alembic import command
+from fastapi import status
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from server.app import database
+from server.app.qualifications import EligibilityIndex, parse_notes
+
+
+def add_employee(client, headers, first_name, qualifications):
+    employee = client.post("/employees", json={"first_name": first_name, "last_name": "Test"}, headers=headers).json()
+    client.put(f"/employees/{employee['id']}/qualifications", json=qualifications, headers=headers).raise_for_status()
+    return employee["id"]
+
+
+def add_shift(client, headers, starts_at, ends_at):
+    shift = client.post(
+        "/shifts",
+        json={"name": "Shift", "location": "Wave Pool", "starts_at": starts_at, "ends_at": ends_at, "required_staff": 2},
+        headers=headers,
+    )
+    shift.raise_for_status()
+    return shift.json()["id"]
+
+
+def test_parse_notes_reads_structured_pairs_and_ignores_free_text():
+    parsed = parse_notes("experience: Expert | role: rescue, Check | certification: First  Aid until 2025-06-30, lifeguard")
+    assert parsed.experience == "expert"
+    assert parsed.roles == ["check", "rescue"]
+    assert [(item.name, item.expires_on) for item in parsed.certifications] == [
+        ("first aid", date(2025, 6, 30)),
+        ("lifeguard", None),
+    ]
+    assert parse_notes("Rescue certified | experience: guru").model_dump() == {
+        "experience": None,
+        "roles": [],
+        "certifications": [],
+    }
+
+
+def test_eligibility_index_applies_expiry_and_experience():
+    index = EligibilityIndex(
+        [1, 2, 3, 4],
+        [
+            (1, "experience", "expert", None),
+            (1, "role", "rescue", None),
+            (2, "experience", "easy", None),
+            (2, "certification", "first aid", date(2024, 6, 30)),
+            (3, "experience", "medium", None),
+            (3, "certification", "first aid", date(2024, 7, 31)),
+        ],
+    )
+    assert index.ids(index.holding("First Aid", date(2024, 6, 30))) == [2, 3]
+    assert index.ids(index.holding("first aid", date(2024, 7, 1))) == [3]
+    assert index.ids(index.holding("first aid", date(2024, 8, 1))) == []
+    assert index.ids(index.experienced("medium")) == [1, 3]
+    assert index.ids(index.eligible(None, None, date(2024, 1, 1))) == [1, 2, 3, 4]
+    assert index.ids(index.eligible("first aid", "medium", date(2024, 6, 1))) == [3]
+    assert index.ids(index.mask([4, 2, 99]) & ~index.mask([2])) == [4]
+
+
+def test_qualifications_are_normalized_and_replaced(client, auth_headers):
+    employee_id = add_employee(
+        client,
+        auth_headers,
+        "Jordan",
+        {"experience": "medium", "roles": ["Rescue ", "rescue"], "certifications": [{"name": "First Aid"}]},
+    )
+    url = f"/employees/{employee_id}/qualifications"
+    assert client.get(url, headers=auth_headers).json() == {
+        "experience": "medium",
+        "roles": ["rescue"],
+        "certifications": [{"name": "first aid", "expires_on": None}],
+    }
+
+    replaced = client.put(
+        url,
+        json={"experience": "expert", "roles": [], "certifications": [{"name": "first aid", "expires_on": "2025-05-31"}]},
+        headers=auth_headers,
+    )
+    assert replaced.status_code == status.HTTP_200_OK
+    assert replaced.json() == {
+        "experience": "expert",
+        "roles": [],
+        "certifications": [{"name": "first aid", "expires_on": "2025-05-31"}],
+    }
+    assert client.put(url, json={"experience": "guru"}, headers=auth_headers).status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get("/employees/999/qualifications", headers=auth_headers).status_code == status.HTTP_404_NOT_FOUND
+
+    client.delete(f"/employees/{employee_id}", headers=auth_headers).raise_for_status()
+    with database.session_scope() as session:
+        assert session.exec(text("SELECT count(*) FROM qualification")).scalar_one() == 0
+
+
+def test_eligible_staff_are_qualified_on_the_day_and_free(client, auth_headers):
+    task = client.post(
+        "/tasks",
+        json={"name": "First Aid", "certification_required": "first aid", "min_experience": "medium"},
+        headers=auth_headers,
+    ).json()
+    expert = add_employee(
+        client, auth_headers, "Avery", {"experience": "expert", "certifications": [{"name": "first aid"}]}
+    )
+    expiring = add_employee(
+        client,
+        auth_headers,
+        "Maya",
+        {"experience": "medium", "certifications": [{"name": "first aid", "expires_on": "2024-06-01"}]},
+    )
+    add_employee(client, auth_headers, "Kai", {"experience": "easy", "certifications": [{"name": "first aid"}]})
+    busy = add_employee(
+        client, auth_headers, "Nora", {"experience": "expert", "certifications": [{"name": "first aid"}]}
+    )
+
+    june_first = add_shift(client, auth_headers, "2024-06-01T08:00:00", "2024-06-01T14:00:00")
+    june_second = add_shift(client, auth_headers, "2024-06-02T08:00:00", "2024-06-02T14:00:00")
+    overlapping = add_shift(client, auth_headers, "2024-06-02T12:00:00", "2024-06-02T18:00:00")
+    client.post(
+        "/assignments", json={"shift_id": overlapping, "employee_id": busy}, headers=auth_headers
+    ).raise_for_status()
+
+    def eligible(shift_id, **params):
+        response = client.get("/schedule/eligible", params={"shift_id": shift_id, **params}, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()["employee_ids"]
+
+    assert eligible(june_first, task_id=task["id"]) == [expert, expiring, busy]
+    assert eligible(june_second, task_id=task["id"]) == [expert]
+    assert busy not in eligible(june_second)
+    assert client.get("/schedule/eligible", params={"shift_id": 999}, headers=auth_headers).status_code == 404
+    assert client.get("/tasks", headers=auth_headers).json()[0]["min_experience"] == "medium"
+    bad_task = client.post("/tasks", json={"name": "Bad", "min_experience": "guru"}, headers=auth_headers)
+    assert bad_task.status_code == status.HTTP_400_BAD_REQUEST
+
+    solved = client.post(
+        "/schedule/solve",
+        json={"start": "2024-06-01T00:00:00", "end": "2024-06-03T00:00:00", "task_id": task["id"], "time_budget_ms": 100},
+        headers=auth_headers,
+    ).json()
+    proposed = {(proposal["shift_id"], proposal["employee_id"]) for proposal in solved["assignments"]}
+    assert {employee_id for _, employee_id in proposed} <= {expert, expiring, busy}
+    # The expiring certification covers the first day only.
+    assert {shift_id for shift_id, employee_id in proposed if employee_id == expiring} <= {june_first}
+
+
+def test_migration_parses_notes_and_keeps_free_text_matches(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    database.override_engine(engine)
+    with engine.begin() as connection:
+        command.upgrade(database.alembic_config(connection), "0008")
+        connection.execute(
+            text(
+                "INSERT INTO employee (id, first_name, last_name, position, notes) VALUES "
+                "(1, 'Avery', 'Brooks', 'Head Lifeguard', 'experience: expert | role: rescue'), "
+                "(2, 'Kai', 'Kim', 'Support Crew', 'Rescue certified'), "
+                "(3, 'Eli', 'Chen', NULL, NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO task (name, certification_required) VALUES "
+                "('Tower', 'lifeguard'), ('Rescue', 'rescue'), ('Gate', NULL)"
+            )
+        )
+    with engine.begin() as connection:
+        command.upgrade(database.alembic_config(connection), "head")
+        rows = connection.execute(
+            text("SELECT employee_id, kind, name, expires_on FROM qualification ORDER BY employee_id, kind, name")
+        ).all()
+    assert [tuple(row) for row in rows] == [
+        (1, "certification", "lifeguard", None),
+        (1, "experience", "expert", None),
+        (1, "role", "rescue", None),
+        (2, "certification", "rescue", None),
+    ]
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+from fastapi import status
+
+from server.app.solver import RosterSolver
+
+
+def test_solver_respects_overlaps_hours_and_balances_load():
+    start = datetime(2024, 6, 1, 8)
+    shifts = [
+        (day * 2 + slot, start + timedelta(days=day, hours=slot * 4), start + timedelta(days=day, hours=slot * 4 + 6), 2)
+        for day in range(5)
+        for slot in range(2)
+    ]
+    busy = [(1, start + timedelta(hours=12), start + timedelta(hours=14))]
+    solver = RosterSolver(shifts, [1, 2, 3, 4], busy, max_hours=40)
+    solver.solve(time_budget_seconds=0.5)
+
+    assert not solver.unfilled
+    placed: dict[int, list[tuple[datetime, datetime]]] = {}
+    windows = {shift_id: (starts_at, ends_at) for shift_id, starts_at, ends_at, _ in shifts}
+    for shift_id, employee_id in solver.assignments():
+        placed.setdefault(employee_id, []).append(windows[shift_id])
+    placed.setdefault(1, []).append((start + timedelta(hours=12), start + timedelta(hours=14)))
+    for intervals in placed.values():
+        intervals.sort()
+        assert all(earlier[1] <= later[0] for earlier, later in zip(intervals, intervals[1:]))
+    assert max(solver.hours.values()) <= 40
+    assert max(solver.hours.values()) - min(solver.hours.values()) <= 6
+
+
+def test_solve_endpoint_uses_certified_staff_and_reports_shortfall(client, auth_headers):
+    shift = client.post(
+        "/shifts",
+        json={
+            "name": "Morning",
+            "location": "Wave Pool",
+            "starts_at": "2024-06-01T08:00:00",
+            "ends_at": "2024-06-01T14:00:00",
+            "required_staff": 3,
+        },
+        headers=auth_headers,
+    ).json()
+    task = client.post(
+        "/tasks", json={"name": "Rescue", "certification_required": "rescue"}, headers=auth_headers
+    ).json()
+    certified = client.post(
+        "/employees", json={"first_name": "Jordan", "last_name": "Nguyen"}, headers=auth_headers
+    ).json()
+    client.put(
+        f"/employees/{certified['id']}/qualifications",
+        json={"experience": "expert", "roles": ["rescue"]},
+        headers=auth_headers,
+    ).raise_for_status()
+    other = client.post("/employees", json={"first_name": "Maya", "last_name": "Lopez"}, headers=auth_headers).json()
+    client.put(
+        f"/employees/{other['id']}/qualifications", json={"roles": ["check"]}, headers=auth_headers
+    ).raise_for_status()
+
+    response = client.post(
+        "/schedule/solve",
+        json={"start": "2024-06-01T00:00:00", "end": "2024-06-02T00:00:00", "task_id": task["id"], "time_budget_ms": 200},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["assignments"] == [{"shift_id": shift["id"], "employee_id": certified["id"], "task_id": task["id"]}]
+    assert result["unfilled"] == [{"shift_id": shift["id"], "missing": 2}]
+
+    committed = client.post("/assignments/bulk", json=result["assignments"], headers=auth_headers).json()
+    assert committed[0]["status"] == "created"
+
+
+def test_solve_rejects_unknown_task_and_unbounded_budget(client, auth_headers):
+    window = {"start": "2024-06-01T00:00:00", "end": "2024-06-02T00:00:00"}
+    response = client.post("/schedule/solve", json={**window, "task_id": 999}, headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = client.post("/schedule/solve", json={**window, "time_budget_ms": 3_600_000}, headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,44 @@
+from fastapi import status
+
+
+def create_shift(client, headers, name, location, day, hour=8):
+    response = client.post(
+        "/shifts",
+        json={
+            "name": name,
+            "location": location,
+            "starts_at": f"2024-06-{day:02d}T{hour:02d}:00:00",
+            "ends_at": f"2024-06-{day:02d}T{hour + 4:02d}:00:00",
+        },
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+def test_list_shifts_pages_by_start_time(client, auth_headers):
+    create_shift(client, auth_headers, "Late", "Wave Pool", 3)
+    create_shift(client, auth_headers, "Early", "Wave Pool", 1)
+    create_shift(client, auth_headers, "Early twin", "Lazy River", 1)
+    create_shift(client, auth_headers, "Middle", "Wave Pool", 2)
+
+    first = client.get("/shifts", params={"limit": 2}, headers=auth_headers)
+    assert [item["name"] for item in first.json()] == ["Early", "Early twin"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/shifts", params={"limit": 2, "cursor": cursor}, headers=auth_headers)
+    assert [item["name"] for item in second.json()] == ["Middle", "Late"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_list_shifts_filters_by_location_and_range(client, auth_headers):
+    create_shift(client, auth_headers, "Day one", "Wave Pool", 1)
+    create_shift(client, auth_headers, "Day two", "Wave Pool", 2)
+    create_shift(client, auth_headers, "River", "Lazy River", 2)
+
+    response = client.get(
+        "/shifts",
+        params={"location": "Wave Pool", "start": "2024-06-02T00:00:00"},
+        headers=auth_headers,
+    )
+    assert [item["name"] for item in response.json()] == ["Day two"]
@@ -0,0 +1,69 @@
+import pytest
+
+from server.app import slow_queries
+from server.app.slow_queries import recorder
+
+
+@pytest.fixture()
+def record_everything():
+    recorder.threshold_ms = 0.0
+    recorder.log_parameters = True
+    recorder.clear()
+    slow_queries.install()
+    yield
+    slow_queries.uninstall()
+    recorder.threshold_ms = None
+    recorder.log_parameters = False
+    recorder.clear()
+
+
+def test_slow_statements_are_kept_with_route_parameters_and_plan(client, record_everything, auth_headers):
+    client.get(
+        "/shifts",
+        params={"start": "2024-07-01T00:00:00", "end": "2024-07-08T00:00:00", "location": "Wave Pool"},
+        headers=auth_headers,
+    ).raise_for_status()
+
+    records = client.get("/admin/slow-queries", headers=auth_headers).json()
+    shift_queries = [
+        record for record in records if record["route"] == "GET /shifts" and "FROM shift" in record["statement"]
+    ]
+    assert shift_queries
+    query = shift_queries[0]
+    assert "Wave Pool" in query["parameters"]
+    assert any("shift USING INDEX" in line for line in query["plan"])
+    assert query["duration_ms"] >= 0
+
+    # Newest first, bounded, and clearable.
+    assert records[0]["recorded_at"] >= records[-1]["recorded_at"]
+    assert len(records) <= recorder._records.maxlen
+    assert client.delete("/admin/slow-queries", headers=auth_headers).status_code == 204
+    remaining = client.get("/admin/slow-queries", headers=auth_headers).json()
+    assert not any(record["route"] == "GET /shifts" for record in remaining)
+
+
+def test_parameters_are_redacted_for_the_user_table_and_by_default(client, record_everything, auth_headers):
+    records = client.get("/admin/slow-queries", headers=auth_headers).json()
+    user_queries = [record for record in records if "FROM user" in record["statement"]]
+    assert user_queries
+    assert all(record["parameters"] in (None, "[redacted]") for record in user_queries)
+    assert not any("admin@wavepark.local" in (record["parameters"] or "") for record in records)
+
+    recorder.log_parameters = False
+    client.get("/shifts", params={"location": "Wave Pool"}, headers=auth_headers).raise_for_status()
+    records = client.get("/admin/slow-queries", headers=auth_headers).json()
+    assert not any("Wave Pool" in (record["parameters"] or "") for record in records)
+
+
+def test_recorder_is_off_by_default_and_admin_only(client, auth_headers, login):
+    client.get("/shifts", headers=auth_headers)
+    assert client.get("/admin/slow-queries", headers=auth_headers).json() == []
+
+    client.post(
+        "/auth/users",
+        json={"email": "viewer@wavepark.local", "full_name": "Viewer", "password": "Viewer123!", "role": "viewer"},
+        headers=auth_headers,
+    ).raise_for_status()
+    viewer = login("viewer@wavepark.local", "Viewer123!")
+    response = client.get("/admin/slow-queries", headers={"Authorization": f"Bearer {viewer}"})
+    assert response.status_code == 403
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from fastapi import status
+from sqlmodel import func, select
+
+from server.app import database
+from server.app.changelog import compact
+from server.app.models import ChangeLog
+
+
+def test_sync_returns_only_rows_changed_since_the_cursor(client, auth_headers):
+    ava = client.post("/employees", json={"first_name": "Ava", "last_name": "Lopez"}, headers=auth_headers).json()
+    start = client.get("/sync", headers=auth_headers).json()
+    assert start["employees"] == [] and start["cursor"] > 0
+
+    client.put(f"/employees/{ava['id']}", json={"first_name": "Ava", "last_name": "Chen"}, headers=auth_headers)
+    created = client.post(
+        "/employees/bulk",
+        json=[{"first_name": "Ben", "last_name": "Ortiz"}, {"first_name": "Cy", "last_name": "Park"}],
+        headers=auth_headers,
+    ).json()
+    client.delete(f"/employees/{created[1]['id']}", headers=auth_headers)
+    task = client.post("/tasks", json={"name": "Rescue"}, headers=auth_headers).json()
+
+    changes = client.get("/sync", params={"since": start["cursor"]}, headers=auth_headers).json()
+    assert sorted((row["id"], row["last_name"]) for row in changes["employees"]) == [
+        (ava["id"], "Chen"),
+        (created[0]["id"], "Ortiz"),
+    ]
+    assert changes["deleted"]["employees"] == [created[1]["id"]]
+    assert [row["id"] for row in changes["tasks"]] == [task["id"]]
+    assert changes["shifts"] == [] and not changes["has_more"]
+
+    idle = client.get("/sync", params={"since": changes["cursor"]}, headers=auth_headers).json()
+    assert idle["cursor"] == changes["cursor"] and idle["employees"] == []
+
+    first_page = client.get("/sync", params={"since": start["cursor"], "limit": 2}, headers=auth_headers).json()
+    assert first_page["has_more"]
+    rest = client.get("/sync", params={"since": first_page["cursor"]}, headers=auth_headers).json()
+    assert {row["id"] for row in first_page["employees"] + rest["employees"]} == {ava["id"], created[0]["id"]}
+
+
+def test_compaction_keeps_latest_entry_and_expires_old_cursors(client, auth_headers):
+    ava = client.post("/employees", json={"first_name": "Ava", "last_name": "Lopez"}, headers=auth_headers).json()
+    for last_name in ("Chen", "Diaz", "Evans"):
+        client.put(f"/employees/{ava['id']}", json={"first_name": "Ava", "last_name": last_name}, headers=auth_headers)
+    ben = client.post("/employees", json={"first_name": "Ben", "last_name": "Ortiz"}, headers=auth_headers).json()
+    client.delete(f"/employees/{ben['id']}", headers=auth_headers)
+
+    with database.session_scope() as session:
+        assert compact(session, timedelta(days=30)) == 4
+        session.commit()
+        assert session.exec(select(func.count(ChangeLog.id))).one() == 2
+
+    changes = client.get("/sync", params={"since": 0}, headers=auth_headers).json()
+    assert [row["last_name"] for row in changes["employees"]] == ["Evans"]
+    assert changes["deleted"]["employees"] == [ben["id"]]
+
+    with database.session_scope() as session:
+        assert compact(session, timedelta(0)) == 1
+        session.commit()
+    expired = client.get("/sync", params={"since": 0}, headers=auth_headers)
+    assert expired.status_code == status.HTTP_410_GONE
+    head = client.get("/sync", headers=auth_headers).json()["cursor"]
+    assert client.get("/sync", params={"since": head}, headers=auth_headers).status_code == status.HTTP_200_OK
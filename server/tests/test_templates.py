@@ -0,0 +1,86 @@
+from datetime import date, time
+
+from fastapi import status
+
+from server.app.models import Recurrence, ShiftTemplate
+from server.app.recurrence import occurrence_dates
+
+
+def make_template(**overrides) -> ShiftTemplate:
+    values = {
+        "id": 1,
+        "name": "Opening",
+        "location": "Wave Pool",
+        "start_time": time(8, 0),
+        "end_time": time(12, 0),
+        "valid_from": date(2024, 6, 3),
+    }
+    values.update(overrides)
+    return ShiftTemplate(**values)
+
+
+def test_daily_interval_counts_from_valid_from():
+    template = make_template(interval=3)
+    days = list(occurrence_dates(template, date(2024, 6, 4), date(2024, 6, 12), set()))
+    assert days == [date(2024, 6, 6), date(2024, 6, 9), date(2024, 6, 12)]
+
+
+def test_weekly_weekdays_interval_and_exceptions():
+    template = make_template(frequency=Recurrence.WEEKLY, weekdays=[0, 4], interval=2, valid_until=date(2024, 6, 30))
+    days = list(occurrence_dates(template, date(2024, 6, 1), date(2024, 7, 31), {date(2024, 6, 17)}))
+    assert days == [date(2024, 6, 3), date(2024, 6, 7), date(2024, 6, 21)]
+
+
+def test_expand_template_is_idempotent_and_handles_overnight(client, auth_headers):
+    created = client.post(
+        "/shift-templates",
+        json={
+            "name": "Night watch",
+            "location": "Wave Pool",
+            "start_time": "22:00:00",
+            "end_time": "06:00:00",
+            "valid_from": "2024-06-01",
+            "exceptions": ["2024-06-03"],
+        },
+        headers=auth_headers,
+    )
+    assert created.status_code == status.HTTP_201_CREATED
+    template_id = created.json()["id"]
+    assert created.json()["exceptions"] == ["2024-06-03"]
+
+    params = {"start": "2024-06-01", "end": "2024-06-05"}
+    first = client.post(f"/shift-templates/{template_id}/expand", params=params, headers=auth_headers)
+    assert first.json() == {"created": 4, "skipped": 0}
+    second = client.post(
+        "/shift-templates/expand", params={"start": "2024-06-01", "end": "2024-06-07"}, headers=auth_headers
+    )
+    assert second.json() == {"created": 2, "skipped": 4}
+
+    shifts = client.get("/shifts", headers=auth_headers).json()
+    assert len(shifts) == 6
+    assert shifts[0]["starts_at"] == "2024-06-01T22:00:00"
+    assert shifts[0]["ends_at"] == "2024-06-02T06:00:00"
+    assert shifts[0]["template_id"] == template_id
+    assert "2024-06-03T22:00:00" not in {shift["starts_at"] for shift in shifts}
+
+
+def test_template_validation(client, auth_headers):
+    response = client.post(
+        "/shift-templates",
+        json={
+            "name": "Opening",
+            "location": "Wave Pool",
+            "start_time": "08:00:00",
+            "end_time": "12:00:00",
+            "valid_from": "2024-06-01",
+            "frequency": "monthly",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_expand_rejects_ranges_over_the_cap(client, auth_headers):
+    params = {"start": "2024-01-01", "end": "2099-12-31"}
+    response = client.post("/shift-templates/expand", params=params, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST